@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard HTTP Benchmark
+Measures bytes on the wire and latency of /api/metrics and /api/agents per
+content coding, and of conditional requests answered with 304.
+
+Usage:
+    python benchmarks/bench_dashboard_http.py --agents 1000 10000 --requests 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fastapi.testclient import TestClient
+
+from core.config import Config
+from core.agent_manager import AgentManager
+from dashboard.enterprise_dashboard import EnterpriseDashboard
+from dashboard.http_responses import available_codings
+
+from bench_agent_snapshot import build_agents
+
+
+def measure(client: TestClient, label: str, path: str, headers: dict, requests: int):
+    """Print median and p95 latency and bytes received for one request shape."""
+    timings = []
+    size = 0
+    status = None
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append(time.perf_counter() - start)
+        size = response.num_bytes_downloaded
+        status = response.status_code
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"  {label:<24} {status:>4} {statistics.median(timings) * 1000:9.2f} ms "
+          f"{p95 * 1000:9.2f} ms {size / 1024:11.1f} KiB")
+
+
+def bench_endpoint(client: TestClient, path: str, requests: int):
+    """Measure one endpoint uncompressed, in every coding, and conditionally."""
+    print(f"\n  {path}")
+    measure(client, "identity", path, {"Accept-Encoding": "identity"}, requests)
+    for coding in available_codings():
+        measure(client, coding, path, {"Accept-Encoding": coding}, requests)
+    etag = client.get(path).headers["etag"]
+    measure(client, "If-None-Match (304)", path, {"If-None-Match": etag}, requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard HTTP benchmark")
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 10000], help="Agent counts")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per measurement")
+    parser.add_argument("--page", type=int, default=1000, help="/api/agents page size")
+    args = parser.parse_args()
+    
+    # The dashboard mounts static/ and templates/ from the working directory;
+    # none of the measured routes read them
+    os.chdir(tempfile.mkdtemp())
+    os.makedirs("static")
+    os.makedirs("templates")
+    
+    print(f"Codings: {', '.join(available_codings())}")
+    print(f"  {'request':<24} {'code':>4} {'median':>12} {'p95':>12} {'received':>15}")
+    for count in args.agents:
+        config = Config()
+        config.agent_snapshot_enabled = False
+        agent_manager = AgentManager(config)
+        agent_manager.agents.update(build_agents(count))
+        
+        # Served from one snapshot for the whole run, as between two refreshes
+        dashboard = EnterpriseDashboard(agent_manager, snapshot_max_age=3600)
+        client = TestClient(dashboard.app)
+        
+        print(f"\n{count} agents")
+        bench_endpoint(client, "/api/metrics", args.requests)
+        bench_endpoint(client, f"/api/agents?limit={args.page}", args.requests)
+        dashboard.metrics_collector.stop_sampler()
+
+
+if __name__ == "__main__":
+    main()
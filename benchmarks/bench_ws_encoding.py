@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Websocket Encoding Benchmark
+Compares encode time and bytes on the wire of dashboard messages per encoding.
+
+Usage:
+    python benchmarks/bench_ws_encoding.py --agents 1000 10000 --changed 0.05
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dashboard.encoding import EncodedMessage, available_encodings
+from dashboard.state_sync import VersionedState
+
+
+STATUSES = ["active", "idle", "error", "offline"]
+
+
+def build_agents(count: int, seed: int = 0):
+    """Build synthetic dashboard agent records, shaped like AgentMetrics.to_dict()."""
+    rng = random.Random(seed)
+    now = datetime.now().isoformat()
+    return {
+        f"agent-{i:06d}": {
+            "agent_id": f"agent-{i:06d}",
+            "name": f"agent-{i}",
+            "status": STATUSES[i % len(STATUSES)],
+            "cpu_usage": rng.uniform(0, 100),
+            "memory_usage": rng.uniform(0, 100),
+            "tasks_completed": rng.randint(0, 10000),
+            "tasks_failed": rng.randint(0, 100),
+            "uptime": rng.randint(0, 86400),
+            "last_activity": now,
+            "performance_score": rng.uniform(0, 100)
+        }
+        for i in range(count)
+    }
+
+
+def mutate(agents, fraction: float, seed: int = 1):
+    """Copy of the agents with a fraction of them changed, as between two ticks."""
+    rng = random.Random(seed)
+    changed = dict(agents)
+    for agent_id in rng.sample(list(agents), int(len(agents) * fraction)):
+        record = dict(agents[agent_id])
+        record["cpu_usage"] = rng.uniform(0, 100)
+        record["tasks_completed"] += 1
+        changed[agent_id] = record
+    return changed
+
+
+def measure(label: str, payload, repeat: int):
+    """Print encode time and size of one message in every encoding."""
+    for encoding in available_encodings():
+        best = float("inf")
+        for _ in range(repeat):
+            message = EncodedMessage(payload)
+            start = time.perf_counter()
+            data = message.encode(encoding)
+            best = min(best, time.perf_counter() - start)
+        size = len(data.encode() if isinstance(data, str) else data)
+        print(f"  {label:<9} {encoding:<8} {best * 1000:9.2f} ms {size / 1024:11.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Websocket encoding benchmark")
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 10000], help="Agent counts")
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of agents changed per tick")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is reported")
+    args = parser.parse_args()
+    
+    system = {"total_agents": 0, "active_agents": 0, "system_load": 12.5, "memory_usage": 48.0}
+    print(f"Encodings: {', '.join(available_encodings())}")
+    for count in args.agents:
+        agents = build_agents(count)
+        state = VersionedState()
+        state.update(system, agents)
+        snapshot = state.snapshot_message().payload
+        ops = state.update(system, mutate(agents, args.changed))
+        delta = state.delta_message(ops).payload
+        
+        print(f"\n{count} agents ({len(ops)} delta ops)")
+        measure("snapshot", snapshot, args.repeat)
+        measure("delta", delta, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
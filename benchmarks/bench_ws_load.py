@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard WebSocket Load Test
+Runs EnterpriseDashboard on localhost against a synthetic agent registry,
+connects simulated websocket clients, some of them slow readers, and reports
+broadcast fan-out latency and server CPU and memory per connection.
+
+Usage:
+    python benchmarks/bench_ws_load.py --agents 1000 --clients 100 500 1000 --slow 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import httpx
+import psutil
+import websockets
+
+from bench_agent_snapshot import build_agents
+
+
+def free_port() -> int:
+    """An unused localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def drive_changes(agent_manager, rate: float):
+    """Record task completions on random agents, ``rate`` per second."""
+    agent_ids = list(agent_manager.agents)
+    tick = 0.01
+    carry = 0.0
+    while True:
+        await asyncio.sleep(tick)
+        carry += rate * tick
+        while carry >= 1:
+            carry -= 1
+            await agent_manager.update_agent_activity(random.choice(agent_ids), random.random() > 0.05)
+
+
+def run_server(agents: int, port: int, change_rate: float, latency_budget: float, quiet: bool):
+    """Server process: the dashboard over a synthetic registry, with changes driven at a fixed rate."""
+    from core.config import Config
+    from core.agent_manager import AgentManager
+    from dashboard.enterprise_dashboard import EnterpriseDashboard
+    
+    if quiet:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+    
+    # The dashboard mounts static/ and templates/ from the working directory
+    os.chdir(tempfile.mkdtemp())
+    os.makedirs("static")
+    os.makedirs("templates")
+    
+    config = Config()
+    config.agent_snapshot_enabled = False
+    agent_manager = AgentManager(config)
+    agent_manager.agents.update(build_agents(agents))
+    dashboard = EnterpriseDashboard(agent_manager, host="127.0.0.1", port=port,
+                                    broadcast_latency=latency_budget)
+    
+    async def main():
+        driver = asyncio.create_task(drive_changes(agent_manager, change_rate))
+        try:
+            await dashboard.start()
+        finally:
+            driver.cancel()
+    
+    asyncio.run(main())
+
+
+async def client(url: str, slow_delay: float, recording, stop, result: dict):
+    """One simulated dashboard: applies versions, acknowledges them and records latency."""
+    latencies = result["slow" if slow_delay else "fast"]
+    version = None
+    try:
+        # A slow reader buffers little, so backpressure reaches the server
+        async with websockets.connect(url, max_queue=2 if slow_delay else 64, max_size=None,
+                                      ping_interval=None) as websocket:
+            result["connected"] += 1
+            while not stop.is_set():
+                try:
+                    raw = await asyncio.wait_for(websocket.recv(), 0.5)
+                except asyncio.TimeoutError:
+                    continue
+                received = datetime.now()
+                message = json.loads(raw)
+                kind = message.get("type")
+                if kind == "ping":
+                    await websocket.send(json.dumps({"type": "pong"}))
+                    continue
+                if kind not in ("snapshot", "delta"):
+                    continue
+                if recording.is_set():
+                    sent = datetime.fromisoformat(message["timestamp"])
+                    latencies.append((received - sent).total_seconds())
+                    result["bytes"] += len(raw)
+                    result[kind + "s"] += 1
+                if kind == "delta" and message["base_version"] != version:
+                    result["gaps"] += 1
+                    await websocket.send(json.dumps({"type": "resync"}))
+                    continue
+                version = message["version"]
+                await websocket.send(json.dumps({"type": "ack", "version": version}))
+                if slow_delay:
+                    await asyncio.sleep(slow_delay)
+    except (OSError, websockets.WebSocketException):
+        result["failed"] += 1
+
+
+def run_clients(url: str, fast: int, slow: int, slow_delay: float, connected, recording, stop, results):
+    """Client process: ``fast`` plus ``slow`` clients until ``stop`` is set."""
+    result = {"fast": [], "slow": [], "connected": 0, "failed": 0, "gaps": 0,
+              "bytes": 0, "snapshots": 0, "deltas": 0}
+    
+    async def main():
+        tasks = []
+        for index in range(fast + slow):
+            tasks.append(asyncio.create_task(client(url, slow_delay if index < slow else 0, recording, stop, result)))
+            # Connect in small batches, as a listen backlog would accept them
+            if index % 50 == 49:
+                await asyncio.sleep(0.05)
+        while result["connected"] + result["failed"] < fast + slow:
+            await asyncio.sleep(0.05)
+        connected.release()
+        await asyncio.gather(*tasks)
+    
+    asyncio.run(main())
+    results.put(result)
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values, in milliseconds."""
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def run_step(server: psutil.Process, port: int, clients: int, args) -> None:
+    """Connect ``clients`` clients, measure, and disconnect them."""
+    context = multiprocessing.get_context("spawn")
+    connected = context.Semaphore(0)
+    recording = context.Event()
+    stop = context.Event()
+    results = context.Queue()
+    
+    url = f"ws://127.0.0.1:{port}/ws"
+    slow_total = int(round(clients * args.slow))
+    processes = []
+    rss_before = server.memory_info().rss
+    for index in range(args.client_procs):
+        share = clients // args.client_procs + (1 if index < clients % args.client_procs else 0)
+        slow_share = slow_total // args.client_procs + (1 if index < slow_total % args.client_procs else 0)
+        if share == 0:
+            continue
+        process = context.Process(
+            target=run_clients,
+            args=(url, share - min(slow_share, share), min(slow_share, share), args.slow_delay,
+                  connected, recording, stop, results)
+        )
+        process.start()
+        processes.append(process)
+    for _ in processes:
+        connected.acquire()
+    
+    time.sleep(args.warmup)
+    rss_after = server.memory_info().rss
+    cpu_before = server.cpu_times()
+    recording.set()
+    time.sleep(args.duration)
+    recording.clear()
+    cpu_after = server.cpu_times()
+    stats = httpx.get(f"http://127.0.0.1:{port}/api/websocket/stats").json()
+    
+    stop.set()
+    merged = {"fast": [], "slow": [], "connected": 0, "failed": 0, "gaps": 0,
+              "bytes": 0, "snapshots": 0, "deltas": 0}
+    for _ in processes:
+        result = results.get()
+        for key, value in result.items():
+            merged[key] += value
+    for process in processes:
+        process.join()
+    
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    fast = sorted(merged["fast"])
+    slow = sorted(merged["slow"])
+    print(f"\n{clients} clients ({slow_total} slow): {merged['connected']} connected, {merged['failed']} failed")
+    print(f"  server CPU        {cpu / args.duration * 100:8.1f} %")
+    print(f"  server memory     {rss_after / 2 ** 20:8.1f} MiB, "
+          f"{(rss_after - rss_before) / max(merged['connected'], 1) / 1024:.1f} KiB per connection")
+    print(f"  received          {merged['deltas']} deltas, {merged['snapshots']} snapshots, "
+          f"{merged['bytes'] / 2 ** 20:.1f} MiB, {merged['gaps']} gaps")
+    print(f"  server queues     {stats['queued_messages']} queued, {stats['messages_dropped']} dropped")
+    for label, values in (("fast", fast), ("slow", slow)):
+        if values:
+            print(f"  {label} latency ms   p50 {percentile(values, 0.5):8.1f}  p90 {percentile(values, 0.9):8.1f}  "
+                  f"p99 {percentile(values, 0.99):8.1f}  max {values[-1] * 1000:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard websocket load test")
+    parser.add_argument("--agents", type=int, default=1000, help="Synthetic agents")
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 500, 1000], help="Client counts, one step each")
+    parser.add_argument("--slow", type=float, default=0.1, help="Fraction of clients that are slow readers")
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="Seconds a slow reader takes per message")
+    parser.add_argument("--change-rate", type=float, default=200, help="Agent changes per second")
+    parser.add_argument("--latency-budget", type=float, default=0.25, help="Dashboard broadcast latency budget")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds before measuring")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per step")
+    parser.add_argument("--client-procs", type=int, default=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                        help="Processes the clients are spread over")
+    parser.add_argument("--server-log", action="store_true", help="Keep the server's log output")
+    args = parser.parse_args()
+    
+    port = free_port()
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(
+        target=run_server,
+        args=(args.agents, port, args.change_rate, args.latency_budget, not args.server_log),
+        daemon=True
+    )
+    process.start()
+    server = psutil.Process(process.pid)
+    
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/websocket/stats")
+            break
+        except httpx.HTTPError:
+            if time.monotonic() > deadline or not process.is_alive():
+                raise SystemExit("Dashboard server did not start")
+            time.sleep(0.2)
+    
+    print(f"{args.agents} agents, {args.change_rate:g} changes/s, "
+          f"{args.latency_budget:g}s latency budget, {args.client_procs} client processes")
+    try:
+        for clients in args.clients:
+            run_step(server, port, clients, args)
+    finally:
+        process.terminate()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Advanced AI capabilities with custom agent development tools and multi-modal pro
 import asyncio
 import json
 import os
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
@@ -27,6 +27,9 @@ except ImportError:
 
 from utils.logger import setup_logger
 from core.config import Config
+from core.metrics_exporter import AI_TOKENS, AI_TASK_DURATION, AI_CACHE_LOOKUPS, AI_TOKENS_SAVED
+from ai.llm_executor import LLMExecutor
+from ai.response_cache import LLMResponseCache, cache_key
 
 
 class AICapability(Enum):
@@ -68,6 +71,13 @@ class AIModelConfig:
     frequency_penalty: float = 0.0
     presence_penalty: float = 0.0
     custom_parameters: Dict[str, Any] = None
+    # Concurrent calls to this model; None uses the engine's per-model default
+    max_concurrency: Optional[int] = None
+    # Cache responses even though temperature > 0 makes them non-deterministic
+    cache_nondeterministic: bool = False
+    # The model's client is truly async, so an agent's arun is awaited on the
+    # loop; otherwise calls run on the engine's bounded thread pool
+    native_async: bool = False
     
     def __post_init__(self):
         if self.custom_parameters is None:
@@ -152,6 +162,17 @@ class AdvancedAIEngine:
         # Task processing
         self.task_queue: List[AITaskRequest] = []
         self.task_results: Dict[str, AITaskResponse] = {}
+        self.running_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Blocking LLM calls run here, bounded per model, instead of on the event loop
+        self.llm_executor = LLMExecutor(config.ai_llm_max_workers, config.ai_llm_model_concurrency)
+        
+        # Responses to identical calls, reused instead of calling the model again
+        self.response_cache: Optional[LLMResponseCache] = None
+        if config.ai_cache_enabled:
+            self.response_cache = LLMResponseCache(
+                config.ai_cache_path or None, config.ai_cache_max_entries, config.ai_cache_ttl
+            )
         
         # AI capabilities
         self.capability_handlers: Dict[AICapability, Callable] = {
@@ -380,8 +401,10 @@ class AdvancedAIEngine:
         """
         self.task_queue.append(request)
         
-        # Process task asynchronously
-        asyncio.create_task(self._process_task(request))
+        # Process task asynchronously; kept so it can be cancelled
+        task = asyncio.create_task(self._process_task(request))
+        self.running_tasks[request.task_id] = task
+        task.add_done_callback(lambda _: self.running_tasks.pop(request.task_id, None))
         
         self.logger.info(f"Submitted task: {request.task_id} for agent: {request.agent_id}")
         return request.task_id
@@ -389,6 +412,7 @@ class AdvancedAIEngine:
     async def _process_task(self, request: AITaskRequest):
         """Process an AI task."""
         start_time = datetime.now()
+        model_name = "unknown"
         
         try:
             # Get agent
@@ -398,9 +422,10 @@ class AdvancedAIEngine:
             agent_data = self.active_agents[request.agent_id]
             template = agent_data["template"]
             agent = agent_data["agent"]
+            model_name = template.model_config.model_name
             
-            # Determine task type and process
-            result = await self._execute_task(agent, template, request)
+            # Determine task type and process; the timeout cancels an LLM call in progress
+            result = await asyncio.wait_for(self._execute_task(agent, template, request), request.timeout)
             
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -419,9 +444,31 @@ class AdvancedAIEngine:
             )
             
             self.task_results[request.task_id] = response
+            AI_TOKENS.labels(model_name, request.task_type).inc(response.tokens_used)
+            AI_TASK_DURATION.labels(model_name, request.task_type, "success").observe(processing_time)
             self.logger.info(f"Task completed: {request.task_id}")
             
+        except asyncio.CancelledError:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            self.task_results[request.task_id] = AITaskResponse(
+                task_id=request.task_id,
+                agent_id=request.agent_id,
+                status="cancelled",
+                result={"error": "Task cancelled"},
+                confidence=0.0,
+                reasoning="Task cancelled",
+                tokens_used=0,
+                processing_time=processing_time,
+                metadata={}
+            )
+            AI_TASK_DURATION.labels(model_name, request.task_type, "cancelled").observe(processing_time)
+            self.logger.info(f"Task cancelled: {request.task_id}")
+            raise
+            
         except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"Task timed out after {request.timeout}s")
+
             processing_time = (datetime.now() - start_time).total_seconds()
             
             response = AITaskResponse(
@@ -437,6 +484,7 @@ class AdvancedAIEngine:
             )
             
             self.task_results[request.task_id] = response
+            AI_TASK_DURATION.labels(model_name, request.task_type, "failed").observe(processing_time)
             self.logger.error(f"Task failed: {request.task_id} - {str(e)}")
     
     async def _execute_task(self, agent: Any, template: CustomAgentTemplate, request: AITaskRequest) -> Dict[str, Any]:
@@ -463,7 +511,7 @@ class AdvancedAIEngine:
         text = input_data.get("text", "")
         analysis_type = input_data.get("analysis_type", "general")
         
-        if agent.get("type") == "mock":
+        if isinstance(agent, dict) and agent.get("type") == "mock":
             return {
                 "analysis": f"Mock analysis of text: {text[:100]}...",
                 "sentiment": "positive",
@@ -473,25 +521,47 @@ class AdvancedAIEngine:
                 "reasoning": "Mock analysis performed"
             }
         
-        try:
-            # Use LangChain agent
-            prompt = f"Analyze the following text for {analysis_type}: {text}"
-            result = agent.run(prompt)
-            
-            return {
-                "analysis": result,
-                "confidence": 0.9,
-                "tokens_used": len(prompt.split()) + len(result.split()),
-                "reasoning": "Analysis completed using AI model"
-            }
-            
-        except Exception as e:
-            return {
-                "analysis": f"Error: {str(e)}",
-                "confidence": 0.0,
-                "tokens_used": 0,
-                "reasoning": f"Analysis failed: {str(e)}"
-            }
+        # Use LangChain agent; a failed call propagates so the task is recorded as failed
+        prompt = f"Analyze the following text for {analysis_type}: {text}"
+        result, tokens_used, cache_metadata = await self._run_llm(agent, template, prompt)
+        
+        return {
+            "analysis": result,
+            "confidence": 0.9,
+            "tokens_used": tokens_used,
+            "reasoning": "Analysis completed using AI model",
+            "metadata": cache_metadata
+        }
+    
+    async def _run_llm(self, agent: Any, template: CustomAgentTemplate, prompt: str) -> Tuple[str, int, Dict[str, Any]]:
+        """Run a prompt on an agent, answering from the response cache when the model allows it.
+        
+        Returns:
+            Response, tokens this call used, and task metadata describing the cache outcome
+        """
+        model_config = template.model_config
+        model_name = model_config.model_name
+        
+        async def run():
+            response = await self.llm_executor.run(
+                model_name, agent, prompt, model_config.max_concurrency, model_config.native_async
+            )
+            return response, len(prompt.split()) + len(response.split())
+        
+        if self.response_cache is None or (model_config.temperature > 0 and not model_config.cache_nondeterministic):
+            response, tokens = await run()
+            AI_CACHE_LOOKUPS.labels(model_name, "bypass").inc()
+            return response, tokens, {"cache": "bypass"}
+        
+        key = cache_key(model_name, model_config.temperature, template.system_prompt, prompt, template.tools)
+        response, tokens, tier = await self.response_cache.get_or_run(key, run)
+        if tier is None:
+            AI_CACHE_LOOKUPS.labels(model_name, "miss").inc()
+            return response, tokens, {"cache": "miss"}
+        
+        AI_CACHE_LOOKUPS.labels(model_name, tier).inc()
+        AI_TOKENS_SAVED.labels(model_name).inc(tokens)
+        return response, 0, {"cache": "hit", "cache_tier": tier, "tokens_saved": tokens}
     
     async def _handle_document_processing(self, agent: Any, template: CustomAgentTemplate, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle document processing task."""
@@ -626,6 +696,31 @@ class AdvancedAIEngine:
         """Get task result by ID."""
         return self.task_results.get(task_id)
     
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a submitted task, including an LLM call it is waiting on.
+        
+        Args:
+            task_id: Task to cancel
+            
+        Returns:
+            True if the task was still running
+        """
+        task = self.running_tasks.get(task_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """Get LLM call concurrency limits and waiting, running and finished counts per model."""
+        return self.llm_executor.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get LLM response cache hits per tier, hit rate and tokens saved."""
+        if self.response_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.response_cache.get_stats()}
+    
     def list_agents(self) -> List[Dict[str, Any]]:
         """List all available agents."""
         agents = []
@@ -670,10 +765,17 @@ class AdvancedAIEngine:
                 "average_confidence": 0.0,
                 "average_processing_time": 0.0,
                 "success_rate": 0.0,
-                "total_tokens_used": 0
+                "total_tokens_used": 0,
+                "cache_hits": 0,
+                "cache_lookups": 0,
+                "cache_hit_rate": 0.0,
+                "tokens_saved": 0
             }
         
         successful_tasks = [task for task in agent_tasks if task.status == "success"]
+        # Calls that bypassed the cache are not lookups
+        cache_lookups = [task for task in agent_tasks if task.metadata.get("cache") in ("hit", "miss")]
+        cache_hits = [task for task in cache_lookups if task.metadata["cache"] == "hit"]
         
         return {
             "tasks_completed": len(agent_tasks),
@@ -681,13 +783,26 @@ class AdvancedAIEngine:
             "average_confidence": sum(task.confidence for task in successful_tasks) / len(successful_tasks) if successful_tasks else 0.0,
             "average_processing_time": sum(task.processing_time for task in agent_tasks) / len(agent_tasks),
             "success_rate": len(successful_tasks) / len(agent_tasks) if agent_tasks else 0.0,
-            "total_tokens_used": sum(task.tokens_used for task in agent_tasks)
+            "total_tokens_used": sum(task.tokens_used for task in agent_tasks),
+            "cache_hits": len(cache_hits),
+            "cache_lookups": len(cache_lookups),
+            "cache_hit_rate": len(cache_hits) / len(cache_lookups) if cache_lookups else 0.0,
+            "tokens_saved": sum(task.metadata.get("tokens_saved", 0) for task in cache_hits)
         }
     
     async def shutdown(self):
         """Shutdown the AI engine."""
         self.logger.info("Shutting down Advanced AI Engine...")
         
+        # Cancel tasks still running and stop the LLM threads
+        tasks = list(self.running_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.llm_executor.shutdown()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        
         # Clean up active agents
         for agent_id in list(self.active_agents.keys()):
             del self.active_agents[agent_id]
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - LLM Executor
+Runs LLM agent calls off the event loop, with a concurrency limit per model.
+"""
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+try:
+    from langchain.callbacks.base import BaseCallbackHandler
+except ImportError:
+    BaseCallbackHandler = None
+
+from utils.logger import setup_logger
+
+
+class LLMCallCancelled(Exception):
+    """Raised inside a worker thread to stop an agent run that was cancelled."""
+
+
+if BaseCallbackHandler is not None:
+    class _CancelCallback(BaseCallbackHandler):
+        """Stops a LangChain run at its next LLM, tool or agent step once cancelled."""
+        
+        raise_error = True
+        
+        def __init__(self, cancelled: threading.Event):
+            self.cancelled = cancelled
+        
+        def _check(self, *args, **kwargs):
+            if self.cancelled.is_set():
+                raise LLMCallCancelled("LLM call cancelled")
+        
+        on_llm_start = on_chat_model_start = on_tool_start = on_agent_action = _check
+else:
+    _CancelCallback = None
+
+
+def _accepts_callbacks(method: Any) -> bool:
+    """Whether a ``run`` method can be passed LangChain ``callbacks``."""
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(parameter.name == "callbacks" or parameter.kind is parameter.VAR_KEYWORD
+               for parameter in parameters)
+
+
+class _ModelSlots:
+    """Concurrency limit and call counters for one model."""
+    
+    __slots__ = ("limit", "semaphore", "waiting", "running", "completed", "failed", "cancelled")
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+
+class LLMExecutor:
+    """Bounded execution of LLM agent calls.
+    
+    Agents of models marked as natively async are awaited through their
+    ``arun`` on the loop. Every other agent runs on a shared thread pool,
+    including LangChain agents whose ``arun`` would only hand the sync call
+    to the loop's unbounded default executor. Either way a call holds
+    one of its model's slots, so one slow or rate-limited model cannot take
+    every thread. Cancelling the awaiting coroutine, including through a
+    timeout, drops a call that has not started yet and stops a running
+    LangChain call at its next step; its model slot is only released once
+    the thread has actually returned.
+    """
+    
+    def __init__(self, max_workers: int = 16, model_concurrency: int = 4):
+        """Initialize LLM executor.
+        
+        Args:
+            max_workers: Threads running synchronous agent calls, shared by all models
+            model_concurrency: Concurrent calls per model unless the model sets its own limit
+        """
+        self.logger = setup_logger(__name__)
+        self.max_workers = max_workers
+        self.model_concurrency = model_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._models: Dict[str, _ModelSlots] = {}
+    
+    def _slots(self, model: str, limit: Optional[int]) -> _ModelSlots:
+        slots = self._models.get(model)
+        if slots is None:
+            slots = self._models[model] = _ModelSlots(limit or self.model_concurrency)
+        return slots
+    
+    async def run(self, model: str, agent: Any, prompt: str, limit: Optional[int] = None,
+                  native_async: bool = False) -> str:
+        """Run an agent on a prompt without blocking the event loop.
+        
+        Args:
+            model: Model name the concurrency limit applies to
+            agent: LangChain agent, or any object with ``run``/``arun``
+            prompt: Prompt to run
+            limit: Concurrent calls allowed for this model, fixed on its first call
+            native_async: Await the agent's ``arun`` instead of running ``run``
+                on the thread pool
+        
+        Returns:
+            The agent's output
+        """
+        slots = self._slots(model, limit)
+        slots.waiting += 1
+        try:
+            await slots.semaphore.acquire()
+        finally:
+            slots.waiting -= 1
+        slots.running += 1
+        
+        released_by_thread = False
+        try:
+            arun = getattr(agent, "arun", None) if native_async else None
+            if arun is not None:
+                result = await arun(prompt)
+            else:
+                cancelled = threading.Event()
+                future = self._executor.submit(self._call, agent, prompt, cancelled)
+                loop = asyncio.get_running_loop()
+                # The thread keeps the slot until it returns, even if the caller gave up
+                future.add_done_callback(lambda _: self._release_threadsafe(loop, slots))
+                released_by_thread = True
+                try:
+                    result = await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            slots.completed += 1
+            return result
+        except asyncio.CancelledError:
+            slots.cancelled += 1
+            raise
+        except Exception:
+            slots.failed += 1
+            raise
+        finally:
+            if not released_by_thread:
+                self._release(slots)
+    
+    @staticmethod
+    def _call(agent: Any, prompt: str, cancelled: threading.Event) -> str:
+        """Run a synchronous agent call on a worker thread."""
+        if cancelled.is_set():
+            raise LLMCallCancelled("LLM call cancelled")
+        if _CancelCallback is not None and _accepts_callbacks(agent.run):
+            return agent.run(prompt, callbacks=[_CancelCallback(cancelled)])
+        return agent.run(prompt)
+    
+    @staticmethod
+    def _release(slots: _ModelSlots):
+        slots.running -= 1
+        slots.semaphore.release()
+    
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop, slots: _ModelSlots):
+        try:
+            loop.call_soon_threadsafe(self._release, slots)
+        except RuntimeError:
+            # The loop is closed; nothing is waiting for the slot
+            pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-model limits and waiting, running and finished call counts."""
+        return {
+            "max_workers": self.max_workers,
+            "models": {
+                model: {
+                    "limit": slots.limit,
+                    "waiting": slots.waiting,
+                    "running": slots.running,
+                    "completed": slots.completed,
+                    "failed": slots.failed,
+                    "cancelled": slots.cancelled
+                }
+                for model, slots in self._models.items()
+            }
+        }
+    
+    def shutdown(self):
+        """Stop the worker threads, dropping calls that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
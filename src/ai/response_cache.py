@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - LLM Response Cache
+Two-tier cache of LLM responses: an in-memory LRU over a SQLite store with TTL.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+from utils.logger import setup_logger
+
+# A cached response and the tokens it cost to produce
+CachedResponse = Tuple[str, int]
+
+# Puts between sweeps of expired rows from the store
+PURGE_EVERY = 256
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so prompts differing only in layout share an entry."""
+    return " ".join(prompt.split())
+
+
+def cache_key(model_name: str, temperature: float, system_prompt: str, prompt: str,
+              tools: List[str]) -> str:
+    """Key of an LLM call: everything that decides its response.
+    
+    Args:
+        model_name: Model the call goes to
+        temperature: Sampling temperature
+        system_prompt: Agent system prompt
+        prompt: User prompt, normalized before hashing
+        tools: Tools available to the agent; their order does not matter
+    """
+    material = json.dumps(
+        [model_name, float(temperature), system_prompt, normalize_prompt(prompt), sorted(tools)],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM responses kept in an LRU in memory and in SQLite on disk.
+    
+    Lookups check memory, then disk, promoting disk hits into memory. Every
+    entry expires ``ttl`` seconds after it was stored in either tier. Disk
+    access runs in a thread. Concurrent calls for the same key while the
+    first is still running wait for its response instead of calling the
+    model again, and share its failure if it fails.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024, ttl: float = 86400.0):
+        """Initialize response cache.
+        
+        Args:
+            path: SQLite file of the disk tier; None keeps responses in memory only
+            max_entries: Responses kept in memory
+            ttl: Seconds a response stays valid
+        """
+        self.logger = setup_logger(__name__)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        
+        # key -> (expires_at, response, tokens), least recently used first
+        self._memory: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._puts = 0
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the disk tier on first use. Call with the lock held."""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, tokens INTEGER NOT NULL, expires REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+            db.commit()
+            self._db = db
+        return self._db
+    
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str, int]]:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT expires, response, tokens FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return row
+    
+    def _disk_put(self, key: str, expires: float, response: str, tokens: int):
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, tokens, expires) VALUES (?, ?, ?, ?)",
+                (key, response, tokens, expires)
+            )
+            self._puts += 1
+            if self._puts % PURGE_EVERY == 0:
+                db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+            db.commit()
+    
+    def _remember(self, key: str, expires: float, response: str, tokens: int):
+        self._memory[key] = (expires, response, tokens)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    async def get(self, key: str) -> Optional[Tuple[str, int, str]]:
+        """Look a key up in memory, then on disk.
+        
+        Returns:
+            Response, its tokens and the tier that had it, or None
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] >= time.time():
+                self._memory.move_to_end(key)
+                return entry[1], entry[2], "memory"
+            del self._memory[key]
+        
+        if self.path is None:
+            return None
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key)
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM response cache read failed: {e}")
+            return None
+        if entry is None:
+            return None
+        self._remember(key, *entry)
+        return entry[1], entry[2], "disk"
+    
+    async def put(self, key: str, response: str, tokens: int):
+        """Store a response in both tiers."""
+        expires = time.time() + self.ttl
+        self._remember(key, expires, response, tokens)
+        if self.path is None:
+            return
+        try:
+            await asyncio.to_thread(self._disk_put, key, expires, response, tokens)
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM response cache write failed: {e}")
+    
+    async def get_or_run(self, key: str,
+                         run: Callable[[], Awaitable[CachedResponse]]) -> Tuple[str, int, Optional[str]]:
+        """Return the cached response for a key, or run the call and cache its result.
+        
+        Args:
+            key: Key from cache_key
+            run: Makes the call; returns the response and the tokens it used
+        
+        Returns:
+            Response, tokens, and the tier it came from ("memory", "disk",
+            "shared" when another caller's running call produced it), or None
+            when ``run`` was called
+        
+        Raises:
+            Whatever ``run`` raised, in this caller and in every caller that
+            was waiting on the same call. Only a cancelled call is retried by
+            its waiters.
+        """
+        while True:
+            cached = await self.get(key)
+            if cached is not None:
+                self._hit(cached[2], cached[1])
+                return cached
+            
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            try:
+                response, tokens = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The running call was cancelled; make our own
+                continue
+            self._hit("shared", tokens)
+            return response, tokens, "shared"
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            response, tokens = await run()
+        except Exception as e:
+            # Waiters share the failure rather than each calling the model again
+            future.set_exception(e)
+            # Retrieved so a failure nobody waited on is not logged as unhandled
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._pending[key]
+        future.set_result((response, tokens))
+        await self.put(key, response, tokens)
+        return response, tokens, None
+    
+    def _hit(self, tier: str, tokens: int):
+        if tier == "memory":
+            self.memory_hits += 1
+        elif tier == "disk":
+            self.disk_hits += 1
+        else:
+            self.shared_hits += 1
+        self.tokens_saved += tokens
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit counts per tier, hit rate and tokens saved."""
+        hits = self.memory_hits + self.disk_hits + self.shared_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "path": self.path,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "tokens_saved": self.tokens_saved
+        }
+    
+    def close(self):
+        """Close the disk tier."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
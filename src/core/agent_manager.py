@@ -5,14 +5,21 @@ Core agent management and orchestration functionality.
 """
 
 import asyncio
+import bisect
+import time
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 from utils.logger import setup_logger
 from core.config import Config
+from core.agent_stats import AgentPerformanceStats
+from core.agent_snapshot import AgentSnapshotStore, AgentRecord, agent_to_record, gc_paused
+from core.metrics_exporter import platform_collector
 
 
 class AgentStatus(Enum):
@@ -36,9 +43,16 @@ class Agent:
     last_activity: datetime
     tasks_completed: int = 0
     tasks_failed: int = 0
+    in_flight_tasks: int = 0
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert agent to dictionary."""
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Convert agent to dictionary.
+        
+        Args:
+            fields: Keys to include, from AGENT_FIELDS; all of them if omitted
+        """
+        if fields is not None:
+            return {name: AGENT_FIELDS[name](self) for name in fields}
         return {
             "id": self.id,
             "name": self.name,
@@ -49,7 +63,66 @@ class Agent:
             "created_at": self.created_at.isoformat(),
             "last_activity": self.last_activity.isoformat(),
             "tasks_completed": self.tasks_completed,
-            "tasks_failed": self.tasks_failed
+            "tasks_failed": self.tasks_failed,
+            "in_flight_tasks": self.in_flight_tasks
+        }
+
+
+def agents_from_records(records: Iterable[AgentRecord]) -> Dict[str, Agent]:
+    """Rebuild agents from captured records, keyed by ID."""
+    statuses = {status.value: status for status in AgentStatus}
+    timestamps: Dict[float, datetime] = {}
+    
+    def to_datetime(value: float) -> datetime:
+        # Agents created or touched together share timestamps
+        converted = timestamps.get(value)
+        if converted is None:
+            converted = timestamps[value] = datetime.fromtimestamp(value)
+        return converted
+    
+    # Positional construction; field order matches AgentRecord
+    return {
+        record[0]: Agent(
+            record[0], record[1], record[2], statuses[record[3]], record[4], record[5],
+            to_datetime(record[6]), to_datetime(record[7]), record[8], record[9]
+        )
+        for record in records
+    }
+
+
+# Serializers for each key of Agent.to_dict, for projecting a subset of fields
+AGENT_FIELDS: Dict[str, Callable[[Agent], Any]] = {
+    "id": lambda agent: agent.id,
+    "name": lambda agent: agent.name,
+    "type": lambda agent: agent.type,
+    "status": lambda agent: agent.status.value,
+    "capabilities": lambda agent: agent.capabilities,
+    "config": lambda agent: agent.config,
+    "created_at": lambda agent: agent.created_at.isoformat(),
+    "last_activity": lambda agent: agent.last_activity.isoformat(),
+    "tasks_completed": lambda agent: agent.tasks_completed,
+    "tasks_failed": lambda agent: agent.tasks_failed,
+    "in_flight_tasks": lambda agent: agent.in_flight_tasks
+}
+
+
+@dataclass
+class BulkOperationResult:
+    """Per-agent outcome of a bulk lifecycle operation."""
+    agent_id: str
+    success: bool
+    error: Optional[str] = None
+    drained: bool = True
+    duration: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary."""
+        return {
+            "agent_id": self.agent_id,
+            "success": self.success,
+            "error": self.error,
+            "drained": self.drained,
+            "duration": self.duration
         }
 
 
@@ -66,13 +139,57 @@ class AgentManager:
         self.logger = setup_logger(__name__)
         self.agents: Dict[str, Agent] = {}
         self.initialized = False
+        
+        # Agent IDs in sort order for cursor pagination, kept in step by
+        # _notify_change as agents are added or removed, and rebuilt when the
+        # registry is replaced or filled in bulk without notifications
+        self._sorted_ids: List[str] = []
+        self._indexed_agents: Optional[Dict[str, Agent]] = None
+        
+        # Lifecycle settings
+        self.bulk_concurrency = config.agent_bulk_concurrency
+        self.drain_timeout = config.agent_drain_timeout
+        self.restart_delay = config.agent_restart_delay
+        
+        # Drain tracking: agents refusing new work, and waiters for in-flight work
+        self.draining: set = set()
+        self._drain_events: Dict[str, asyncio.Event] = {}
+        
+        # Rolling-window statistics, created on an agent's first recorded task
+        self.stats_half_life = config.agent_stats_half_life
+        self.agent_stats: Dict[str, AgentPerformanceStats] = {}
+        
+        # Warm-restart snapshots: periodic checkpoint plus an append log of dirty agents
+        self.snapshot_store: Optional[AgentSnapshotStore] = None
+        if config.agent_snapshot_enabled:
+            self.snapshot_store = AgentSnapshotStore(config.agent_snapshot_dir)
+        self.snapshot_interval = config.agent_snapshot_interval
+        self.checkpoint_interval = config.agent_checkpoint_interval
+        self.snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_lock = asyncio.Lock()
+        self._dirty: set = set()
+        
+        # Called with the agent ID on every status or activity change; must be
+        # cheap and must not raise, as they run inline with the change
+        self.change_listeners: List[Callable[[str], None]] = []
+        # Registry version, bumped on every change, and the Unix time of the
+        # latest one; HTTP responses derive entity tags from them
+        self.version = 0
+        self.last_modified = time.time()
+        
+        platform_collector.attach_agent_manager(self)
     
     async def initialize(self):
         """Initialize the agent manager."""
         self.logger.info("Initializing Agent Manager...")
         
-        # Create some default agents
-        await self._create_default_agents()
+        # Restore the previous registry, falling back to the default agents
+        restored = await self._restore_snapshot() if self.snapshot_store else False
+        if not restored:
+            await self._create_default_agents()
+        
+        if self.snapshot_store:
+            self.snapshot_task = asyncio.create_task(self._snapshot_loop())
         
         self.initialized = True
         self.logger.info("Agent Manager initialized successfully")
@@ -119,50 +236,336 @@ class AgentManager:
             )
             
             self.agents[agent.id] = agent
+            self._mark_changed(agent.id)
             self.logger.info(f"Created default agent: {agent.name} ({agent.id})")
     
+    async def _restore_snapshot(self) -> bool:
+        """Restore agents from the snapshot store.
+        
+        Returns:
+            True if any agents were restored
+        """
+        start = time.perf_counter()
+        try:
+            records = await asyncio.to_thread(self.snapshot_store.load)
+        except Exception as e:
+            self.logger.error(f"Failed to load agent snapshot, starting fresh: {e}")
+            return False
+        
+        if not records:
+            return False
+        
+        # Nothing else runs on the loop before startup finishes
+        with gc_paused():
+            self.agents.update(agents_from_records(records.values()))
+        self.version += 1
+        self.last_modified = time.time()
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.logger.info(f"Restored {len(records)} agents from snapshot in {elapsed_ms:.1f}ms")
+        return True
+    
+    @staticmethod
+    def _capture_records(agents: List[Agent],
+                         status_overrides: Optional[Dict[str, AgentStatus]] = None) -> List[AgentRecord]:
+        """Capture persistent agent fields, off the event loop."""
+        records = [agent_to_record(agent) for agent in agents]
+        if status_overrides:
+            records = [
+                (record[:3] + (status_overrides[record[0]].value,) + record[4:])
+                if record[0] in status_overrides else record
+                for record in records
+            ]
+        return records
+    
+    async def checkpoint(self, status_overrides: Optional[Dict[str, AgentStatus]] = None):
+        """Write a full checkpoint of the agent registry.
+        
+        Args:
+            status_overrides: Statuses to persist instead of the current ones
+        """
+        if not self.snapshot_store:
+            return
+        
+        async with self._snapshot_lock:
+            # Only the agent list is copied on the loop. An agent changed while
+            # the thread reads it is dirty again and reaches the log next flush.
+            agents = list(self.agents.values())
+            self._dirty.clear()
+            size = await asyncio.to_thread(self._write_checkpoint, agents, status_overrides)
+        self.logger.info(f"Checkpointed {len(agents)} agents ({size} bytes)")
+    
+    def _write_checkpoint(self, agents: List[Agent],
+                          status_overrides: Optional[Dict[str, AgentStatus]]) -> int:
+        """Capture and write a checkpoint on a worker thread."""
+        return self.snapshot_store.write_checkpoint(self._capture_records(agents, status_overrides))
+    
+    async def _flush_snapshot_log(self):
+        """Append agents changed since the last flush to the snapshot log."""
+        if not self._dirty:
+            return
+        
+        async with self._snapshot_lock:
+            dirty, self._dirty = self._dirty, set()
+            records = [agent_to_record(self.agents[agent_id]) for agent_id in dirty if agent_id in self.agents]
+            removed = [agent_id for agent_id in dirty if agent_id not in self.agents]
+            await asyncio.to_thread(self.snapshot_store.append, records, removed)
+    
+    async def _snapshot_loop(self):
+        """Periodically flush the snapshot log and write checkpoints."""
+        last_checkpoint = time.monotonic()
+        while True:
+            try:
+                await asyncio.sleep(self.snapshot_interval)
+                if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                    await self.checkpoint()
+                    last_checkpoint = time.monotonic()
+                else:
+                    await self._flush_snapshot_log()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error writing agent snapshot: {e}")
+    
     async def start_agent(self, agent_id: str):
         """Start an agent.
         
         Args:
             agent_id: Agent ID
         """
-        if agent_id not in self.agents:
-            raise ValueError(f"Agent not found: {agent_id}")
-        
-        agent = self.agents[agent_id]
-        agent.status = AgentStatus.ACTIVE
-        agent.last_activity = datetime.now()
+        agent = self._start_agent(agent_id)
         
         self.logger.info(f"Started agent: {agent.name} ({agent_id})")
     
-    async def stop_agent(self, agent_id: str):
+    async def stop_agent(self, agent_id: str, drain: bool = True, drain_timeout: Optional[float] = None):
         """Stop an agent.
         
         Args:
             agent_id: Agent ID
+            drain: Wait for in-flight tasks to finish before stopping
+            drain_timeout: Maximum seconds to wait for in-flight tasks
         """
-        if agent_id not in self.agents:
-            raise ValueError(f"Agent not found: {agent_id}")
-        
+        drained = await self._stop_agent(agent_id, drain, drain_timeout)
         agent = self.agents[agent_id]
-        agent.status = AgentStatus.OFFLINE
-        agent.last_activity = datetime.now()
         
-        self.logger.info(f"Stopped agent: {agent.name} ({agent_id})")
+        if drained:
+            self.logger.info(f"Stopped agent: {agent.name} ({agent_id})")
+        else:
+            self.logger.warning(
+                f"Stopped agent: {agent.name} ({agent_id}) with {agent.in_flight_tasks} tasks still in flight"
+            )
     
-    async def restart_agent(self, agent_id: str):
+    async def restart_agent(self, agent_id: str, drain: bool = True, drain_timeout: Optional[float] = None):
         """Restart an agent.
         
         Args:
             agent_id: Agent ID
+            drain: Wait for in-flight tasks to finish before stopping
+            drain_timeout: Maximum seconds to wait for in-flight tasks
         """
-        await self.stop_agent(agent_id)
-        await asyncio.sleep(1)  # Brief pause
-        await self.start_agent(agent_id)
+        await self._restart_agent(agent_id, drain, drain_timeout)
         
         self.logger.info(f"Restarted agent: {agent_id}")
     
+    async def start_agents(self, agent_ids: Iterable[str],
+                           concurrency: Optional[int] = None) -> List[BulkOperationResult]:
+        """Start many agents with bounded concurrency.
+        
+        Args:
+            agent_ids: IDs of agents to start
+            concurrency: Maximum number of agents processed at once
+            
+        Returns:
+            Per-agent results, in the order of ``agent_ids``
+        """
+        async def action(agent_id: str) -> bool:
+            self._start_agent(agent_id)
+            return True
+        
+        return await self._run_bulk("start", agent_ids, action, concurrency)
+    
+    async def stop_agents(self, agent_ids: Iterable[str],
+                          concurrency: Optional[int] = None,
+                          drain: bool = True,
+                          drain_timeout: Optional[float] = None) -> List[BulkOperationResult]:
+        """Stop many agents with bounded concurrency.
+        
+        Args:
+            agent_ids: IDs of agents to stop
+            concurrency: Maximum number of agents processed at once
+            drain: Wait for in-flight tasks to finish before stopping each agent
+            drain_timeout: Maximum seconds to wait for each agent to drain
+            
+        Returns:
+            Per-agent results, in the order of ``agent_ids``
+        """
+        async def action(agent_id: str) -> bool:
+            return await self._stop_agent(agent_id, drain, drain_timeout)
+        
+        return await self._run_bulk("stop", agent_ids, action, concurrency)
+    
+    async def restart_agents(self, agent_ids: Iterable[str],
+                             concurrency: Optional[int] = None,
+                             drain: bool = True,
+                             drain_timeout: Optional[float] = None) -> List[BulkOperationResult]:
+        """Restart many agents with bounded concurrency.
+        
+        At most ``concurrency`` agents are out of service at any moment, so
+        this doubles as a rolling restart.
+        
+        Args:
+            agent_ids: IDs of agents to restart
+            concurrency: Maximum number of agents restarting at once
+            drain: Wait for in-flight tasks to finish before stopping each agent
+            drain_timeout: Maximum seconds to wait for each agent to drain
+            
+        Returns:
+            Per-agent results, in the order of ``agent_ids``
+        """
+        async def action(agent_id: str) -> bool:
+            return await self._restart_agent(agent_id, drain, drain_timeout)
+        
+        return await self._run_bulk("restart", agent_ids, action, concurrency)
+    
+    def _mark_changed(self, agent_id: str):
+        """Record an agent change for the next snapshot and tell listeners."""
+        self._dirty.add(agent_id)
+        self._notify_change(agent_id)
+    
+    def _notify_change(self, agent_id: str):
+        """Bump the registry version and tell listeners an agent changed."""
+        self.version += 1
+        self.last_modified = time.time()
+        if self._indexed_agents is self.agents:
+            self._index_agent(agent_id)
+        for listener in self.change_listeners:
+            listener(agent_id)
+    
+    def _index_agent(self, agent_id: str):
+        """Insert or remove an agent in the sorted ID index after it was added or removed."""
+        sorted_ids = self._sorted_ids
+        index = bisect.bisect_left(sorted_ids, agent_id)
+        indexed = index < len(sorted_ids) and sorted_ids[index] == agent_id
+        if agent_id in self.agents:
+            if not indexed:
+                sorted_ids.insert(index, agent_id)
+        elif indexed:
+            del sorted_ids[index]
+    
+    def _get_agent_or_raise(self, agent_id: str) -> Agent:
+        """Look up an agent, raising if it does not exist."""
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise ValueError(f"Agent not found: {agent_id}")
+        return agent
+    
+    def _start_agent(self, agent_id: str) -> Agent:
+        """Mark an agent active without logging."""
+        agent = self._get_agent_or_raise(agent_id)
+        agent.status = AgentStatus.ACTIVE
+        agent.last_activity = datetime.now()
+        self.draining.discard(agent_id)
+        self._mark_changed(agent_id)
+        return agent
+    
+    async def _stop_agent(self, agent_id: str, drain: bool, drain_timeout: Optional[float]) -> bool:
+        """Drain and mark an agent offline without logging.
+        
+        Returns:
+            True if the agent had no in-flight work when it went offline
+        """
+        agent = self._get_agent_or_raise(agent_id)
+        drained = True
+        
+        if drain and agent.in_flight_tasks > 0:
+            self.draining.add(agent_id)
+            drained = await self._wait_for_drain(agent, drain_timeout)
+        
+        agent.status = AgentStatus.OFFLINE
+        agent.last_activity = datetime.now()
+        self.draining.discard(agent_id)
+        self._mark_changed(agent_id)
+        return drained
+    
+    async def _restart_agent(self, agent_id: str, drain: bool, drain_timeout: Optional[float]) -> bool:
+        """Stop then start an agent without logging."""
+        drained = await self._stop_agent(agent_id, drain, drain_timeout)
+        if self.restart_delay > 0:
+            await asyncio.sleep(self.restart_delay)
+        self._start_agent(agent_id)
+        return drained
+    
+    async def _wait_for_drain(self, agent: Agent, timeout: Optional[float]) -> bool:
+        """Wait until an agent has no in-flight tasks.
+        
+        Returns:
+            True if the agent drained before the timeout expired
+        """
+        if timeout is None:
+            timeout = self.drain_timeout
+        
+        # Shared by every waiter on the agent; removed and set when its in-flight count reaches 0
+        event = self._drain_events.get(agent.id)
+        if event is None:
+            event = self._drain_events[agent.id] = asyncio.Event()
+        
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return agent.in_flight_tasks == 0
+    
+    async def _run_bulk(self, operation: str, agent_ids: Iterable[str],
+                        action: Callable[[str], Awaitable[bool]],
+                        concurrency: Optional[int]) -> List[BulkOperationResult]:
+        """Run a lifecycle action over many agents with a bounded worker pool.
+        
+        Logs a single aggregated line for the whole batch instead of one
+        line per agent.
+        """
+        ids = list(agent_ids)
+        results: List[Optional[BulkOperationResult]] = [None] * len(ids)
+        limit = max(1, min(concurrency or self.bulk_concurrency, len(ids) or 1))
+        next_index = iter(range(len(ids)))
+        batch_start = time.perf_counter()
+        
+        async def worker():
+            for index in next_index:
+                agent_id = ids[index]
+                start = time.perf_counter()
+                try:
+                    drained = await action(agent_id)
+                    results[index] = BulkOperationResult(
+                        agent_id=agent_id,
+                        success=True,
+                        drained=drained,
+                        duration=time.perf_counter() - start
+                    )
+                except Exception as e:
+                    results[index] = BulkOperationResult(
+                        agent_id=agent_id,
+                        success=False,
+                        error=str(e),
+                        duration=time.perf_counter() - start
+                    )
+        
+        await asyncio.gather(*(worker() for _ in range(limit)))
+        
+        elapsed = time.perf_counter() - batch_start
+        failed = [result for result in results if not result.success]
+        undrained = sum(1 for result in results if result.success and not result.drained)
+        summary = (
+            f"Bulk {operation}: {len(ids) - len(failed)}/{len(ids)} agents succeeded "
+            f"in {elapsed:.2f}s (concurrency={limit}, undrained={undrained})"
+        )
+        if failed:
+            sample = ", ".join(f"{result.agent_id}: {result.error}" for result in failed[:5])
+            self.logger.warning(f"{summary}; failures: {sample}")
+        else:
+            self.logger.info(summary)
+        
+        return results
+    
     async def get_agent(self, agent_id: str) -> Optional[Agent]:
         """Get agent by ID.
         
@@ -182,6 +585,45 @@ class AgentManager:
         """
         return list(self.agents.values())
     
+    def iter_agents(self, status: Optional[AgentStatus] = None, agent_type: Optional[str] = None,
+                    capability: Optional[str] = None, active_since: Optional[datetime] = None,
+                    active_until: Optional[datetime] = None, after: Optional[str] = None) -> Iterator[Agent]:
+        """Iterate agents in ID order, optionally filtered.
+        
+        Matching is lazy, so a caller that stops after one page only pays
+        for the agents it scanned.
+        
+        Args:
+            status: Only agents with this status
+            agent_type: Only agents of this type
+            capability: Only agents with this capability
+            active_since: Only agents last active at or after this time
+            active_until: Only agents last active before this time
+            after: Resume after this agent ID (the cursor of a previous page)
+            
+        Yields:
+            Matching agents
+        """
+        if self._indexed_agents is not self.agents or len(self._sorted_ids) != len(self.agents):
+            self._sorted_ids = sorted(self.agents)
+            self._indexed_agents = self.agents
+        sorted_ids = self._sorted_ids
+        
+        start = bisect.bisect_right(sorted_ids, after) if after is not None else 0
+        for index in range(start, len(sorted_ids)):
+            agent = self.agents[sorted_ids[index]]
+            if status is not None and agent.status != status:
+                continue
+            if agent_type is not None and agent.type != agent_type:
+                continue
+            if capability is not None and capability not in agent.capabilities:
+                continue
+            if active_since is not None and agent.last_activity < active_since:
+                continue
+            if active_until is not None and agent.last_activity >= active_until:
+                continue
+            yield agent
+    
     async def get_agents_by_type(self, agent_type: str) -> List[Agent]:
         """Get agents by type.
         
@@ -204,12 +646,35 @@ class AgentManager:
         """
         return [agent for agent in self.agents.values() if agent.status == status]
     
-    async def update_agent_activity(self, agent_id: str, task_completed: bool = True):
+    def begin_agent_task(self, agent_id: str) -> bool:
+        """Record that an agent has picked up a task.
+        
+        The matching completion is recorded by ``update_agent_activity``,
+        or by ``end_agent_task`` when the task ends without a result.
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            False if the agent is unknown, offline or draining and should not
+            be given new work
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None or agent.status == AgentStatus.OFFLINE or agent_id in self.draining:
+            return False
+        
+        agent.in_flight_tasks += 1
+        self._notify_change(agent_id)
+        return True
+    
+    async def update_agent_activity(self, agent_id: str, task_completed: bool = True,
+                                    duration: Optional[float] = None):
         """Update agent activity.
         
         Args:
             agent_id: Agent ID
             task_completed: Whether task was completed successfully
+            duration: Task duration in seconds, if known
         """
         if agent_id not in self.agents:
             return
@@ -221,6 +686,36 @@ class AgentManager:
             agent.tasks_completed += 1
         else:
             agent.tasks_failed += 1
+        self._release_task(agent)
+        self._mark_changed(agent_id)
+        
+        stats = self.agent_stats.get(agent_id)
+        if stats is None:
+            stats = self.agent_stats[agent_id] = AgentPerformanceStats(
+                ewma_half_life=self.stats_half_life
+            )
+        stats.record(task_completed, duration)
+    
+    def end_agent_task(self, agent_id: str):
+        """Record that an agent's task ended without a result, e.g. it was cancelled.
+        
+        Args:
+            agent_id: Agent ID
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            return
+        self._release_task(agent)
+        self._notify_change(agent_id)
+    
+    def _release_task(self, agent: Agent):
+        """Drop one in-flight task, waking drain waiters when none are left."""
+        if agent.in_flight_tasks > 0:
+            agent.in_flight_tasks -= 1
+        if agent.in_flight_tasks == 0:
+            event = self._drain_events.pop(agent.id, None)
+            if event is not None:
+                event.set()
     
     async def get_agent_metrics(self, agent_id: str) -> Dict[str, Any]:
         """Get agent performance metrics.
@@ -238,24 +733,101 @@ class AgentManager:
         total_tasks = agent.tasks_completed + agent.tasks_failed
         success_rate = (agent.tasks_completed / total_tasks) if total_tasks > 0 else 0
         
+        # Score on recent behavior when there is any, lifetime otherwise
+        stats = self.agent_stats.get(agent_id)
+        recent_success_rate = stats.ewma_success_rate if stats else None
+        score_rate = recent_success_rate if recent_success_rate is not None else success_rate
+        
         return {
             "cpu_usage": 45.2,  # Mock data
             "memory_usage": 62.8,  # Mock data
             "tasks_completed": agent.tasks_completed,
             "tasks_failed": agent.tasks_failed,
             "success_rate": success_rate,
+            "recent_success_rate": recent_success_rate,
+            "recent": stats.to_dict() if stats else None,
             "uptime": (datetime.now() - agent.created_at).total_seconds(),
             "last_activity": agent.last_activity,
-            "performance_score": min(success_rate * 100, 100)
+            "performance_score": min(score_rate * 100, 100)
+        }
+    
+    async def get_agents_metrics(self, agent_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Get performance metrics of many agents in one call, as columns.
+        
+        Computes the same values as ``get_agent_metrics``, without its mock
+        resource figures, over whole columns instead of agent by agent.
+        
+        Args:
+            agent_ids: Agents to include, in order; unknown IDs are skipped.
+                Defaults to every agent.
+            
+        Returns:
+            Columns aligned by position: lists for "agent_id", "name", "type",
+            "status" (values) and "last_activity" (ISO format); numpy arrays for
+            "tasks_completed", "tasks_failed", "success_rate", "uptime" and
+            "performance_score"
+        """
+        if agent_ids is None:
+            agents = list(self.agents.values())
+        else:
+            agents = [self.agents[agent_id] for agent_id in agent_ids if agent_id in self.agents]
+        count = len(agents)
+        
+        completed = np.fromiter((agent.tasks_completed for agent in agents), dtype=np.int64, count=count)
+        failed = np.fromiter((agent.tasks_failed for agent in agents), dtype=np.int64, count=count)
+        total = completed + failed
+        success_rate = np.divide(completed, total, out=np.zeros(count), where=total > 0)
+        
+        # Score on recent behavior when there is any, lifetime otherwise
+        recent = np.fromiter((
+            stats.ewma_success_rate if stats is not None and stats.ewma_success_rate is not None else np.nan
+            for stats in map(self.agent_stats.get, (agent.id for agent in agents))
+        ), dtype=np.float64, count=count)
+        score_rate = np.where(np.isnan(recent), success_rate, recent)
+        
+        created = np.fromiter((agent.created_at.timestamp() for agent in agents), dtype=np.float64, count=count)
+        
+        return {
+            "agent_id": [agent.id for agent in agents],
+            "name": [agent.name for agent in agents],
+            "type": [agent.type for agent in agents],
+            "status": [agent.status.value for agent in agents],
+            "tasks_completed": completed,
+            "tasks_failed": failed,
+            "success_rate": success_rate,
+            "uptime": datetime.now().timestamp() - created,
+            "last_activity": [agent.last_activity.isoformat() for agent in agents],
+            "performance_score": np.minimum(score_rate * 100, 100)
         }
     
+    def get_agent_stats(self, agent_id: str) -> Optional[AgentPerformanceStats]:
+        """Get rolling-window statistics for an agent.
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            Statistics if the agent has recorded any tasks, None otherwise
+        """
+        return self.agent_stats.get(agent_id)
+    
     async def shutdown(self):
         """Shutdown the agent manager."""
         self.logger.info("Shutting down Agent Manager...")
         
-        # Stop all agents
-        for agent_id in list(self.agents.keys()):
-            await self.stop_agent(agent_id)
+        if self.snapshot_task:
+            self.snapshot_task.cancel()
+            await asyncio.gather(self.snapshot_task, return_exceptions=True)
+            self.snapshot_task = None
+        
+        # Stop all agents, remembering their statuses for the next warm start
+        previous_status = {agent_id: agent.status for agent_id, agent in self.agents.items()}
+        await self.stop_agents(list(self.agents.keys()))
+        
+        try:
+            await self.checkpoint(status_overrides=previous_status)
+        except Exception as e:
+            self.logger.error(f"Failed to write final agent checkpoint: {e}")
         
         self.initialized = False
         self.logger.info("Agent Manager shut down")
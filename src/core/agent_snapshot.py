@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Agent Snapshot Store
+Compact checkpoint plus append-log persistence for fast warm restarts.
+"""
+
+import gc
+import io
+import json
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterable, Tuple
+
+
+SNAPSHOT_VERSION = 1
+
+# Plain-tuple view of an agent, captured on the event loop and encoded elsewhere
+AgentRecord = Tuple[str, str, str, str, List[str], Dict[str, Any], float, float, int, int]
+
+
+def agent_to_record(agent: Any) -> AgentRecord:
+    """Capture an agent's persistent fields as a plain tuple."""
+    return (
+        agent.id,
+        agent.name,
+        agent.type,
+        agent.status.value,
+        agent.capabilities,
+        agent.config,
+        agent.created_at.timestamp(),
+        agent.last_activity.timestamp(),
+        agent.tasks_completed,
+        agent.tasks_failed
+    )
+
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic garbage collector during bulk allocation.
+    
+    Decoding a large registry allocates hundreds of thousands of containers
+    that are never garbage, and repeated collections would dominate restore time.
+    The switch is process-wide, so only use it on the event loop while nothing
+    else runs, such as during startup; never from a worker thread.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _config_key(config: Dict[str, Any]) -> Any:
+    """Hashable interning key for an agent config.
+    
+    Flat configs hash as a sorted item tuple; nested ones fall back to their
+    canonical JSON text.
+    """
+    try:
+        key = tuple(sorted(config.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return json.dumps(config, sort_keys=True)
+
+
+def _config_from_key(key: Any) -> Dict[str, Any]:
+    """Rebuild a config from its interning key."""
+    return json.loads(key) if isinstance(key, str) else dict(key)
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """Unpickler that only accepts builtin containers and scalars."""
+    
+    def find_class(self, module: str, name: str):
+        raise pickle.UnpicklingError(f"Checkpoint references forbidden global {module}.{name}")
+
+
+def safe_loads(data: bytes) -> Any:
+    """Unpickle data that may only contain builtin containers and scalars."""
+    return _CheckpointUnpickler(io.BytesIO(data)).load()
+
+
+def encode_columns(records: Iterable[AgentRecord]) -> Dict[str, Any]:
+    """Encode records as interned columns of builtin containers and scalars."""
+    strings: Dict[str, int] = {}
+    capability_sets: Dict[Tuple[str, ...], int] = {}
+    configs: Dict[Any, int] = {}
+    columns: Dict[str, List[Any]] = {
+        "id": [], "name": [], "type": [], "status": [], "capabilities": [],
+        "config": [], "created_at": [], "last_activity": [],
+        "tasks_completed": [], "tasks_failed": []
+    }
+    
+    def intern(table: Dict[Any, int], key: Any) -> int:
+        index = table.get(key)
+        if index is None:
+            index = table[key] = len(table)
+        return index
+    
+    for (agent_id, name, agent_type, status, capabilities, config,
+         created_at, last_activity, tasks_completed, tasks_failed) in records:
+        columns["id"].append(agent_id)
+        columns["name"].append(intern(strings, name))
+        columns["type"].append(intern(strings, agent_type))
+        columns["status"].append(intern(strings, status))
+        columns["capabilities"].append(intern(capability_sets, tuple(capabilities)))
+        columns["config"].append(intern(configs, _config_key(config)))
+        columns["created_at"].append(created_at)
+        columns["last_activity"].append(last_activity)
+        columns["tasks_completed"].append(tasks_completed)
+        columns["tasks_failed"].append(tasks_failed)
+    
+    return {
+        "version": SNAPSHOT_VERSION,
+        "written_at": time.time(),
+        "count": len(columns["id"]),
+        "strings": list(strings),
+        "capabilities": [list(key) for key in capability_sets],
+        "configs": [_config_from_key(key) for key in configs],
+        "columns": columns
+    }
+
+
+def decode_columns(document: Dict[str, Any]) -> List[AgentRecord]:
+    """Decode interned columns back into records."""
+    strings = document["strings"]
+    capability_sets = document["capabilities"]
+    configs = document["configs"]
+    columns = document["columns"]
+    
+    return list(zip(
+        columns["id"],
+        [strings[index] for index in columns["name"]],
+        [strings[index] for index in columns["type"]],
+        [strings[index] for index in columns["status"]],
+        [list(capability_sets[index]) for index in columns["capabilities"]],
+        [dict(configs[index]) for index in columns["config"]],
+        columns["created_at"],
+        columns["last_activity"],
+        columns["tasks_completed"],
+        columns["tasks_failed"]
+    ))
+
+
+class AgentSnapshotStore:
+    """Persists the agent registry as a columnar checkpoint plus an append log.
+    
+    The checkpoint is a single document holding one list per field, with
+    repeated strings, capability lists and configs interned into lookup
+    tables, so 100k agents decode as a handful of flat lists. It is pickled
+    because that decodes several times faster than JSON; only builtin
+    containers and scalars are written, and loading refuses anything else.
+    Changes between checkpoints are appended to the log as one JSON upsert
+    line per dirty agent and replayed in order on load. A torn final log line
+    is ignored.
+    
+    Each checkpoint has a generation number, and the log starts with a header
+    naming the generation it follows. A log from an older generation, left by
+    a crash between replacing the checkpoint and truncating the log, is
+    skipped on load rather than replayed over the newer checkpoint. Call
+    ``load`` before ``append`` so new log entries carry the current generation.
+    """
+    
+    def __init__(self, directory: str,
+                 checkpoint_name: str = "agents.checkpoint",
+                 log_name: str = "agents.log"):
+        """Initialize snapshot store.
+        
+        Args:
+            directory: Directory holding the snapshot files
+            checkpoint_name: Checkpoint file name
+            log_name: Append log file name
+        """
+        self.directory = directory
+        self.checkpoint_path = os.path.join(directory, checkpoint_name)
+        self.log_path = os.path.join(directory, log_name)
+        # Generation of the checkpoint on disk, known after load or write_checkpoint
+        self.generation = 0
+    
+    def write_checkpoint(self, records: Iterable[AgentRecord]) -> int:
+        """Atomically write a full checkpoint and truncate the append log.
+        
+        Args:
+            records: Records of every agent in the registry
+        
+        Returns:
+            Number of bytes written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        generation = self.generation + 1
+        document = encode_columns(records)
+        document["generation"] = generation
+        payload = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self.generation = generation
+        
+        # Everything in the log is now covered by the checkpoint; until the
+        # log is restarted, its older header keeps it from being replayed
+        self._start_log("w")
+        
+        return len(payload)
+    
+    def _start_log(self, mode: str):
+        """Write the log header naming the current generation."""
+        with open(self.log_path, mode, encoding="utf-8") as f:
+            f.write(json.dumps(["g", self.generation]) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def append(self, records: Iterable[AgentRecord], removed: Iterable[str] = ()) -> int:
+        """Append agent upserts and removals to the log.
+        
+        Args:
+            records: Records of agents changed since the last append
+            removed: IDs of agents removed since the last append
+        
+        Returns:
+            Number of log entries written
+        """
+        lines = [json.dumps(["u", *record], separators=(",", ":")) for record in records]
+        lines.extend(json.dumps(["d", agent_id]) for agent_id in removed)
+        if not lines:
+            return 0
+        
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == 0:
+            self._start_log("a")
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        
+        return len(lines)
+    
+    def load(self) -> Dict[str, AgentRecord]:
+        """Restore agent records from the checkpoint and log.
+        
+        Returns:
+            Agent records keyed by ID; empty if no snapshot exists
+        """
+        records: Dict[str, AgentRecord] = {}
+        generation = 0
+        
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "rb") as f:
+                document = safe_loads(f.read())
+            if document.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {document.get('version')}")
+            generation = document.get("generation", 0)
+            for record in decode_columns(document):
+                records[record[0]] = record
+        self.generation = generation
+        
+        stale = False
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash mid-append
+                        break
+                    if entry[0] == "g":
+                        if entry[1] != generation:
+                            # Written before the checkpoint, which already covers it
+                            stale = True
+                            break
+                    elif entry[0] == "u":
+                        records[entry[1]] = tuple(entry[1:])
+                    elif entry[0] == "d":
+                        records.pop(entry[1], None)
+        if stale:
+            # Restarted so later appends are not filed under the old generation
+            self._start_log("w")
+        
+        return records
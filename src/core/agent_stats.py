@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Agent Performance Statistics
+Constant-memory rolling-window and EWMA statistics for agent activity.
+"""
+
+import math
+import time
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Upper bounds (seconds) of the latency histogram buckets, 10ms to ~11 minutes so
+# tasks running into a timeout stay measurable; the last bucket is open-ended.
+LATENCY_BOUNDS: Tuple[float, ...] = tuple(0.01 * (2 ** i) for i in range(17))
+
+# Window name -> (bucket width in seconds, number of buckets)
+DEFAULT_WINDOWS: Dict[str, Tuple[float, int]] = {
+    "1m": (10.0, 6),
+    "5m": (60.0, 5),
+    "1h": (600.0, 6),
+}
+
+# Per-bucket layout: successes, failures, latency sum, timed samples, slowest
+# latency, then histogram counts
+_SUCCESS = 0
+_FAILURE = 1
+_LATENCY_SUM = 2
+_LATENCY_COUNT = 3
+_LATENCY_MAX = 4
+_HISTOGRAM = 5
+_SLOT_SIZE = _HISTOGRAM + len(LATENCY_BOUNDS) + 1
+
+
+def _latency_bucket(latency: float) -> int:
+    """Return the histogram bucket index for a latency in seconds."""
+    for index, bound in enumerate(LATENCY_BOUNDS):
+        if latency <= bound:
+            return index
+    return len(LATENCY_BOUNDS)
+
+
+class RollingWindow:
+    """Time-bucketed sliding window of task outcomes and latencies.
+    
+    The window is a fixed ring of buckets stored in a flat ``array``, so its
+    memory footprint is set at construction and never grows. Expired buckets
+    are recycled lazily when they are next written or skipped when read.
+    """
+    
+    __slots__ = ("bucket_width", "num_buckets", "_epochs", "_data")
+    
+    def __init__(self, bucket_width: float, num_buckets: int):
+        """Initialize rolling window.
+        
+        Args:
+            bucket_width: Width of each bucket in seconds
+            num_buckets: Number of buckets in the ring
+        """
+        self.bucket_width = bucket_width
+        self.num_buckets = num_buckets
+        self._epochs = array("q", [-1] * num_buckets)
+        self._data = array("d", [0.0] * (num_buckets * _SLOT_SIZE))
+    
+    @property
+    def span(self) -> float:
+        """Total time covered by the window in seconds."""
+        return self.bucket_width * self.num_buckets
+    
+    def record(self, now: float, success: bool, latency: Optional[float] = None):
+        """Record a single task outcome.
+        
+        Args:
+            now: Monotonic timestamp of the outcome
+            success: Whether the task succeeded
+            latency: Task duration in seconds, if known
+        """
+        epoch = int(now // self.bucket_width)
+        slot = epoch % self.num_buckets
+        base = slot * _SLOT_SIZE
+        
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            for offset in range(_SLOT_SIZE):
+                self._data[base + offset] = 0.0
+        
+        self._data[base + (_SUCCESS if success else _FAILURE)] += 1
+        
+        if latency is not None:
+            self._data[base + _LATENCY_SUM] += latency
+            self._data[base + _LATENCY_COUNT] += 1
+            if latency > self._data[base + _LATENCY_MAX]:
+                self._data[base + _LATENCY_MAX] = latency
+            self._data[base + _HISTOGRAM + _latency_bucket(latency)] += 1
+    
+    def _live_slots(self, now: float) -> List[int]:
+        """Return base offsets of buckets that fall inside the window."""
+        current = int(now // self.bucket_width)
+        oldest = current - self.num_buckets + 1
+        return [
+            slot * _SLOT_SIZE
+            for slot in range(self.num_buckets)
+            if oldest <= self._epochs[slot] <= current
+        ]
+    
+    def summary(self, now: float, observed_for: Optional[float] = None) -> Dict[str, Any]:
+        """Summarize the window.
+        
+        Args:
+            now: Monotonic timestamp to evaluate the window at
+            observed_for: Seconds since tracking started, used so throughput
+                is not underestimated before the window has filled
+        
+        Returns:
+            Dictionary of window statistics
+        """
+        successes = failures = latency_sum = latency_count = latency_max = 0.0
+        histogram = [0.0] * (len(LATENCY_BOUNDS) + 1)
+        
+        for base in self._live_slots(now):
+            successes += self._data[base + _SUCCESS]
+            failures += self._data[base + _FAILURE]
+            latency_sum += self._data[base + _LATENCY_SUM]
+            latency_count += self._data[base + _LATENCY_COUNT]
+            latency_max = max(latency_max, self._data[base + _LATENCY_MAX])
+            for index in range(len(histogram)):
+                histogram[index] += self._data[base + _HISTOGRAM + index]
+        
+        total = successes + failures
+        # The oldest live bucket is full but the current one is only partly elapsed
+        covered = (self.num_buckets - 1) * self.bucket_width + (now % self.bucket_width)
+        if observed_for is not None:
+            covered = min(covered, observed_for)
+        elapsed = max(covered, 1.0)
+        
+        return {
+            "tasks_completed": int(successes),
+            "tasks_failed": int(failures),
+            "success_rate": (successes / total) if total > 0 else None,
+            "throughput": total / elapsed,
+            "latency_avg": (latency_sum / latency_count) if latency_count > 0 else None,
+            "latency_max": latency_max if latency_count > 0 else None,
+            "latency_p50": _histogram_quantile(histogram, latency_count, latency_max, 0.50),
+            "latency_p95": _histogram_quantile(histogram, latency_count, latency_max, 0.95),
+            "latency_p99": _histogram_quantile(histogram, latency_count, latency_max, 0.99),
+        }
+
+
+def _histogram_quantile(histogram: List[float], count: float, maximum: float,
+                        quantile: float) -> Optional[float]:
+    """Estimate a quantile from latency histogram counts.
+    
+    Interpolates linearly inside the bucket holding the target rank, the same
+    way Prometheus ``histogram_quantile`` does, but never past the slowest
+    latency seen. A rank in the open-ended last bucket reports that latency.
+    """
+    if count <= 0:
+        return None
+    
+    rank = quantile * count
+    cumulative = 0.0
+    for index, bucket_count in enumerate(histogram):
+        if bucket_count <= 0:
+            continue
+        if cumulative + bucket_count >= rank:
+            if index >= len(LATENCY_BOUNDS):
+                return maximum
+            lower = LATENCY_BOUNDS[index - 1] if index > 0 else 0.0
+            upper = min(LATENCY_BOUNDS[index], maximum)
+            return lower + (upper - lower) * ((rank - cumulative) / bucket_count)
+        cumulative += bucket_count
+    return maximum
+
+
+class AgentPerformanceStats:
+    """Recent-behavior statistics for a single agent.
+    
+    Combines fixed-size sliding windows (1m/5m/1h by default) with
+    time-decayed EWMAs of success rate and latency. Updates are O(1) and the
+    memory footprint is constant per agent.
+    """
+    
+    __slots__ = ("windows", "ewma_half_life", "started_at", "_ewma_success",
+                 "_ewma_latency", "_last_update")
+    
+    def __init__(self, windows: Optional[Dict[str, Tuple[float, int]]] = None,
+                 ewma_half_life: float = 60.0):
+        """Initialize agent statistics.
+        
+        Args:
+            windows: Mapping of window name to (bucket width, bucket count)
+            ewma_half_life: Half-life in seconds of the EWMA decay
+        """
+        self.windows = {
+            name: RollingWindow(width, count)
+            for name, (width, count) in (windows or DEFAULT_WINDOWS).items()
+        }
+        self.ewma_half_life = ewma_half_life
+        self.started_at = time.monotonic()
+        # [decayed sum, decayed weight]
+        self._ewma_success = [0.0, 0.0]
+        self._ewma_latency = [0.0, 0.0]
+        self._last_update: Optional[float] = None
+    
+    def record(self, success: bool, latency: Optional[float] = None, now: Optional[float] = None):
+        """Record a task outcome.
+        
+        Args:
+            success: Whether the task succeeded
+            latency: Task duration in seconds, if known
+            now: Monotonic timestamp, defaults to the current time
+        """
+        if now is None:
+            now = time.monotonic()
+        
+        for window in self.windows.values():
+            window.record(now, success, latency)
+        
+        # Time-decayed EWMA kept as decayed sums so bursts of outcomes at the
+        # same instant are all weighted; history halves every half-life.
+        if self._last_update is None:
+            decay = 0.0
+        else:
+            decay = math.exp(-math.log(2) * max(now - self._last_update, 0.0) / self.ewma_half_life)
+        
+        self._ewma_success[0] = decay * self._ewma_success[0] + (1.0 if success else 0.0)
+        self._ewma_success[1] = decay * self._ewma_success[1] + 1.0
+        
+        if latency is not None:
+            self._ewma_latency[0] = decay * self._ewma_latency[0] + latency
+            self._ewma_latency[1] = decay * self._ewma_latency[1] + 1.0
+        else:
+            self._ewma_latency[0] *= decay
+            self._ewma_latency[1] *= decay
+        
+        self._last_update = now
+    
+    @property
+    def ewma_success_rate(self) -> Optional[float]:
+        """Time-decayed success rate, or None before the first outcome."""
+        total, weight = self._ewma_success
+        return (total / weight) if weight > 0 else None
+    
+    @property
+    def ewma_latency(self) -> Optional[float]:
+        """Time-decayed latency in seconds, or None before the first timed outcome."""
+        total, weight = self._ewma_latency
+        return (total / weight) if weight > 0 else None
+    
+    def to_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Convert statistics to dictionary.
+        
+        Args:
+            now: Monotonic timestamp, defaults to the current time
+        """
+        if now is None:
+            now = time.monotonic()
+        observed_for = now - self.started_at
+        
+        return {
+            "windows": {
+                name: window.summary(now, observed_for)
+                for name, window in self.windows.items()
+            },
+            "ewma": {
+                "success_rate": self.ewma_success_rate,
+                "latency": self.ewma_latency,
+                "half_life": self.ewma_half_life
+            }
+        }
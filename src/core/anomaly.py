@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Streaming Anomaly Detection
+Vectorized EWMA z-score and seasonal-baseline detection over metric series.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from core.metrics_exporter import ANOMALY_EVENTS
+
+
+SEVERITY_LEVELS = ("normal", "warning", "critical")
+
+
+class StreamingAnomalyDetector:
+    """Online anomaly detector for many metric series at once.
+    
+    Every series has a slot in a set of NumPy arrays, and each batch of
+    samples updates all slots in a handful of vectorized operations:
+    
+    - a short-term EWMA mean and variance, giving a z-score against the
+      recent level;
+    - a seasonal EWMA per time-of-day bucket, giving a z-score against what
+      is normal at this hour once at least ``seasonal_min_periods`` periods
+      have been seen.
+    
+    When the seasonal baseline is warm, a sample is anomalous only if it
+    deviates from both, so daily peaks stop firing. Events are emitted when a
+    series enters an anomalous state or its severity changes.
+    """
+    
+    def __init__(self, half_life: float = 300.0, warmup: int = 30,
+                 warning_z: float = 4.0, critical_z: float = 6.0,
+                 relative_floor: float = 0.05, season_period: float = 86400.0,
+                 season_buckets: int = 24, seasonal_half_life: float = 3.0,
+                 seasonal_min_periods: int = 2, max_series: int = 256,
+                 max_events: int = 500):
+        """Initialize anomaly detector.
+        
+        Args:
+            half_life: Seconds for the short-term baseline to halve its memory
+            warmup: Samples a series needs before it can be flagged
+            warning_z: |z| at which a sample is a warning
+            critical_z: |z| at which a sample is critical
+            relative_floor: Minimum standard deviation as a fraction of the
+                mean, so near-constant series do not flag tiny changes
+            season_period: Length of the seasonal cycle in seconds
+            season_buckets: Number of buckets the cycle is split into
+            seasonal_half_life: Cycles for a seasonal bucket to halve its memory
+            seasonal_min_periods: Cycles a bucket needs before it is used
+            max_series: Maximum number of series tracked
+            max_events: Number of recent events kept
+        """
+        self.half_life = half_life
+        self.warmup = warmup
+        self.warning_z = warning_z
+        self.critical_z = critical_z
+        self.relative_floor = relative_floor
+        self.season_period = season_period
+        self.season_buckets = season_buckets
+        # A bucket only sees samples during its slice of each cycle, so its
+        # memory decays over observed in-bucket time
+        self.seasonal_decay_time = seasonal_half_life * season_period / season_buckets
+        self.seasonal_min_periods = seasonal_min_periods
+        self.max_series = max_series
+        
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        
+        self._mean = np.zeros(max_series)
+        self._var = np.zeros(max_series)
+        self._count = np.zeros(max_series, dtype=np.int64)
+        self._last_time = np.zeros(max_series)
+        self._severity = np.zeros(max_series, dtype=np.int8)
+        self._zscore = np.zeros(max_series)
+        
+        shape = (max_series, season_buckets)
+        self._season_mean = np.zeros(shape)
+        self._season_var = np.zeros(shape)
+        self._season_periods = np.zeros(shape, dtype=np.int64)
+        self._season_last_cycle = np.full(shape, -1, dtype=np.int64)
+        
+        self._events: deque = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+    
+    def _slots(self, names: List[str]) -> np.ndarray:
+        """Map series names to array slots, registering new series."""
+        slots = []
+        for name in names:
+            slot = self._index.get(name)
+            if slot is None:
+                if len(self._names) >= self.max_series:
+                    slots.append(-1)
+                    continue
+                slot = self._index[name] = len(self._names)
+                self._names.append(name)
+            slots.append(slot)
+        return np.array(slots, dtype=np.int64)
+    
+    def observe(self, values: Dict[str, Any], timestamp: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Score and learn from one sample per series.
+        
+        Args:
+            values: Mapping of series name to value; non-numeric values are skipped
+            timestamp: Sample time in seconds since the epoch, defaults to now
+        
+        Returns:
+            Events emitted by this batch
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        names = []
+        samples = []
+        for name, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                continue
+            names.append(name)
+            samples.append(value)
+        if not names:
+            return []
+        
+        with self._lock:
+            slots = self._slots(names)
+            keep = slots >= 0
+            slots = slots[keep]
+            x = np.asarray(samples, dtype=np.float64)[keep]
+            return self._update(slots, x, timestamp)
+    
+    def _update(self, slots: np.ndarray, x: np.ndarray, timestamp: float) -> List[Dict[str, Any]]:
+        """Vectorized scoring and baseline update for a batch."""
+        mean = self._mean[slots]
+        var = self._var[slots]
+        count = self._count[slots]
+        
+        # Score against the baselines as they were before this sample
+        floor = self.relative_floor * np.abs(mean) + 1e-9
+        std = np.maximum(np.sqrt(var), floor)
+        z = (x - mean) / std
+        
+        cycle, bucket = divmod(int(timestamp // (self.season_period / self.season_buckets)), self.season_buckets)
+        season_mean = self._season_mean[slots, bucket]
+        season_var = self._season_var[slots, bucket]
+        season_periods = self._season_periods[slots, bucket]
+        season_std = np.maximum(np.sqrt(season_var), self.relative_floor * np.abs(season_mean) + 1e-9)
+        season_z = (x - season_mean) / season_std
+        
+        seasonal_ready = season_periods >= self.seasonal_min_periods
+        magnitude = np.where(seasonal_ready, np.minimum(np.abs(z), np.abs(season_z)), np.abs(z))
+        severity = np.where(
+            magnitude >= self.critical_z, 2, np.where(magnitude >= self.warning_z, 1, 0)
+        ).astype(np.int8)
+        severity[count < self.warmup] = 0
+        
+        # Short-term EWMA with a time-based decay; a series' first sample
+        # seeds both baselines outright, so its elapsed time is never used
+        elapsed = timestamp - self._last_time[slots]
+        alpha = np.where(count == 0, 1.0, 1.0 - np.exp(-math.log(2) * np.maximum(elapsed, 0.0) / self.half_life))
+        delta = x - mean
+        self._mean[slots] = mean + alpha * delta
+        self._var[slots] = (1.0 - alpha) * (var + alpha * delta * delta)
+        self._count[slots] = count + 1
+        self._last_time[slots] = timestamp
+        self._zscore[slots] = np.where(seasonal_ready, np.where(np.abs(z) < np.abs(season_z), z, season_z), z)
+        
+        # Seasonal EWMA for this time-of-day bucket
+        season_alpha = np.where(
+            season_periods == 0, 1.0,
+            1.0 - np.exp(-math.log(2) * np.maximum(elapsed, 0.0) / self.seasonal_decay_time)
+        )
+        season_delta = x - season_mean
+        self._season_mean[slots, bucket] = season_mean + season_alpha * season_delta
+        self._season_var[slots, bucket] = (1.0 - season_alpha) * (season_var + season_alpha * season_delta ** 2)
+        new_cycle = self._season_last_cycle[slots, bucket] != cycle
+        self._season_periods[slots, bucket] = season_periods + new_cycle
+        self._season_last_cycle[slots, bucket] = cycle
+        
+        # Emit events only where the state changed
+        previous = self._severity[slots]
+        self._severity[slots] = severity
+        changed = np.flatnonzero(previous != severity)
+        
+        events = []
+        for position in changed:
+            slot = int(slots[position])
+            level = int(severity[position])
+            event = {
+                "series": self._names[slot],
+                "severity": SEVERITY_LEVELS[level],
+                "previous_severity": SEVERITY_LEVELS[int(previous[position])],
+                "value": float(x[position]),
+                "expected": float(season_mean[position] if seasonal_ready[position] else mean[position]),
+                "zscore": float(self._zscore[slot]),
+                "direction": "high" if x[position] >= mean[position] else "low",
+                "timestamp": timestamp
+            }
+            events.append(event)
+            self._events.append(event)
+            if level > 0:
+                ANOMALY_EVENTS.labels(series=event["series"], severity=event["severity"]).inc()
+        return events
+    
+    def get_active_anomalies(self) -> List[Dict[str, Any]]:
+        """Get series currently in an anomalous state, most severe first."""
+        with self._lock:
+            active = np.flatnonzero(self._severity[:len(self._names)] > 0)
+            anomalies = [
+                {
+                    "series": self._names[slot],
+                    "severity": SEVERITY_LEVELS[int(self._severity[slot])],
+                    "zscore": float(self._zscore[slot]),
+                    "baseline": float(self._mean[slot])
+                }
+                for slot in active
+            ]
+        anomalies.sort(key=lambda anomaly: abs(anomaly["zscore"]), reverse=True)
+        anomalies.sort(key=lambda anomaly: anomaly["severity"] != "critical")
+        return anomalies
+    
+    def get_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recent anomaly events, newest first.
+        
+        Args:
+            limit: Maximum number of events to return
+        """
+        events = list(reversed(self._events))
+        return events[:limit] if limit else events
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Container Resource Limits
+cgroup v1/v2 limits, CPU throttling and pressure-stall information.
+"""
+
+import math
+import os
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import psutil
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PRESSURE_ROOT = "/proc/pressure"
+
+# cgroup v1 reports "no limit" as a huge page-aligned number
+_UNLIMITED_THRESHOLD = 1 << 60
+
+
+def _read(path: str) -> Optional[str]:
+    """Read a small pseudo-file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    """Read an integer pseudo-file; "max" and missing files read as None."""
+    text = _read(path)
+    if text is None or text == "max":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _read_keyed(path: str) -> Dict[str, int]:
+    """Read a "key value" per line pseudo-file such as cpu.stat."""
+    values = {}
+    for line in (_read(path) or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].lstrip("-").isdigit():
+            values[parts[0]] = int(parts[1])
+    return values
+
+
+def read_pressure(path: str) -> Dict[str, float]:
+    """Parse a PSI file into flat ``some_avg10``-style keys.
+    
+    Args:
+        path: Path to a pressure file, e.g. /proc/pressure/cpu
+    
+    Returns:
+        Mapping such as {"some_avg10": 1.2, "some_total": 123, ...}; empty if unavailable
+    """
+    values = {}
+    for line in (_read(path) or "").splitlines():
+        kind, _, fields = line.partition(" ")
+        for field in fields.split():
+            key, _, value = field.partition("=")
+            try:
+                values[f"{kind}_{key}"] = float(value)
+            except ValueError:
+                continue
+    return values
+
+
+def _own_cgroup_paths() -> Tuple[Optional[str], Dict[str, str]]:
+    """Return this process's v2 path and v1 paths by controller from /proc/self/cgroup."""
+    unified = None
+    controllers = {}
+    for line in (_read("/proc/self/cgroup") or "").splitlines():
+        hierarchy, _, rest = line.partition(":")
+        names, _, path = rest.partition(":")
+        if hierarchy == "0" and names == "":
+            unified = path
+        for name in names.split(","):
+            if name:
+                controllers[name] = path
+    return unified, controllers
+
+
+class CgroupResources:
+    """Reads the CPU and memory limits the container actually runs under.
+    
+    Host-wide psutil numbers ignore CPU quotas and memory limits, so inside
+    a container they overstate capacity. This reader detects cgroup v2 or
+    v1, resolves the process's own cgroup and reports effective cores,
+    memory headroom, CPU throttling and PSI. Throttling rates are computed
+    from the counter deltas between successive ``sample`` calls. Every value
+    falls back to the host figure when the corresponding file is absent.
+    """
+    
+    def __init__(self, root: str = CGROUP_ROOT, pressure_root: str = PRESSURE_ROOT):
+        """Initialize cgroup reader.
+        
+        Args:
+            root: cgroup filesystem mount point
+            pressure_root: Directory holding system-wide PSI files
+        """
+        self.root = root
+        self.pressure_root = pressure_root
+        self.version, self._cpu_dir, self._memory_dir = self._detect()
+        self._previous_cpu: Optional[Tuple[float, Dict[str, int]]] = None
+    
+    def _detect(self) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        """Find the cgroup version and this process's CPU and memory directories."""
+        unified, controllers = _own_cgroup_paths()
+        
+        if os.path.exists(os.path.join(self.root, "cgroup.controllers")):
+            directory = self._resolve(self.root, unified or "/", "cpu.max")
+            return 2, directory, directory
+        
+        if controllers:
+            cpu_root = os.path.join(self.root, "cpu")
+            if not os.path.isdir(cpu_root):
+                cpu_root = os.path.join(self.root, "cpu,cpuacct")
+            memory_root = os.path.join(self.root, "memory")
+            return (
+                1,
+                self._resolve(cpu_root, controllers.get("cpu", "/"), "cpu.cfs_quota_us"),
+                self._resolve(memory_root, controllers.get("memory", "/"), "memory.limit_in_bytes")
+            )
+        
+        return None, None, None
+    
+    def _resolve(self, mount: str, path: str, probe: str) -> Optional[str]:
+        """Locate a cgroup directory, falling back to the mount root.
+        
+        Inside a cgroup namespace /proc/self/cgroup shows paths relative to
+        the host, which do not exist under the container's mount.
+        """
+        candidate = os.path.join(mount, path.lstrip("/"))
+        if os.path.exists(os.path.join(candidate, probe)):
+            return candidate
+        if os.path.exists(os.path.join(mount, probe)):
+            return mount
+        return None
+    
+    def _cpu_limit(self) -> Optional[float]:
+        """CPU quota in cores, or None if unlimited."""
+        if self._cpu_dir is None:
+            return None
+        if self.version == 2:
+            parts = (_read(os.path.join(self._cpu_dir, "cpu.max")) or "max").split()
+            if parts[0] == "max" or len(parts) < 2:
+                return None
+            return int(parts[0]) / int(parts[1])
+        
+        quota = _read_int(os.path.join(self._cpu_dir, "cpu.cfs_quota_us"))
+        period = _read_int(os.path.join(self._cpu_dir, "cpu.cfs_period_us"))
+        if not quota or quota < 0 or not period:
+            return None
+        return quota / period
+    
+    def _cpu_stat(self) -> Dict[str, int]:
+        """Throttling counters normalized to v2 names and microseconds."""
+        if self._cpu_dir is None:
+            return {}
+        stat = _read_keyed(os.path.join(self._cpu_dir, "cpu.stat"))
+        if self.version == 1 and "throttled_time" in stat:
+            stat["throttled_usec"] = stat.pop("throttled_time") // 1000
+        return stat
+    
+    def _memory(self) -> Tuple[Optional[int], Optional[int]]:
+        """Memory limit and working-set usage in bytes."""
+        if self._memory_dir is None:
+            return None, None
+        
+        if self.version == 2:
+            limit = _read_int(os.path.join(self._memory_dir, "memory.max"))
+            usage = _read_int(os.path.join(self._memory_dir, "memory.current"))
+            inactive_key = "inactive_file"
+        else:
+            limit = _read_int(os.path.join(self._memory_dir, "memory.limit_in_bytes"))
+            usage = _read_int(os.path.join(self._memory_dir, "memory.usage_in_bytes"))
+            inactive_key = "total_inactive_file"
+        
+        if limit is not None and limit >= _UNLIMITED_THRESHOLD:
+            limit = None
+        if usage is not None:
+            # Reclaimable page cache is not pressure; count the working set like kubelet does
+            inactive = _read_keyed(os.path.join(self._memory_dir, "memory.stat")).get(inactive_key, 0)
+            usage = max(usage - inactive, 0)
+        return limit, usage
+    
+    def _pressure(self) -> Dict[str, Dict[str, float]]:
+        """PSI for the cgroup (v2) or the whole system."""
+        pressure = {}
+        for resource in ("cpu", "memory", "io"):
+            values = {}
+            if self.version == 2 and self._cpu_dir is not None:
+                values = read_pressure(os.path.join(self._cpu_dir, f"{resource}.pressure"))
+            if not values:
+                values = read_pressure(os.path.join(self.pressure_root, resource))
+            if values:
+                pressure[resource] = values
+        return pressure
+    
+    def sample(self) -> Dict[str, Any]:
+        """Read current limits, usage, throttling and pressure.
+        
+        Returns:
+            Dictionary of container resource metrics
+        """
+        host_cores = psutil.cpu_count() or 1
+        try:
+            affinity_cores = len(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            affinity_cores = host_cores
+        
+        cpu_limit = self._cpu_limit()
+        effective_cores = min(cpu_limit or host_cores, affinity_cores, host_cores)
+        
+        host_memory = psutil.virtual_memory()
+        memory_limit, memory_usage = self._memory()
+        effective_memory = min(memory_limit or host_memory.total, host_memory.total)
+        if memory_usage is None:
+            memory_usage = host_memory.total - host_memory.available
+        
+        # Throttling rate from counter deltas since the previous sample
+        now = time.monotonic()
+        cpu_stat = self._cpu_stat()
+        throttle_ratio = throttled_per_second = None
+        if self._previous_cpu is not None:
+            then, previous = self._previous_cpu
+            periods = cpu_stat.get("nr_periods", 0) - previous.get("nr_periods", 0)
+            throttled = cpu_stat.get("nr_throttled", 0) - previous.get("nr_throttled", 0)
+            throttle_ratio = (throttled / periods) if periods > 0 else 0.0
+            elapsed = now - then
+            if elapsed > 0:
+                throttled_usec = cpu_stat.get("throttled_usec", 0) - previous.get("throttled_usec", 0)
+                throttled_per_second = throttled_usec / 1e6 / elapsed
+        self._previous_cpu = (now, cpu_stat)
+        
+        return {
+            "cgroup_version": self.version,
+            "host_cores": host_cores,
+            "cpu_limit": cpu_limit,
+            "effective_cores": effective_cores,
+            "cpu_throttle_ratio": throttle_ratio,
+            "cpu_throttled_seconds_per_second": throttled_per_second,
+            "memory_limit": memory_limit,
+            "effective_memory": effective_memory,
+            "memory_working_set": memory_usage,
+            "memory_headroom": max(effective_memory - memory_usage, 0),
+            "effective_memory_percent": (memory_usage / effective_memory) * 100 if effective_memory else None,
+            "pressure": self._pressure()
+        }
+
+
+def suggested_concurrency(resources: Dict[str, Any], per_core: float = 4.0,
+                          task_memory: Optional[int] = None, minimum: int = 1,
+                          maximum: int = 256) -> int:
+    """Suggest how many concurrent tasks the container can sustain.
+    
+    Starts from ``per_core`` tasks per effective core (platform tasks mostly
+    wait on I/O and model APIs), then backs off under CPU throttling or CPU
+    pressure and caps by memory headroom when the per-task footprint is known.
+    
+    Args:
+        resources: Output of ``CgroupResources.sample``
+        per_core: Concurrent tasks per effective core
+        task_memory: Approximate bytes each task needs
+        minimum: Lower bound of the suggestion
+        maximum: Upper bound of the suggestion
+    
+    Returns:
+        Suggested concurrency
+    """
+    concurrency = resources["effective_cores"] * per_core
+    
+    throttle_ratio = resources.get("cpu_throttle_ratio") or 0.0
+    cpu_pressure = resources.get("pressure", {}).get("cpu", {}).get("some_avg10", 0.0) / 100
+    backoff = max(throttle_ratio, cpu_pressure)
+    if backoff > 0.1:
+        concurrency *= 1.0 - min(backoff, 0.75)
+    
+    if task_memory:
+        concurrency = min(concurrency, resources["memory_headroom"] / task_memory)
+    
+    return int(max(minimum, min(maximum, math.floor(concurrency))))
+
+
+_default_resources: Optional[CgroupResources] = None
+
+
+def default_concurrency(per_core: float = 4.0, task_memory: Optional[int] = None) -> int:
+    """Suggested concurrency for this process, for components sized at startup."""
+    global _default_resources
+    if _default_resources is None:
+        _default_resources = CgroupResources()
+    return suggested_concurrency(_default_resources.sample(), per_core, task_memory)
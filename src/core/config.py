@@ -6,7 +6,7 @@ Central configuration management for the AI agents platform.
 
 import os
 from typing import Optional, Dict, Any
-from pydantic import BaseSettings, Field
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -31,6 +31,28 @@ class Config(BaseSettings):
     # AI Model settings
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-3.5-turbo", env="OPENAI_MODEL")
+    # Threads running blocking LLM agent calls, shared by all models
+    ai_llm_max_workers: int = Field(default=16, env="AI_LLM_MAX_WORKERS")
+    # Concurrent calls per model unless its AIModelConfig sets max_concurrency
+    ai_llm_model_concurrency: int = Field(default=4, env="AI_LLM_MODEL_CONCURRENCY")
+    # LLM response cache; responses at temperature > 0 are only cached when the model opts in
+    ai_cache_enabled: bool = Field(default=True, env="AI_CACHE_ENABLED")
+    # SQLite file of the on-disk tier, best given as an absolute path; empty keeps the cache in memory only
+    ai_cache_path: str = Field(default="", env="AI_CACHE_PATH")
+    ai_cache_max_entries: int = Field(default=1024, env="AI_CACHE_MAX_ENTRIES")
+    ai_cache_ttl: float = Field(default=86400.0, env="AI_CACHE_TTL")
+    
+    # Agent lifecycle settings
+    agent_bulk_concurrency: int = Field(default=64, env="AGENT_BULK_CONCURRENCY")
+    agent_drain_timeout: float = Field(default=30.0, env="AGENT_DRAIN_TIMEOUT")
+    agent_restart_delay: float = Field(default=0.0, env="AGENT_RESTART_DELAY")
+    agent_stats_half_life: float = Field(default=60.0, env="AGENT_STATS_HALF_LIFE")
+    
+    # Agent snapshot settings; set AGENT_SNAPSHOT_DIR to an absolute path when enabling
+    agent_snapshot_enabled: bool = Field(default=False, env="AGENT_SNAPSHOT_ENABLED")
+    agent_snapshot_dir: str = Field(default="data/agent_snapshots", env="AGENT_SNAPSHOT_DIR")
+    agent_snapshot_interval: float = Field(default=5.0, env="AGENT_SNAPSHOT_INTERVAL")
+    agent_checkpoint_interval: float = Field(default=300.0, env="AGENT_CHECKPOINT_INTERVAL")
     
     # Liberation System integration
     liberation_system_url: str = Field(default="http://localhost:3000", env="LIBERATION_SYSTEM_URL")
@@ -39,9 +61,23 @@ class Config(BaseSettings):
     
     # Terminal Workflows settings
     terminal_workflows_enabled: bool = Field(default=True, env="TERMINAL_WORKFLOWS_ENABLED")
+    # Concurrent workflow executions; 0 sizes it from the container's CPU and memory limits
+    workflow_max_concurrency: int = Field(default=0, env="WORKFLOW_MAX_CONCURRENCY")
+    
+    # Monitoring settings
+    # Seconds between background samples of system and process metrics
+    metrics_sample_interval: float = Field(default=2.0, env="METRICS_SAMPLE_INTERVAL")
     
     # Enterprise Dashboard settings
     enterprise_dashboard_enabled: bool = Field(default=True, env="ENTERPRISE_DASHBOARD_ENABLED")
+    # Worker processes serving read-only dashboard routes; 0 serves everything in-process
+    dashboard_workers: int = Field(default=0, env="DASHBOARD_WORKERS")
+    # Control API port while workers serve the public port; 0 means the public port + 1
+    dashboard_control_port: int = Field(default=0, env="DASHBOARD_CONTROL_PORT")
+    # Maximum seconds from an agent or task change to its push to dashboard clients
+    dashboard_broadcast_latency: float = Field(default=1.0, env="DASHBOARD_BROADCAST_LATENCY")
+    # Longest interval between dashboard pushes while nothing changes
+    dashboard_idle_interval: float = Field(default=60.0, env="DASHBOARD_IDLE_INTERVAL")
     
     # Security settings
     secret_key: str = Field(default="your-secret-key-change-in-production", env="SECRET_KEY")
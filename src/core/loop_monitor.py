@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Event Loop Monitor
+Measures event-loop scheduling lag and attributes slow callbacks to subsystems.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+
+# Source path fragment -> owning subsystem, checked innermost frame first
+SUBSYSTEMS: Tuple[Tuple[str, str], ...] = (
+    (os.path.join("core", "task_queue.py"), "TaskQueue"),
+    (os.path.join("ai", "advanced_engine.py"), "AdvancedAIEngine"),
+    (os.path.join("integrations", "terminal_workflows.py"), "workflows"),
+    (os.path.join("core", "agent_manager.py"), "AgentManager"),
+    (os.path.join("core", "metrics"), "metrics"),
+    ("dashboard" + os.sep, "dashboard"),
+)
+
+# Deepest stack kept for a slow-callback record
+MAX_STACK_DEPTH = 40
+
+# Code of the method the event loop calls every callback through
+_HANDLE_RUN_CODE = asyncio.Handle._run.__code__
+
+
+def subsystem_for_file(filename: str) -> Optional[str]:
+    """Return the subsystem owning a source file, if it belongs to one."""
+    for fragment, subsystem in SUBSYSTEMS:
+        if fragment in filename:
+            return subsystem
+    return None
+
+
+def capture_stack(frame: Any, limit: int = MAX_STACK_DEPTH) -> Tuple[List[str], Optional[str]]:
+    """Format a frame chain and find its owning subsystem.
+    
+    Args:
+        frame: Innermost frame
+        limit: Maximum number of frames to keep
+    
+    Returns:
+        Tuple of (frames formatted as "file:line function", outermost first;
+        subsystem of the innermost platform frame)
+    """
+    stack = []
+    subsystem = None
+    while frame is not None and len(stack) < limit:
+        code = frame.f_code
+        if subsystem is None:
+            subsystem = subsystem_for_file(code.co_filename)
+        stack.append(f"{code.co_filename}:{frame.f_lineno} {code.co_name}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack, subsystem
+
+
+def callback_frame(frame: Any) -> Any:
+    """Find the frame of the callback an event loop is running.
+    
+    That is the frame called by ``asyncio.Handle._run``; for a task step it
+    is the task's outermost coroutine frame.
+    
+    Returns:
+        The callback's frame, or None when ``frame`` is not inside a callback
+    """
+    while frame is not None:
+        caller = frame.f_back
+        if caller is None:
+            return None
+        if caller.f_code is _HANDLE_RUN_CODE:
+            return frame
+        frame = caller
+    return None
+
+
+def current_callback(frame: Any) -> Optional[str]:
+    """Name the event-loop callback a thread's stack is running, if any.
+    
+    Lets samplers attribute loop-thread stacks to a task.
+    
+    Args:
+        frame: Innermost frame of the sampled thread
+    """
+    frame = callback_frame(frame)
+    if frame is None:
+        return None
+    return frame.f_code.co_qualname
+
+
+class LoopMonitor:
+    """Continuous event-loop lag and slow-callback monitor.
+    
+    A probe coroutine sleeps for ``interval`` and records how late it wakes
+    up, which is the scheduling lag every other coroutine sees. A probe
+    that wakes at least ``slow_callback_threshold`` late means a callback
+    blocked the loop; a watchdog thread notices the overdue probe and
+    captures the loop thread's stack while it is still blocked, so the
+    stall is recorded with the frame that is actually blocking. Nothing in
+    asyncio is patched, so other loops in the process are unaffected.
+    Lag samples and slow-callback records are kept in fixed-size buffers.
+    """
+    
+    def __init__(self, interval: float = 0.05, slow_callback_threshold: float = 0.1,
+                 lag_samples: int = 1200, max_slow_callbacks: int = 100):
+        """Initialize loop monitor.
+        
+        Args:
+            interval: Seconds between lag probes
+            slow_callback_threshold: Stalls delaying the probe by at least
+                this many seconds are recorded as slow callbacks
+            lag_samples: Number of recent lag samples kept for percentiles
+            max_slow_callbacks: Number of recent slow-callback records kept
+        """
+        self.logger = setup_logger(__name__)
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        
+        self._lags = np.zeros(lag_samples, dtype=np.float64)
+        self._lag_count = 0
+        self._max_lag = 0.0
+        
+        self._slow_callbacks: deque = deque(maxlen=max_slow_callbacks)
+        self._slow_totals: Dict[str, List[float]] = {}
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+        
+        # Written by the loop thread, read by the watchdog
+        self._last_tick = 0.0
+        # (tick the stall followed, callback name, stack, subsystem)
+        self._captured: Optional[Tuple[float, Optional[str], List[str], Optional[str]]] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is attached to a loop."""
+        return self._probe_task is not None and not self._probe_task.done()
+    
+    def start(self):
+        """Start monitoring the running event loop.
+        
+        Must be called from a coroutine or callback on the loop to monitor.
+        """
+        if self.running:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._captured = None
+        
+        self._probe_task = self._loop.create_task(self._probe_loop())
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watchdog_loop, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        
+        self.logger.info(
+            f"Event loop monitor started (probe: {self.interval}s, "
+            f"slow callback threshold: {self.slow_callback_threshold}s)"
+        )
+    
+    def stop(self):
+        """Stop the probe and the watchdog."""
+        if self._probe_task:
+            self._probe_task.cancel()
+            self._probe_task = None
+        
+        if self._watchdog:
+            self._watchdog_stop.set()
+            self._watchdog.join(1.0)
+            self._watchdog = None
+        
+        self.logger.info("Event loop monitor stopped")
+    
+    async def _probe_loop(self):
+        """Measure how late the loop wakes a sleeping coroutine."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            tick = self._last_tick
+            self._last_tick = time.perf_counter()
+            self._record_lag(lag)
+            if lag >= self.slow_callback_threshold:
+                self._record_slow_callback(tick, lag)
+    
+    def _record_lag(self, lag: float):
+        """Store a lag sample in the ring buffer."""
+        self._lags[self._lag_count % len(self._lags)] = lag
+        self._lag_count += 1
+        if lag > self._max_lag:
+            self._max_lag = lag
+    
+    def _watchdog_loop(self):
+        """Capture the loop thread's stack while the probe is overdue."""
+        poll = max(self.slow_callback_threshold / 2, 0.005)
+        overdue = self.interval + self.slow_callback_threshold
+        while not self._watchdog_stop.wait(poll):
+            tick = self._last_tick
+            if time.perf_counter() - tick < overdue:
+                continue
+            captured = self._captured
+            if captured is not None and captured[0] == tick:
+                continue
+            
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            name = current_callback(frame)
+            stack, subsystem = capture_stack(frame)
+            # Only keep it if the loop is still stalled
+            if self._last_tick == tick:
+                self._captured = (tick, name, stack, subsystem)
+    
+    def _record_slow_callback(self, tick: float, duration: float):
+        """Record a stall of the loop. Runs on the loop thread.
+        
+        Args:
+            tick: Probe time the stall followed
+            duration: How late the probe woke, in seconds
+        """
+        name, stack, subsystem = None, [], None
+        captured = self._captured
+        if captured is not None and captured[0] == tick:
+            _, name, stack, subsystem = captured
+            self._captured = None
+        
+        subsystem = subsystem or "other"
+        self._slow_callbacks.append({
+            "timestamp": time.time(),
+            "duration": duration,
+            "callback": name or "unknown",
+            "subsystem": subsystem,
+            "stack": stack
+        })
+        
+        totals = self._slow_totals.setdefault(subsystem, [0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+    
+    def get_lag_stats(self) -> Dict[str, Any]:
+        """Summarize recent event-loop lag.
+        
+        Returns:
+            Lag percentiles and maximum in seconds over the retained samples
+        """
+        count = min(self._lag_count, len(self._lags))
+        if count == 0:
+            return {"samples": 0, "p50": None, "p90": None, "p99": None, "max": None, "max_ever": None}
+        
+        p50, p90, p99 = np.percentile(self._lags[:count], [50, 90, 99])
+        return {
+            "samples": count,
+            "p50": float(p50),
+            "p90": float(p90),
+            "p99": float(p99),
+            "max": float(self._lags[:count].max()),
+            "max_ever": self._max_lag
+        }
+    
+    def recent_max_lag(self, seconds: float) -> Optional[float]:
+        """Largest lag among the samples probed in the last ``seconds``.
+        
+        Returns:
+            Lag in seconds, or None when no sample covers the period
+        """
+        count = min(self._lag_count, len(self._lags), int(seconds / self.interval) + 1)
+        if count == 0:
+            return None
+        end = self._lag_count % len(self._lags)
+        if count <= end:
+            return float(self._lags[end - count:end].max())
+        return float(max(self._lags[:end].max(initial=0.0), self._lags[end - count:].max()))
+    
+    def get_slow_callbacks(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recent slow-callback records, newest first.
+        
+        Args:
+            limit: Maximum number of records to return
+        """
+        records = list(reversed(self._slow_callbacks))
+        return records[:limit] if limit else records
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag statistics and slow-callback totals per subsystem."""
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "slow_callback_threshold": self.slow_callback_threshold,
+            "lag": self.get_lag_stats(),
+            "slow_callbacks": {
+                subsystem: {"count": count, "total_duration": total}
+                # Copied first; scrapes may read this from another thread
+                for subsystem, (count, total) in list(self._slow_totals.items())
+            }
+        }
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Memory Tracker
+tracemalloc snapshots, top allocation sites and growth diffs grouped by module.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.loop_monitor import subsystem_for_file
+from utils.logger import setup_logger
+
+
+GROUP_BY = ("module", "subsystem", "lineno")
+
+# Allocations made by the tracing machinery itself
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracker:
+    """Live leak diagnosis with tracemalloc.
+    
+    Tracing is off until ``start`` is called, because it slows every
+    allocation. Snapshots are kept by name, the oldest dropped beyond
+    ``max_snapshots``. Statistics can be grouped by the module or subsystem
+    owning the allocation, or by source line.
+    """
+    
+    def __init__(self, max_snapshots: int = 8):
+        """Initialize memory tracker.
+        
+        Args:
+            max_snapshots: Maximum number of named snapshots retained
+        """
+        self.logger = setup_logger(__name__)
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._modules: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def tracing(self) -> bool:
+        """Whether tracemalloc is tracing allocations."""
+        return tracemalloc.is_tracing()
+    
+    def start(self, frames: int = 25):
+        """Start tracing allocations.
+        
+        Args:
+            frames: Traceback depth recorded per allocation; deeper is more
+                precise for subsystem attribution but costs more memory
+        
+        Raises:
+            RuntimeError: If tracing was already started with a different depth
+        """
+        if tracemalloc.is_tracing():
+            if tracemalloc.get_traceback_limit() != frames:
+                raise RuntimeError(
+                    f"tracemalloc is already tracing with {tracemalloc.get_traceback_limit()} frames"
+                )
+            return
+        tracemalloc.start(frames)
+        self.logger.info(f"Memory tracing started ({frames} frames)")
+    
+    def stop(self):
+        """Stop tracing and drop all snapshots."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self.logger.info("Memory tracing stopped")
+        with self._lock:
+            self._snapshots.clear()
+    
+    def take_snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Take and store a named snapshot.
+        
+        Args:
+            name: Snapshot name, defaults to a timestamp
+        
+        Returns:
+            Snapshot description
+        
+        Raises:
+            RuntimeError: If tracing is not started
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is not started")
+        
+        name = name or time.strftime("%Y%m%d-%H%M%S")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        taken_at = time.time()
+        
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = (taken_at, snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        
+        return self._describe(name, taken_at, snapshot)
+    
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Describe stored snapshots, oldest first."""
+        with self._lock:
+            items = list(self._snapshots.items())
+        return [self._describe(name, taken_at, snapshot) for name, (taken_at, snapshot) in items]
+    
+    def _describe(self, name: str, taken_at: float, snapshot: tracemalloc.Snapshot) -> Dict[str, Any]:
+        """Summarize a snapshot."""
+        return {
+            "name": name,
+            "taken_at": taken_at,
+            "traceback_limit": snapshot.traceback_limit,
+            "traced_blocks": len(snapshot.traces),
+            "traced_bytes": sum(trace.size for trace in snapshot.traces)
+        }
+    
+    def _get(self, name: str) -> tracemalloc.Snapshot:
+        """Look up a stored snapshot."""
+        with self._lock:
+            entry = self._snapshots.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown memory snapshot: {name}")
+        return entry[1]
+    
+    def top(self, name: Optional[str] = None, limit: int = 20, group_by: str = "module") -> Dict[str, Any]:
+        """Largest allocation groups in a snapshot.
+        
+        Args:
+            name: Stored snapshot name; a fresh, unstored snapshot if omitted
+            limit: Number of groups to return
+            group_by: "module", "subsystem" or "lineno"
+        
+        Returns:
+            Dictionary with total traced bytes and the top groups
+        """
+        snapshot = self._get(name) if name else self._fresh_snapshot()
+        groups = self._group(snapshot, group_by)
+        ranked = sorted(groups.items(), key=lambda item: item[1][0], reverse=True)
+        
+        return {
+            "snapshot": name,
+            "group_by": group_by,
+            "total_bytes": sum(size for size, _ in groups.values()),
+            "top": [
+                {"group": group, "size": size, "count": count}
+                for group, (size, count) in ranked[:limit]
+            ]
+        }
+    
+    def diff(self, base: str, target: Optional[str] = None, limit: int = 20,
+             group_by: str = "module") -> Dict[str, Any]:
+        """Growth between two snapshots.
+        
+        Args:
+            base: Name of the earlier snapshot
+            target: Name of the later snapshot; a fresh snapshot if omitted
+            limit: Number of groups to return
+            group_by: "module", "subsystem" or "lineno"
+        
+        Returns:
+            Dictionary with total growth and the groups that grew the most
+        """
+        before = self._group(self._get(base), group_by)
+        after = self._group(self._get(target) if target else self._fresh_snapshot(), group_by)
+        
+        changes = []
+        for group in before.keys() | after.keys():
+            size_before, count_before = before.get(group, (0, 0))
+            size_after, count_after = after.get(group, (0, 0))
+            if size_after != size_before or count_after != count_before:
+                changes.append({
+                    "group": group,
+                    "size": size_after,
+                    "size_diff": size_after - size_before,
+                    "count": count_after,
+                    "count_diff": count_after - count_before
+                })
+        changes.sort(key=lambda change: change["size_diff"], reverse=True)
+        
+        return {
+            "base": base,
+            "target": target,
+            "group_by": group_by,
+            "total_diff": sum(change["size_diff"] for change in changes),
+            "changes": changes[:limit]
+        }
+    
+    def _fresh_snapshot(self) -> tracemalloc.Snapshot:
+        """Take an unstored snapshot."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is not started")
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    
+    def _group(self, snapshot: tracemalloc.Snapshot, group_by: str) -> Dict[str, Tuple[int, int]]:
+        """Sum sizes and block counts per group."""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        
+        groups: Dict[str, List[int]] = {}
+        if group_by == "subsystem":
+            # Attribute each allocation to the innermost platform frame that led to it
+            for statistic in snapshot.statistics("traceback"):
+                group = "other"
+                for frame in reversed(statistic.traceback):
+                    subsystem = subsystem_for_file(frame.filename)
+                    if subsystem:
+                        group = subsystem
+                        break
+                totals = groups.setdefault(group, [0, 0])
+                totals[0] += statistic.size
+                totals[1] += statistic.count
+        else:
+            key_type = "filename" if group_by == "module" else "lineno"
+            for statistic in snapshot.statistics(key_type):
+                frame = statistic.traceback[-1]
+                if group_by == "module":
+                    group = self._module_for_file(frame.filename)
+                else:
+                    group = f"{self._module_for_file(frame.filename)}:{frame.lineno}"
+                totals = groups.setdefault(group, [0, 0])
+                totals[0] += statistic.size
+                totals[1] += statistic.count
+        
+        return {group: (size, count) for group, (size, count) in groups.items()}
+    
+    def _module_for_file(self, filename: str) -> str:
+        """Map a source path to a dotted module name via the longest sys.path prefix."""
+        module = self._modules.get(filename)
+        if module is not None:
+            return module
+        
+        module = filename
+        best = ""
+        for entry in sys.path:
+            entry = os.path.abspath(entry or ".") + os.sep
+            if filename.startswith(entry) and len(entry) > len(best):
+                best = entry
+        if best:
+            relative = os.path.splitext(filename[len(best):])[0]
+            module = relative.replace(os.sep, ".")
+            if module.endswith(".__init__"):
+                module = module[:-len(".__init__")]
+        
+        self._modules[filename] = module
+        return module
@@ -4,31 +4,160 @@ Tiation AI Agents - Metrics Collector
 System and agent metrics collection and monitoring.
 """
 
+import asyncio
 import psutil
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime
 
+import numpy as np
+
 from utils.logger import setup_logger
+from core.metrics_exporter import platform_collector
+from core.timeseries import TimeSeriesStore
+from core.loop_monitor import LoopMonitor
+from core.request_metrics import RequestMetrics
+from core.profiler import SamplingProfiler
+from core.anomaly import StreamingAnomalyDetector
+from core.cgroup import CgroupResources, suggested_concurrency
+from core.memory_tracker import MemoryTracker
+
+
+# Series that only ever grow; the anomaly detector judges their rate instead
+CUMULATIVE_SERIES = frozenset(("network_sent", "network_recv", "completed_tasks", "failed_tasks"))
 
 
 class MetricsCollector:
-    """Collects system and agent metrics."""
+    """Collects system and agent metrics.
     
-    def __init__(self):
-        """Initialize metrics collector."""
+    System and process metrics are sampled by a background thread into
+    immutable snapshot dicts. The thread swaps in a new dict on each refresh,
+    so readers never take a lock and never block the event loop on psutil.
+    """
+    
+    def __init__(self, sample_interval: float = 2.0):
+        """Initialize metrics collector.
+        
+        Args:
+            sample_interval: Seconds between background samples
+        """
         self.logger = setup_logger(__name__)
         self.start_time = time.time()
+        self.sample_interval = sample_interval
+        
+        # Latest samples, replaced wholesale by the sampler thread
+        self._system_snapshot: Dict[str, Any] = {}
+        self._performance_snapshot: Dict[str, Any] = {}
+        self._resource_snapshot: Dict[str, Any] = {}
+        
+        # Container limits; host-wide psutil figures overstate capacity in a cgroup
+        self.resources = CgroupResources()
+        
+        # Downsampled history of every numeric sample
+        self.history = TimeSeriesStore()
+        
+        # Event-loop lag and slow-callback tracking, started on the loop
+        self.loop_monitor = LoopMonitor()
+        
+        # Per-route HTTP latency, fed by the dashboard's request middleware
+        self.requests = RequestMetrics(loop_monitor=self.loop_monitor)
+        
+        # Streaming anomaly detection over every recorded series
+        self.anomaly_detector = StreamingAnomalyDetector()
+        # Last value and time of each cumulative series, to turn it into a rate
+        self._counter_last: Dict[str, Tuple[float, float]] = {}
+        
+        # On-demand CPU profiler and allocation tracker
+        self.profiler = SamplingProfiler()
+        self.memory_tracker = MemoryTracker()
+        
+        self._process = psutil.Process()
+        self._sampler_thread: Optional[threading.Thread] = None
+        self._sampler_started = False
+        self._sampler_stop = threading.Event()
+        self._sampler_lock = threading.Lock()
+        
+        platform_collector.attach_metrics_collector(self)
     
-    async def get_system_metrics(self) -> Dict[str, Any]:
-        """Get system-wide metrics.
+    def start_sampler(self):
+        """Start the background sampler thread if it is not running."""
+        with self._sampler_lock:
+            if self._sampler_thread and self._sampler_thread.is_alive():
+                return
+            
+            # Prime the CPU counters; the first sample is taken one interval
+            # later, so it reports usage over a whole interval. Until then the
+            # snapshots are empty.
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent(interval=None)
+            
+            self._sampler_started = True
+            self._sampler_stop.clear()
+            self._sampler_thread = threading.Thread(
+                target=self._sampler_loop,
+                name="metrics-sampler",
+                daemon=True
+            )
+            self._sampler_thread.start()
+            self.logger.info(f"Metrics sampler started (interval: {self.sample_interval}s)")
+    
+    def stop_sampler(self, timeout: Optional[float] = None):
+        """Stop the background sampler thread.
         
-        Returns:
-            Dictionary of system metrics
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
         """
+        with self._sampler_lock:
+            thread = self._sampler_thread
+            if not thread:
+                return
+            
+            self._sampler_stop.set()
+            thread.join(timeout)
+            self._sampler_thread = None
+            self.logger.info("Metrics sampler stopped")
+    
+    def sample_now(self):
+        """Refresh the system and performance snapshots immediately."""
+        system = self._sample_system()
+        performance = self._sample_performance()
+        resources = self._sample_resources()
+        self._system_snapshot = system
+        self._performance_snapshot = performance
+        self._resource_snapshot = resources
+        
+        values = {**system, **performance}
+        for key in ("effective_cores", "cpu_throttle_ratio", "memory_headroom", "effective_memory_percent"):
+            values[key] = resources.get(key)
+        for resource, pressure in resources.get("pressure", {}).items():
+            values[f"{resource}_pressure_avg10"] = pressure.get("some_avg10")
+        if self.loop_monitor.running:
+            lag = self.loop_monitor.get_lag_stats()
+            values["loop_lag_p50"] = lag["p50"]
+            values["loop_lag_p99"] = lag["p99"]
+        values.update(platform_collector.get_task_queue_depths())
+        timestamp = values.pop("sampled_at", None)
+        self.record_history(values, timestamp)
+    
+    def _sampler_loop(self):
+        """Sampler thread body."""
+        while not self._sampler_stop.wait(self.sample_interval):
+            try:
+                self.sample_now()
+            except Exception as e:
+                self.logger.error(f"Metrics sampler error: {e}")
+    
+    def _ensure_sampler(self):
+        """Start the sampler on first use, unless it was stopped explicitly."""
+        if not self._sampler_started:
+            self.start_sampler()
+    
+    def _sample_system(self) -> Dict[str, Any]:
+        """Take a system-wide sample. Runs on the sampler thread."""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU metrics (non-blocking: usage since the previous sample)
+            cpu_percent = psutil.cpu_percent(interval=None)
             cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
@@ -49,9 +178,6 @@ class MetricsCollector:
             network_sent = network.bytes_sent
             network_recv = network.bytes_recv
             
-            # System uptime
-            uptime = time.time() - self.start_time
-            
             return {
                 "cpu_percent": cpu_percent,
                 "cpu_count": cpu_count,
@@ -64,16 +190,309 @@ class MetricsCollector:
                 "disk_total": disk_total,
                 "network_sent": network_sent,
                 "network_recv": network_recv,
-                "uptime": uptime,
-                "timestamp": datetime.now().isoformat()
+                "sampled_at": time.time()
             }
         except Exception as e:
             self.logger.error(f"Error collecting system metrics: {e}")
             return {
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "sampled_at": time.time()
             }
     
+    def _sample_performance(self) -> Dict[str, Any]:
+        """Take a process performance sample. Runs on the sampler thread."""
+        try:
+            # Process metrics
+            process_memory = self._process.memory_info()
+            process_cpu = self._process.cpu_percent(interval=None)
+            
+            # Load average (Unix only)
+            try:
+                load_avg = psutil.getloadavg()
+            except (AttributeError, OSError):
+                load_avg = (0, 0, 0)
+            
+            return {
+                "process_memory_rss": process_memory.rss,
+                "process_memory_vms": process_memory.vms,
+                "process_cpu_percent": process_cpu,
+                "load_avg_1m": load_avg[0],
+                "load_avg_5m": load_avg[1],
+                "load_avg_15m": load_avg[2],
+                "sampled_at": time.time()
+            }
+        except Exception as e:
+            self.logger.error(f"Error collecting performance metrics: {e}")
+            return {
+                "error": str(e),
+                "sampled_at": time.time()
+            }
+    
+    def _sample_resources(self) -> Dict[str, Any]:
+        """Take a container resource sample. Runs on the sampler thread."""
+        try:
+            resources = self.resources.sample()
+            resources["sampled_at"] = time.time()
+            return resources
+        except Exception as e:
+            self.logger.error(f"Error collecting container resource metrics: {e}")
+            return {
+                "error": str(e),
+                "sampled_at": time.time()
+            }
+    
+    def get_latest_system_sample(self) -> Dict[str, Any]:
+        """Get the latest raw system sample without copying or stamping it.
+        
+        Returns:
+            The current system snapshot; treat as read-only
+        """
+        return self._system_snapshot
+    
+    def get_latest_performance_sample(self) -> Dict[str, Any]:
+        """Get the latest raw process sample without copying or stamping it.
+        
+        Returns:
+            The current performance snapshot; treat as read-only
+        """
+        return self._performance_snapshot
+    
+    def get_latest_resource_sample(self) -> Dict[str, Any]:
+        """Get the latest raw container resource sample without copying or stamping it.
+        
+        Returns:
+            The current resource snapshot; treat as read-only
+        """
+        return self._resource_snapshot
+    
+    def get_resource_limits(self) -> Dict[str, Any]:
+        """Get effective CPU and memory limits, throttling and pressure.
+        
+        Returns:
+            Dictionary of container resource metrics from the latest background sample
+        """
+        self._ensure_sampler()
+        return self._read_snapshot(self._resource_snapshot)
+    
+    def suggested_concurrency(self, per_core: float = 4.0, task_memory: Optional[int] = None) -> int:
+        """Suggest a worker count for TaskQueue or the workflow engine.
+        
+        Args:
+            per_core: Concurrent tasks per effective core
+            task_memory: Approximate bytes each task needs
+        
+        Returns:
+            Suggested concurrency from the latest resource sample
+        """
+        self._ensure_sampler()
+        resources = self._resource_snapshot
+        if "effective_cores" not in resources:
+            resources = self.resources.sample()
+        return suggested_concurrency(resources, per_core, task_memory)
+    
+    def record_history(self, values: Dict[str, Any], timestamp: Optional[float] = None):
+        """Record numeric values into the metrics history and anomaly detector.
+        
+        Cumulative series (``CUMULATIVE_SERIES``) are kept as-is in the
+        history, but reach the detector as ``<name>_rate``, their change per
+        second since the previous sample.
+        
+        Args:
+            values: Mapping of series name to value
+            timestamp: Sample time, defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self.history.record_many(values, timestamp)
+        for event in self.anomaly_detector.observe(self._counter_rates(values, timestamp), timestamp):
+            if event["severity"] != "normal":
+                self.logger.warning(
+                    f"Anomaly ({event['severity']}) in {event['series']}: {event['value']:.4g} "
+                    f"(expected {event['expected']:.4g}, z={event['zscore']:.1f})"
+                )
+    
+    def _counter_rates(self, values: Dict[str, Any], timestamp: float) -> Dict[str, Any]:
+        """Replace cumulative series with their rate since the previous sample.
+        
+        A counter's first sample, and one that went backwards after a reset,
+        yield no rate.
+        """
+        if CUMULATIVE_SERIES.isdisjoint(values):
+            return values
+        
+        observed = {}
+        for name, value in values.items():
+            if name not in CUMULATIVE_SERIES:
+                observed[name] = value
+                continue
+            if not isinstance(value, (int, float)):
+                continue
+            last = self._counter_last.get(name)
+            self._counter_last[name] = (value, timestamp)
+            if last is not None and value >= last[0] and timestamp > last[1]:
+                observed[f"{name}_rate"] = (value - last[0]) / (timestamp - last[1])
+        return observed
+    
+    def get_metrics_history(self, series: str, start: float, end: Optional[float] = None,
+                            resolution: Optional[int] = None,
+                            max_points: Optional[int] = None) -> Dict[str, Any]:
+        """Get downsampled history for a metric series.
+        
+        Args:
+            series: Series name, e.g. "cpu_percent"
+            start: Window start in seconds since the epoch
+            end: Window end, defaults to now
+            resolution: Bucket width in seconds (1, 60 or 3600); chosen from
+                the window length if omitted
+            max_points: Maximum number of points to return
+        
+        Returns:
+            Dictionary with the resolution used and min/max/mean/last per point
+        """
+        return self.history.query(series, start, end, resolution, max_points)
+    
+    def start_loop_monitor(self):
+        """Start the event-loop monitor on the running loop."""
+        self.loop_monitor.start()
+    
+    def stop_loop_monitor(self):
+        """Stop the event-loop monitor."""
+        self.loop_monitor.stop()
+    
+    def get_loop_metrics(self, slow_callback_limit: int = 20) -> Dict[str, Any]:
+        """Get event-loop lag percentiles and recent slow callbacks.
+        
+        Args:
+            slow_callback_limit: Maximum number of slow-callback records
+        
+        Returns:
+            Dictionary of loop statistics
+        """
+        metrics = self.loop_monitor.get_stats()
+        metrics["recent_slow_callbacks"] = self.loop_monitor.get_slow_callbacks(slow_callback_limit)
+        metrics["timestamp"] = datetime.now().isoformat()
+        return metrics
+    
+    def get_request_metrics(self) -> Dict[str, Any]:
+        """Get per-route HTTP request counts, latency percentiles, sizes and errors.
+        
+        Returns:
+            Dictionary of request statistics
+        """
+        metrics = self.requests.get_stats()
+        metrics["timestamp"] = datetime.now().isoformat()
+        return metrics
+    
+    def get_slow_requests(self, limit: int = 20, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get recent slow HTTP requests with their timing breakdown.
+        
+        Args:
+            limit: Maximum number of samples
+            route: Only samples of this route template
+        
+        Returns:
+            Slow-request samples, newest first
+        """
+        return self.requests.get_slow_requests(limit, route)
+    
+    async def profile_cpu(self, duration: float, interval: Optional[float] = None) -> Dict[str, Any]:
+        """Sample every thread's stack for a while.
+        
+        Args:
+            duration: Seconds to profile for
+            interval: Seconds between samples
+        
+        Returns:
+            Dictionary with collapsed stack counts and per-subsystem totals
+        """
+        return await self.profiler.profile(duration, interval)
+    
+    def get_anomalies(self, limit: int = 50) -> Dict[str, Any]:
+        """Get active anomalies and recent anomaly events.
+        
+        Args:
+            limit: Maximum number of events
+        
+        Returns:
+            Dictionary of active anomalies and events, newest first
+        """
+        return {
+            "active": self.anomaly_detector.get_active_anomalies(),
+            "events": self.anomaly_detector.get_events(limit),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def start_memory_tracing(self, frames: int = 25):
+        """Start tracemalloc allocation tracing.
+        
+        Args:
+            frames: Traceback depth recorded per allocation
+        """
+        self.memory_tracker.start(frames)
+    
+    def stop_memory_tracing(self):
+        """Stop allocation tracing and drop stored memory snapshots."""
+        self.memory_tracker.stop()
+    
+    async def take_memory_snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Take and store a named allocation snapshot.
+        
+        Args:
+            name: Snapshot name, defaults to a timestamp
+        
+        Returns:
+            Snapshot description
+        """
+        return await asyncio.to_thread(self.memory_tracker.take_snapshot, name)
+    
+    async def get_memory_top(self, name: Optional[str] = None, limit: int = 20,
+                             group_by: str = "module") -> Dict[str, Any]:
+        """Get the largest allocation groups in a snapshot.
+        
+        Args:
+            name: Stored snapshot name; current allocations if omitted
+            limit: Number of groups to return
+            group_by: "module", "subsystem" or "lineno"
+        
+        Returns:
+            Dictionary of top allocation groups
+        """
+        return await asyncio.to_thread(self.memory_tracker.top, name, limit, group_by)
+    
+    async def diff_memory_snapshots(self, base: str, target: Optional[str] = None, limit: int = 20,
+                                    group_by: str = "module") -> Dict[str, Any]:
+        """Get allocation growth between two snapshots.
+        
+        Args:
+            base: Earlier snapshot name
+            target: Later snapshot name; current allocations if omitted
+            limit: Number of groups to return
+            group_by: "module", "subsystem" or "lineno"
+        
+        Returns:
+            Dictionary of the groups that grew the most
+        """
+        return await asyncio.to_thread(self.memory_tracker.diff, base, target, limit, group_by)
+    
+    def _read_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a snapshot and stamp it with its age and the read time."""
+        metrics = dict(snapshot)
+        metrics["sample_age"] = time.time() - metrics.pop("sampled_at", time.time())
+        metrics["timestamp"] = datetime.now().isoformat()
+        return metrics
+    
+    async def get_system_metrics(self) -> Dict[str, Any]:
+        """Get system-wide metrics.
+        
+        Returns:
+            Dictionary of system metrics from the latest background sample
+        """
+        self._ensure_sampler()
+        metrics = self._read_snapshot(self._system_snapshot)
+        if "error" not in metrics:
+            metrics["uptime"] = time.time() - self.start_time
+        return metrics
+    
     async def get_agent_metrics(self, agent_id: str) -> Dict[str, Any]:
         """Get metrics for a specific agent.
         
@@ -107,39 +526,40 @@ class MetricsCollector:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def get_agents_metrics(self, agent_ids: Sequence[str]) -> Dict[str, Any]:
+        """Get metrics for many agents in one call, as columns.
+        
+        Args:
+            agent_ids: Agent IDs
+            
+        Returns:
+            "agent_id" list and numpy arrays aligned with it of the resource
+            metrics of ``get_agent_metrics``, "cpu_usage" and "memory_usage";
+            task counts and scores come from the AgentManager
+        """
+        # Mock agent-specific metrics, as in get_agent_metrics
+        count = len(agent_ids)
+        rng = np.random.default_rng()
+        return {
+            "agent_id": list(agent_ids),
+            "cpu_usage": rng.uniform(20, 80, count),
+            "memory_usage": rng.uniform(30, 90, count)
+        }
+    
     async def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics.
         
         Returns:
-            Dictionary of performance metrics
+            Dictionary of performance metrics from the latest background sample
         """
-        try:
-            # Process metrics
-            process = psutil.Process()
-            process_memory = process.memory_info()
-            process_cpu = process.cpu_percent()
-            
-            # Load average (Unix only)
-            try:
-                load_avg = psutil.getloadavg()
-            except (AttributeError, OSError):
-                load_avg = (0, 0, 0)
-            
-            return {
-                "process_memory_rss": process_memory.rss,
-                "process_memory_vms": process_memory.vms,
-                "process_cpu_percent": process_cpu,
-                "load_avg_1m": load_avg[0],
-                "load_avg_5m": load_avg[1],
-                "load_avg_15m": load_avg[2],
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            self.logger.error(f"Error collecting performance metrics: {e}")
-            return {
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+        self._ensure_sampler()
+        metrics = self._read_snapshot(self._performance_snapshot)
+        if self.loop_monitor.running:
+            lag = self.loop_monitor.get_lag_stats()
+            metrics["loop_lag_p50"] = lag["p50"]
+            metrics["loop_lag_p99"] = lag["p99"]
+            metrics["loop_lag_max"] = lag["max"]
+        return metrics
     
     async def get_health_status(self) -> Dict[str, Any]:
         """Get system health status.
@@ -154,13 +574,14 @@ class MetricsCollector:
             health_score = 100
             issues = []
             
-            # Check CPU usage
-            if system_metrics.get("cpu_percent", 0) > 80:
-                health_score -= 20
-                issues.append("High CPU usage")
+            # CPU is judged by the anomaly detector below rather than a fixed
+            # threshold; a busy node at steady high CPU is not unhealthy
             
-            # Check memory usage
-            if system_metrics.get("memory_percent", 0) > 85:
+            # Check memory usage against the container limit when there is one
+            memory_percent = self._resource_snapshot.get("effective_memory_percent")
+            if memory_percent is None:
+                memory_percent = system_metrics.get("memory_percent", 0)
+            if memory_percent > 85:
                 health_score -= 25
                 issues.append("High memory usage")
             
@@ -169,6 +590,14 @@ class MetricsCollector:
                 health_score -= 30
                 issues.append("High disk usage")
             
+            # Check for anomalous metrics
+            anomalies = self.anomaly_detector.get_active_anomalies()
+            for anomaly in anomalies:
+                health_score -= 20 if anomaly["severity"] == "critical" else 10
+                issues.append(
+                    f"Anomalous {anomaly['series']} ({anomaly['severity']}, z={anomaly['zscore']:.1f})"
+                )
+            
             # Determine overall status
             if health_score >= 80:
                 status = "healthy"
@@ -181,6 +610,7 @@ class MetricsCollector:
                 "status": status,
                 "health_score": max(health_score, 0),
                 "issues": issues,
+                "anomalies": anomalies,
                 "metrics": system_metrics,
                 "timestamp": datetime.now().isoformat()
             }
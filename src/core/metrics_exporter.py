@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Metrics Exporter
+Prometheus/OpenMetrics exposition of platform metrics.
+"""
+
+import weakref
+from typing import Dict, Any, List, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, disable_created_metrics
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.openmetrics import exposition as openmetrics
+
+
+# The *_created series double the exposition size and nothing reads them.
+# prometheus_client only offers this process-wide, so it also applies to
+# any other registry in the process, including the default one.
+disable_created_metrics()
+
+# Platform registry; kept separate from the prometheus_client default so only
+# our series are exported.
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Hot-path instruments. Callers update these directly; scrape-time state
+# (queue depth, agent status, system gauges) is read by PlatformCollector.
+TASKS_SUBMITTED = Counter(
+    "tiation_tasks_submitted",
+    "Tasks submitted to the task queue",
+    ["type"],
+    registry=REGISTRY
+)
+TASKS_FINISHED = Counter(
+    "tiation_tasks_finished",
+    "Tasks that left the task queue, by final status",
+    ["type", "status"],
+    registry=REGISTRY
+)
+TASK_RETRIES = Counter(
+    "tiation_task_retries",
+    "Task attempts that failed and were re-queued",
+    ["type"],
+    registry=REGISTRY
+)
+TASK_DURATION = Histogram(
+    "tiation_task_duration_seconds",
+    "Task handler execution time",
+    ["type"],
+    buckets=DURATION_BUCKETS,
+    registry=REGISTRY
+)
+TASK_QUEUE_WAIT = Histogram(
+    "tiation_task_queue_wait_seconds",
+    "Time from task submission to first processing",
+    ["type"],
+    buckets=DURATION_BUCKETS,
+    registry=REGISTRY
+)
+WORKFLOW_STEP_DURATION = Histogram(
+    "tiation_workflow_step_duration_seconds",
+    "Terminal workflow step execution time, by the program the step runs",
+    ["action", "result"],
+    buckets=DURATION_BUCKETS,
+    registry=REGISTRY
+)
+AI_TOKENS = Counter(
+    "tiation_ai_tokens",
+    "Tokens used by AI engine tasks",
+    ["model", "task_type"],
+    registry=REGISTRY
+)
+AI_TASK_DURATION = Histogram(
+    "tiation_ai_task_duration_seconds",
+    "AI engine task processing time",
+    ["model", "task_type", "status"],
+    buckets=DURATION_BUCKETS,
+    registry=REGISTRY
+)
+AI_CACHE_LOOKUPS = Counter(
+    "tiation_ai_cache_lookups",
+    "AI engine LLM response cache lookups by result (memory, disk, shared, miss, bypass)",
+    ["model", "result"],
+    registry=REGISTRY
+)
+AI_TOKENS_SAVED = Counter(
+    "tiation_ai_tokens_saved",
+    "Tokens not spent because an LLM response came from the cache",
+    ["model"],
+    registry=REGISTRY
+)
+
+ANOMALY_EVENTS = Counter(
+    "tiation_anomaly_events",
+    "Metric series entering an anomalous state, by severity",
+    ["series", "severity"],
+    registry=REGISTRY
+)
+
+WEBSOCKET_CLIENTS = Gauge(
+    "tiation_dashboard_websocket_clients",
+    "Connected dashboard websocket clients",
+    registry=REGISTRY
+)
+WEBSOCKET_MESSAGES_DROPPED = Counter(
+    "tiation_dashboard_websocket_messages_dropped",
+    "Queued dashboard updates discarded for slow clients",
+    registry=REGISTRY
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "tiation_http_request_duration_seconds",
+    "Dashboard HTTP request time from arrival to the last byte sent, by route template",
+    ["method", "route", "status"],
+    buckets=DURATION_BUCKETS,
+    registry=REGISTRY
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "tiation_http_requests_in_flight",
+    "Dashboard HTTP requests being processed",
+    registry=REGISTRY
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "tiation_http_response_size_bytes",
+    "Dashboard HTTP response body size, by route template",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+    registry=REGISTRY
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "tiation_http_request_errors",
+    "Dashboard HTTP requests that raised or returned a 5xx status",
+    ["method", "route", "kind"],
+    registry=REGISTRY
+)
+
+DASHBOARD_BROADCAST_INTERVAL = Gauge(
+    "tiation_dashboard_broadcast_interval_seconds",
+    "Time between the last two dashboard pushes",
+    registry=REGISTRY
+)
+DASHBOARD_BROADCASTS = Counter(
+    "tiation_dashboard_broadcasts",
+    "Dashboard metrics loop wake-ups, by what woke it and whether it pushed",
+    ["trigger", "outcome"],
+    registry=REGISTRY
+)
+WEBSOCKET_DISCONNECTS = Counter(
+    "tiation_dashboard_websocket_disconnects",
+    "Dashboard websocket disconnects, by reason",
+    ["reason"],
+    registry=REGISTRY
+)
+
+
+class PlatformCollector:
+    """Scrape-time collector for AgentManager, TaskQueue and MetricsCollector state.
+    
+    Components are held by weak reference so attaching them for export does
+    not keep them alive. Nothing here runs on the hot path; all values are
+    read when Prometheus scrapes.
+    """
+    
+    def __init__(self, max_agent_series: int = 10000):
+        """Initialize platform collector.
+        
+        Args:
+            max_agent_series: Export per-agent series only while the registry
+                holds at most this many agents; above it only per-type
+                aggregates are exported to bound series cardinality
+        """
+        self.max_agent_series = max_agent_series
+        self._agent_managers: List[weakref.ref] = []
+        self._task_queues: List[weakref.ref] = []
+        self._metrics_collectors: List[weakref.ref] = []
+    
+    def attach_agent_manager(self, agent_manager: Any):
+        """Export status gauges and task counters for an AgentManager."""
+        self._attach(self._agent_managers, agent_manager)
+    
+    def attach_task_queue(self, task_queue: Any):
+        """Export queue depth gauges for a TaskQueue."""
+        self._attach(self._task_queues, task_queue)
+    
+    def attach_metrics_collector(self, metrics_collector: Any):
+        """Export system and process gauges from a MetricsCollector."""
+        self._attach(self._metrics_collectors, metrics_collector)
+    
+    def _attach(self, refs: List[weakref.ref], component: Any):
+        """Add a weak reference, skipping duplicates and dead references."""
+        refs[:] = [ref for ref in refs if ref() is not None and ref() is not component]
+        refs.append(weakref.ref(component))
+    
+    def _live(self, refs: List[weakref.ref]) -> List[Any]:
+        """Resolve weak references that are still alive."""
+        return [component for component in (ref() for ref in refs) if component is not None]
+    
+    def describe(self):
+        """No static description; series depend on attached components."""
+        return []
+    
+    def collect(self):
+        """Yield metric families for all attached components."""
+        yield from self._collect_agents()
+        yield from self._collect_task_queues()
+        yield from self._collect_system()
+    
+    def _collect_agents(self):
+        """Agent status gauges and per-type task counters."""
+        status_gauge = GaugeMetricFamily(
+            "tiation_agents", "Agents by type and status", labels=["type", "status"]
+        )
+        in_flight = GaugeMetricFamily(
+            "tiation_agent_in_flight_tasks", "Tasks currently being processed per agent type",
+            labels=["type"]
+        )
+        type_tasks = CounterMetricFamily(
+            "tiation_agent_type_tasks", "Tasks recorded by agents, by agent type and result",
+            labels=["type", "result"]
+        )
+        
+        status_counts: Dict[Tuple[str, str], int] = {}
+        in_flight_counts: Dict[str, int] = {}
+        type_totals: Dict[str, List[int]] = {}
+        
+        for agent_manager in self._live(self._agent_managers):
+            for agent in list(agent_manager.agents.values()):
+                key = (agent.type, agent.status.value)
+                status_counts[key] = status_counts.get(key, 0) + 1
+                in_flight_counts[agent.type] = in_flight_counts.get(agent.type, 0) + agent.in_flight_tasks
+                totals = type_totals.setdefault(agent.type, [0, 0])
+                totals[0] += agent.tasks_completed
+                totals[1] += agent.tasks_failed
+        
+        for (agent_type, status), count in status_counts.items():
+            status_gauge.add_metric([agent_type, status], count)
+        for agent_type, count in in_flight_counts.items():
+            in_flight.add_metric([agent_type], count)
+        for agent_type, (completed, failed) in type_totals.items():
+            type_tasks.add_metric([agent_type, "completed"], completed)
+            type_tasks.add_metric([agent_type, "failed"], failed)
+        
+        yield status_gauge
+        yield in_flight
+        yield type_tasks
+    
+    def render_agent_series(self, openmetrics_format: bool = False) -> str:
+        """Render per-agent task counters as exposition text.
+        
+        Per-agent series are the bulk of a scrape, so they bypass
+        prometheus_client's generic per-sample formatting and are written
+        directly with one f-string per sample. Skipped entirely when the
+        registry holds more than ``max_agent_series`` agents.
+        
+        Args:
+            openmetrics_format: Emit OpenMetrics rather than Prometheus text
+        
+        Returns:
+            Exposition text, empty if there is nothing to export
+        """
+        agents = []
+        for agent_manager in self._live(self._agent_managers):
+            agents.extend(agent_manager.agents.values())
+        if not agents or len(agents) > self.max_agent_series:
+            return ""
+        
+        family = "tiation_agent_tasks"
+        lines = [
+            f"# HELP {family}{'' if openmetrics_format else '_total'} Tasks recorded per agent, by result",
+            f"# TYPE {family}{'' if openmetrics_format else '_total'} counter"
+        ]
+        escaped: Dict[str, str] = {}
+        for agent in agents:
+            agent_type = escaped.get(agent.type)
+            if agent_type is None:
+                agent_type = escaped[agent.type] = _escape_label(agent.type)
+            labels = f'agent_id="{_escape_label(agent.id)}",type="{agent_type}"'
+            lines.append(f'{family}_total{{{labels},result="completed"}} {agent.tasks_completed}')
+            lines.append(f'{family}_total{{{labels},result="failed"}} {agent.tasks_failed}')
+        return "\n".join(lines) + "\n"
+    
+    def get_task_queue_depths(self) -> Dict[str, int]:
+        """Current queue depth totals across attached task queues.
+        
+        Returns:
+            Pending and processing counts; empty if no queue is attached
+        """
+        queues = self._live(self._task_queues)
+        if not queues:
+            return {}
+        return {
+            "queue_pending": sum(queue.pending_queue.qsize() for queue in queues),
+            "queue_processing": sum(len(queue.processing_tasks) for queue in queues)
+        }
+    
+    def _collect_task_queues(self):
+        """Queue depth and worker gauges."""
+        pending = GaugeMetricFamily("tiation_task_queue_pending", "Tasks waiting in the queue")
+        processing = GaugeMetricFamily("tiation_task_queue_processing", "Tasks currently being processed")
+        workers = GaugeMetricFamily("tiation_task_queue_workers", "Active task queue workers")
+        
+        queues = self._live(self._task_queues)
+        if not queues:
+            return
+        
+        pending.add_metric([], sum(queue.pending_queue.qsize() for queue in queues))
+        processing.add_metric([], sum(len(queue.processing_tasks) for queue in queues))
+        workers.add_metric([], sum(len(queue.workers) for queue in queues))
+        
+        yield pending
+        yield processing
+        yield workers
+    
+    def _collect_system(self):
+        """System and process gauges from the latest background sample."""
+        gauges = {
+            "cpu_percent": ("tiation_system_cpu_percent", "System CPU utilization"),
+            "cpu_count": ("tiation_system_cpu_count", "Logical CPUs"),
+            "memory_percent": ("tiation_system_memory_percent", "System memory utilization"),
+            "memory_available": ("tiation_system_memory_available_bytes", "Available system memory"),
+            "disk_percent": ("tiation_system_disk_percent", "Root filesystem utilization"),
+            "process_memory_rss": ("tiation_process_resident_memory_bytes", "Process resident memory"),
+            "process_cpu_percent": ("tiation_process_cpu_percent", "Process CPU utilization"),
+            "load_avg_1m": ("tiation_system_load1", "1-minute load average"),
+        }
+        
+        collectors = self._live(self._metrics_collectors)
+        if not collectors:
+            return
+        
+        sample: Dict[str, Any] = {}
+        sample.update(collectors[0].get_latest_system_sample())
+        sample.update(collectors[0].get_latest_performance_sample())
+        
+        for key, (name, documentation) in gauges.items():
+            value = sample.get(key)
+            if isinstance(value, (int, float)):
+                yield GaugeMetricFamily(name, documentation, value=value)
+        
+        resources = collectors[0].get_latest_resource_sample()
+        resource_gauges = {
+            "effective_cores": ("tiation_container_effective_cores", "CPU cores available under the cgroup quota"),
+            "effective_memory": ("tiation_container_memory_limit_bytes", "Memory available under the cgroup limit"),
+            "memory_headroom": ("tiation_container_memory_headroom_bytes", "Memory left before the cgroup limit"),
+            "cpu_throttle_ratio": ("tiation_container_cpu_throttle_ratio", "Share of CFS periods that were throttled"),
+        }
+        for key, (name, documentation) in resource_gauges.items():
+            value = resources.get(key)
+            if isinstance(value, (int, float)):
+                yield GaugeMetricFamily(name, documentation, value=value)
+        
+        pressure = resources.get("pressure")
+        if pressure:
+            pressure_gauge = GaugeMetricFamily(
+                "tiation_pressure_stall_percent", "Pressure-stall information, 10s average",
+                labels=["resource", "kind"]
+            )
+            for resource, values in pressure.items():
+                for kind in ("some", "full"):
+                    if f"{kind}_avg10" in values:
+                        pressure_gauge.add_metric([resource, kind], values[f"{kind}_avg10"])
+            yield pressure_gauge
+        
+        loop_monitor = getattr(collectors[0], "loop_monitor", None)
+        if loop_monitor is not None and loop_monitor.running:
+            lag = loop_monitor.get_lag_stats()
+            if lag["samples"]:
+                lag_gauge = GaugeMetricFamily(
+                    "tiation_event_loop_lag_seconds", "Event-loop scheduling lag over recent probes",
+                    labels=["quantile"]
+                )
+                for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"), ("1", "max")):
+                    lag_gauge.add_metric([quantile], lag[key])
+                yield lag_gauge
+            
+            slow = CounterMetricFamily(
+                "tiation_event_loop_slow_callbacks", "Callbacks that blocked the event loop, by subsystem",
+                labels=["subsystem"]
+            )
+            for subsystem, totals in loop_monitor.get_stats()["slow_callbacks"].items():
+                slow.add_metric([subsystem], totals["count"])
+            yield slow
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the text exposition formats."""
+    if "\\" in value or '"' in value or "\n" in value:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return value
+
+
+# Default platform collector, registered with the platform registry
+platform_collector = PlatformCollector()
+REGISTRY.register(platform_collector)
+
+
+def render_metrics(accept: Optional[str] = None) -> Tuple[bytes, str]:
+    """Render the platform registry in the format the scraper asked for.
+    
+    Safe to call from a worker thread: collectors only take copies of the
+    live registries they read.
+    
+    Args:
+        accept: Value of the request's Accept header
+    
+    Returns:
+        Tuple of (body, content type)
+    """
+    if accept and "application/openmetrics-text" in accept:
+        body = openmetrics.generate_latest(REGISTRY)
+        agent_series = platform_collector.render_agent_series(openmetrics_format=True).encode("utf-8")
+        # The per-agent families must precede the terminating "# EOF" line
+        if agent_series and body.endswith(b"# EOF\n"):
+            body = body[:-len(b"# EOF\n")] + agent_series + b"# EOF\n"
+        return body, openmetrics.CONTENT_TYPE_LATEST
+    
+    body = generate_latest(REGISTRY) + platform_collector.render_agent_series().encode("utf-8")
+    return body, CONTENT_TYPE_LATEST
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Sampling Profiler
+On-demand, thread-based stack sampler producing flamegraph-ready collapsed stacks.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from core.loop_monitor import current_callback, subsystem_for_file
+from utils.logger import setup_logger
+
+
+# Longest profile accepted, to keep an accidental request from running forever
+MAX_PROFILE_DURATION = 120.0
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another is running."""
+
+
+class SamplingProfiler:
+    """Statistical CPU profiler for the whole process.
+    
+    A background thread reads every other thread's current frame at a fixed
+    interval and counts identical stacks. Nothing is instrumented, so the
+    profiled code runs at full speed; the cost is one stack walk per thread
+    per sample on the sampler thread. Stacks are keyed by thread name (and by
+    the callback or task an event loop is running) and tagged with the
+    subsystem owning their innermost platform frame.
+    """
+    
+    def __init__(self, interval: float = 0.01, max_depth: int = 128):
+        """Initialize sampling profiler.
+        
+        Args:
+            interval: Default seconds between samples
+            max_depth: Deepest stack recorded per sample
+        """
+        self.logger = setup_logger(__name__)
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._code_names: Dict[Any, Tuple[str, Optional[str]]] = {}
+    
+    @property
+    def running(self) -> bool:
+        """Whether a profile is in progress."""
+        return self._lock.locked()
+    
+    def run(self, duration: float, interval: Optional[float] = None) -> Dict[str, Any]:
+        """Sample all threads for ``duration`` seconds, blocking the caller.
+        
+        Args:
+            duration: Seconds to sample for
+            interval: Seconds between samples, defaults to ``self.interval``
+        
+        Returns:
+            Dictionary with collapsed stack counts and per-subsystem totals
+        
+        Raises:
+            ProfilerBusyError: If another profile is running
+            ValueError: If the duration or interval is out of range
+        """
+        interval = interval or self.interval
+        if not 0 < duration <= MAX_PROFILE_DURATION:
+            raise ValueError(f"Profile duration must be in (0, {MAX_PROFILE_DURATION}] seconds")
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            self.logger.info(f"Profiling for {duration}s at {1 / interval:.0f} Hz")
+            return self._sample(duration, interval)
+        finally:
+            self._lock.release()
+    
+    async def profile(self, duration: float, interval: Optional[float] = None) -> Dict[str, Any]:
+        """Sample all threads for ``duration`` seconds without blocking the event loop.
+        
+        Args:
+            duration: Seconds to sample for
+            interval: Seconds between samples
+        
+        Returns:
+            Same as ``run``
+        """
+        return await asyncio.to_thread(self.run, duration, interval)
+    
+    def _sample(self, duration: float, interval: float) -> Dict[str, Any]:
+        """Sampling loop. Runs on the calling thread."""
+        own_id = threading.get_ident()
+        stacks: Dict[Tuple[str, str, Tuple[str, ...]], int] = {}
+        subsystems: Dict[str, int] = {}
+        samples = 0
+        sampling_time = 0.0
+        
+        started = time.perf_counter()
+        deadline = started + duration
+        next_sample = started
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            next_sample += interval
+            
+            tick = time.perf_counter()
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = thread_names.get(thread_id, f"thread-{thread_id}")
+                task_name = current_callback(frame)
+                if task_name:
+                    thread_name = f"{thread_name};{task_name}"
+                frames, subsystem = self._walk(frame)
+                subsystem = subsystem or "other"
+                key = (thread_name, subsystem, frames)
+                stacks[key] = stacks.get(key, 0) + 1
+                subsystems[subsystem] = subsystems.get(subsystem, 0) + 1
+            samples += 1
+            sampling_time += time.perf_counter() - tick
+        
+        elapsed = time.perf_counter() - started
+        collapsed = [
+            (";".join((thread_name, f"[{subsystem}]") + frames), count)
+            for (thread_name, subsystem, frames), count in stacks.items()
+        ]
+        collapsed.sort(key=lambda item: item[1], reverse=True)
+        
+        return {
+            "duration": elapsed,
+            "interval": interval,
+            "samples": samples,
+            # Share of wall time the sampler itself was busy
+            "overhead": sampling_time / elapsed if elapsed > 0 else 0.0,
+            "subsystems": subsystems,
+            "stacks": collapsed
+        }
+    
+    def _walk(self, frame: Any) -> Tuple[Tuple[str, ...], Optional[str]]:
+        """Name a thread's frames outermost first and find its subsystem."""
+        names = []
+        subsystem = None
+        code_names = self._code_names
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            cached = code_names.get(code)
+            if cached is None:
+                cached = code_names[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})",
+                    subsystem_for_file(code.co_filename)
+                )
+            names.append(cached[0])
+            if subsystem is None:
+                subsystem = cached[1]
+            frame = frame.f_back
+        names.reverse()
+        return tuple(names), subsystem
+
+
+def to_collapsed(profile: Dict[str, Any]) -> str:
+    """Render a profile in the collapsed format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"])
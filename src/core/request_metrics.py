@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Request Metrics
+Per-route HTTP latency, size and error statistics with slow-request samples.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.loop_monitor import LoopMonitor
+from core.metrics_exporter import (
+    HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, HTTP_RESPONSE_SIZE, HTTP_REQUEST_ERRORS
+)
+
+
+class RequestTiming:
+    """Timestamps of one request, filled in as it passes through the app.
+    
+    All times are time.perf_counter() values; phases that did not happen
+    (no endpoint ran, no response was started) stay None.
+    """
+    
+    __slots__ = ("method", "path", "route", "started", "handler_started", "endpoint_started",
+                 "endpoint_finished", "response_started", "finished", "status", "size", "error", "loop_lag")
+    
+    def __init__(self, method: str, path: str):
+        """Initialize request timing.
+        
+        Args:
+            method: HTTP method
+            path: Request path
+        """
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started = time.perf_counter()
+        self.handler_started: Optional[float] = None
+        self.endpoint_started: Optional[float] = None
+        self.endpoint_finished: Optional[float] = None
+        self.response_started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.status = 500
+        self.size = 0
+        self.error: Optional[str] = None
+        # Worst event-loop lag while the request ran, filled in for slow requests
+        self.loop_lag: Optional[float] = None
+    
+    @property
+    def duration(self) -> float:
+        """Seconds from arrival to the last byte sent."""
+        return (self.finished or time.perf_counter()) - self.started
+    
+    def breakdown(self) -> Dict[str, Optional[float]]:
+        """Seconds spent in each phase.
+        
+        ``routing`` is middleware and route matching; ``request`` body
+        parsing and dependencies; ``endpoint`` the route function;
+        ``serialization`` validating and encoding its result up to the
+        response start; ``send`` writing the body.
+        """
+        handler_started = self.handler_started
+        endpoint_started = self.endpoint_started
+        endpoint_finished = self.endpoint_finished
+        response_started = self.response_started
+        return {
+            "routing": handler_started - self.started if handler_started else None,
+            "request": endpoint_started - handler_started if endpoint_started and handler_started else None,
+            "endpoint": endpoint_finished - endpoint_started if endpoint_finished and endpoint_started else None,
+            "serialization": (
+                response_started - endpoint_finished
+                if response_started and endpoint_finished else None
+            ),
+            "send": self.finished - response_started if self.finished and response_started else None,
+            "loop_lag": self.loop_lag
+        }
+
+
+class _RouteStats:
+    """Counters and a latency ring buffer for one route."""
+    
+    __slots__ = ("count", "errors", "total", "max", "bytes", "latencies", "in_flight")
+    
+    def __init__(self, samples: int):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.latencies = np.zeros(samples, dtype=np.float64)
+        self.in_flight = 0
+
+
+class RequestMetrics:
+    """Per-route request statistics, exported to Prometheus and kept for the API.
+    
+    Routes are labelled by their template (``/api/agents/{agent_id}/restart``)
+    so the label set stays bounded; requests no API route handled (unknown
+    paths, static files) share the ``unmatched`` label. Requests at least ``slow_threshold`` seconds long
+    are kept, with their phase breakdown, in a fixed-size buffer.
+    """
+    
+    def __init__(self, slow_threshold: float = 0.5, max_slow_requests: int = 100,
+                 latency_samples: int = 512, loop_monitor: Optional[LoopMonitor] = None):
+        """Initialize request metrics.
+        
+        Args:
+            slow_threshold: Requests taking at least this many seconds are sampled
+            max_slow_requests: Number of recent slow-request samples kept
+            latency_samples: Number of recent latencies kept per route for percentiles
+            loop_monitor: Monitor whose lag samples are attached to slow requests
+        """
+        self.loop_monitor = loop_monitor
+        self.slow_threshold = slow_threshold
+        self.latency_samples = latency_samples
+        self.in_flight = 0
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._slow_requests: deque = deque(maxlen=max_slow_requests)
+        # Prometheus children by label values; labels() costs more than the observation
+        self._children: Dict[Tuple[str, ...], Tuple[Any, Any]] = {}
+    
+    def started(self, timing: RequestTiming):
+        """Count a request as in flight."""
+        self.in_flight += 1
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+    
+    def route_started(self, timing: RequestTiming):
+        """Count a request as in flight on the route that is handling it."""
+        self._stats(timing.method, timing.route).in_flight += 1
+    
+    def finished(self, timing: RequestTiming):
+        """Record a completed request. ``timing.finished`` must be set."""
+        self.in_flight -= 1
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        
+        route = timing.route or "unmatched"
+        stats = self._stats(timing.method, route)
+        if timing.handler_started is not None:
+            stats.in_flight -= 1
+        duration = timing.duration
+        stats.latencies[stats.count % len(stats.latencies)] = duration
+        stats.count += 1
+        stats.total += duration
+        stats.bytes += timing.size
+        if duration > stats.max:
+            stats.max = duration
+        
+        status = str(timing.status)
+        key = (timing.method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                HTTP_REQUEST_DURATION.labels(timing.method, route, status),
+                HTTP_RESPONSE_SIZE.labels(timing.method, route)
+            )
+        children[0].observe(duration)
+        children[1].observe(timing.size)
+        
+        if timing.error is not None or timing.status >= 500:
+            stats.errors += 1
+            HTTP_REQUEST_ERRORS.labels(timing.method, route, "exception" if timing.error else "5xx").inc()
+        
+        if duration >= self.slow_threshold:
+            if self.loop_monitor is not None and self.loop_monitor.running:
+                timing.loop_lag = self.loop_monitor.recent_max_lag(duration)
+            self._slow_requests.append({
+                "timestamp": time.time(),
+                "method": timing.method,
+                "route": route,
+                "path": timing.path,
+                "status": timing.status,
+                "duration": duration,
+                "size": timing.size,
+                "error": timing.error,
+                "breakdown": timing.breakdown()
+            })
+    
+    def _stats(self, method: str, route: str) -> _RouteStats:
+        stats = self._routes.get((method, route))
+        if stats is None:
+            stats = self._routes[(method, route)] = _RouteStats(self.latency_samples)
+        return stats
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-route counts, latency percentiles, sizes and errors."""
+        routes = []
+        for (method, route), stats in self._routes.items():
+            count = min(stats.count, len(stats.latencies))
+            p50 = p90 = p99 = None
+            if count:
+                p50, p90, p99 = (float(value) for value in np.percentile(stats.latencies[:count], [50, 90, 99]))
+            routes.append({
+                "method": method,
+                "route": route,
+                "requests": stats.count,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "mean": stats.total / stats.count if stats.count else None,
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "max": stats.max,
+                "mean_size": stats.bytes / stats.count if stats.count else None
+            })
+        routes.sort(key=lambda entry: entry["requests"], reverse=True)
+        return {
+            "in_flight": self.in_flight,
+            "slow_threshold": self.slow_threshold,
+            "routes": routes
+        }
+    
+    def get_slow_requests(self, limit: Optional[int] = None, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get recent slow-request samples, newest first.
+        
+        Args:
+            limit: Maximum number of samples to return
+            route: Only samples of this route template
+        """
+        samples = [sample for sample in reversed(self._slow_requests)
+                   if route is None or sample["route"] == route]
+        return samples[:limit] if limit else samples
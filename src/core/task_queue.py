@@ -5,13 +5,19 @@ Asynchronous task processing and queue management.
 """
 
 import asyncio
+import time
 import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Set, Tuple
 from dataclasses import dataclass, field
 
 from utils.logger import setup_logger
+from core.agent_manager import AgentManager
+from core.cgroup import default_concurrency
+from core.metrics_exporter import (
+    platform_collector, TASKS_SUBMITTED, TASKS_FINISHED, TASK_RETRIES, TASK_DURATION, TASK_QUEUE_WAIT
+)
 
 
 class TaskStatus(Enum):
@@ -64,26 +70,47 @@ class Task:
 class TaskQueue:
     """Asynchronous task queue manager."""
     
-    def __init__(self, max_workers: int = 10):
+    def __init__(self, max_workers: Optional[int] = 10, agent_manager: Optional[AgentManager] = None,
+                 agent_wait_timeout: float = 60.0):
         """Initialize task queue.
         
         Args:
-            max_workers: Maximum number of concurrent workers
+            max_workers: Maximum number of concurrent workers; None sizes the
+                pool from the container's CPU and memory limits
+            agent_manager: Agent manager told when a task assigned to an agent
+                starts and finishes, so stopping the agent can drain it
+            agent_wait_timeout: Seconds a task waits for its agent to accept
+                work again, e.g. through a restart, before it fails
         """
         self.logger = setup_logger(__name__)
-        self.max_workers = max_workers
+        self.max_workers = max_workers if max_workers is not None else default_concurrency()
         self.tasks: Dict[str, Task] = {}
         self.pending_queue: asyncio.Queue = asyncio.Queue()
         self.processing_tasks: Dict[str, asyncio.Task] = {}
         self.task_handlers: Dict[TaskType, Callable] = {}
         self.workers: List[asyncio.Task] = []
         self.running = False
+        self.agent_manager = agent_manager
+        
+        # Tasks refused by a draining or stopped agent are requeued after a
+        # backoff without using a retry: task ID -> (first refusal, refusals)
+        self.agent_wait_timeout = agent_wait_timeout
+        self.agent_retry_delay = 0.1
+        self.agent_retry_max_delay = 2.0
+        self._agent_waits: Dict[str, Tuple[float, int]] = {}
+        self._deferred: Set[asyncio.Task] = set()
+        
         self.stats = {
             "total_tasks": 0,
             "completed_tasks": 0,
             "failed_tasks": 0,
             "cancelled_tasks": 0
         }
+        
+        # Called with the task on every status change; must be cheap and must not raise
+        self.change_listeners: List[Callable[[Task], None]] = []
+        
+        platform_collector.attach_task_queue(self)
     
     async def start(self):
         """Start the task queue workers."""
@@ -114,6 +141,12 @@ class TaskQueue:
         await asyncio.gather(*self.workers, return_exceptions=True)
         self.workers.clear()
         
+        # Drop requeues still waiting out their backoff
+        for deferred in self._deferred:
+            deferred.cancel()
+        await asyncio.gather(*self._deferred, return_exceptions=True)
+        self._deferred.clear()
+        
         # Cancel processing tasks
         for task in self.processing_tasks.values():
             task.cancel()
@@ -121,6 +154,11 @@ class TaskQueue:
         await asyncio.gather(*self.processing_tasks.values(), return_exceptions=True)
         self.processing_tasks.clear()
     
+    def _notify_change(self, task: Task):
+        """Tell listeners a task changed status."""
+        for listener in self.change_listeners:
+            listener(task)
+    
     def register_handler(self, task_type: TaskType, handler: Callable):
         """Register a task handler.
         
@@ -143,6 +181,8 @@ class TaskQueue:
         self.tasks[task.id] = task
         await self.pending_queue.put(task)
         self.stats["total_tasks"] += 1
+        TASKS_SUBMITTED.labels(task.type.value).inc()
+        self._notify_change(task)
         
         self.logger.info(
             f"Task submitted: {task.id} (type: {task.type.value}, priority: {task.priority.value})"
@@ -205,6 +245,8 @@ class TaskQueue:
         task.status = TaskStatus.CANCELLED
         task.completed_at = datetime.now()
         self.stats["cancelled_tasks"] += 1
+        TASKS_FINISHED.labels(task.type.value, TaskStatus.CANCELLED.value).inc()
+        self._notify_change(task)
         
         self.logger.info(f"Task cancelled: {task_id}")
         return True
@@ -261,10 +303,18 @@ class TaskQueue:
             task: Task to process
             worker_id: Worker identifier
         """
+        task_type = task.type.value
+        start = time.perf_counter()
+        # Whether the task counts as in flight on its agent and must be released
+        on_agent = False
+        
         try:
             # Update task status
             task.status = TaskStatus.PROCESSING
             task.started_at = datetime.now()
+            if task.retries == 0 and task.id not in self._agent_waits:
+                TASK_QUEUE_WAIT.labels(task_type).observe((task.started_at - task.created_at).total_seconds())
+            self._notify_change(task)
             
             self.logger.info(f"Processing task {task.id} with worker {worker_id}")
             
@@ -273,6 +323,18 @@ class TaskQueue:
             if not handler:
                 raise ValueError(f"No handler registered for task type: {task.type.value}")
             
+            if task.agent_id and self.agent_manager is not None:
+                if task.agent_id not in self.agent_manager.agents:
+                    raise ValueError(f"Agent not found: {task.agent_id}")
+                if not self.agent_manager.begin_agent_task(task.agent_id):
+                    if self._defer_for_agent(task):
+                        return
+                    raise RuntimeError(
+                        f"Agent {task.agent_id} did not accept tasks within {self.agent_wait_timeout}s"
+                    )
+                self._agent_waits.pop(task.id, None)
+                on_agent = True
+            
             # Create processing task with timeout
             processing_task = asyncio.create_task(handler(task))
             self.processing_tasks[task.id] = processing_task
@@ -288,6 +350,11 @@ class TaskQueue:
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.now()
             self.stats["completed_tasks"] += 1
+            TASK_DURATION.labels(task_type).observe(time.perf_counter() - start)
+            TASKS_FINISHED.labels(task_type, TaskStatus.COMPLETED.value).inc()
+            if on_agent:
+                on_agent = False
+                await self.agent_manager.update_agent_activity(task.agent_id, True, time.perf_counter() - start)
             
             self.logger.info(f"Task {task.id} completed successfully")
             
@@ -295,26 +362,71 @@ class TaskQueue:
             task.status = TaskStatus.CANCELLED
             task.completed_at = datetime.now()
             self.stats["cancelled_tasks"] += 1
+            TASKS_FINISHED.labels(task_type, TaskStatus.CANCELLED.value).inc()
+            if on_agent:
+                self.agent_manager.end_agent_task(task.agent_id)
             self.logger.info(f"Task {task.id} was cancelled")
             
         except Exception as e:
             task.error = str(e)
             task.retries += 1
+            TASK_DURATION.labels(task_type).observe(time.perf_counter() - start)
+            if on_agent:
+                await self.agent_manager.update_agent_activity(task.agent_id, False, time.perf_counter() - start)
             
             if task.retries <= task.max_retries:
                 # Retry the task
                 task.status = TaskStatus.PENDING
                 task.started_at = None
                 await self.pending_queue.put(task)
+                TASK_RETRIES.labels(task_type).inc()
                 self.logger.warning(f"Task {task.id} failed, retrying ({task.retries}/{task.max_retries}): {e}")
             else:
                 # Max retries reached
                 task.status = TaskStatus.FAILED
                 task.completed_at = datetime.now()
                 self.stats["failed_tasks"] += 1
+                TASKS_FINISHED.labels(task_type, TaskStatus.FAILED.value).inc()
                 self.logger.error(f"Task {task.id} failed after {task.retries} retries: {e}")
         
         finally:
             # Clean up processing task
             if task.id in self.processing_tasks:
                 del self.processing_tasks[task.id]
+            self._notify_change(task)
+    
+    def _defer_for_agent(self, task: Task) -> bool:
+        """Requeue a task its agent refused, after a backoff and without using a retry.
+        
+        The agent is draining or offline, usually for a stop or restart, so
+        the task waits for it instead of burning its retries at once.
+        
+        Args:
+            task: Task the agent refused
+            
+        Returns:
+            False once the agent has refused the task for ``agent_wait_timeout``
+        """
+        now = time.monotonic()
+        first_refused, refusals = self._agent_waits.get(task.id, (now, 0))
+        if now - first_refused >= self.agent_wait_timeout:
+            self._agent_waits.pop(task.id, None)
+            return False
+        self._agent_waits[task.id] = (first_refused, refusals + 1)
+        
+        task.status = TaskStatus.PENDING
+        task.started_at = None
+        delay = min(self.agent_retry_max_delay, self.agent_retry_delay * 2 ** refusals)
+        deferred = asyncio.create_task(self._requeue_later(task, delay))
+        self._deferred.add(deferred)
+        deferred.add_done_callback(self._deferred.discard)
+        self.logger.info(f"Agent {task.agent_id} is not accepting tasks; task {task.id} requeued in {delay:.2f}s")
+        return True
+    
+    async def _requeue_later(self, task: Task, delay: float):
+        """Put a deferred task back on the queue unless it was cancelled meanwhile."""
+        await asyncio.sleep(delay)
+        if task.status == TaskStatus.PENDING:
+            await self.pending_queue.put(task)
+        else:
+            self._agent_waits.pop(task.id, None)
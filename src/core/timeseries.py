@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Time-Series Store
+Fixed-size NumPy ring buffers with automatic 1s/1m/1h downsampling for metrics history.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+
+# (resolution in seconds, number of buckets): 10 minutes of 1s, 24 hours of 1m, 30 days of 1h
+DEFAULT_TIERS: Tuple[Tuple[int, int], ...] = ((1, 600), (60, 1440), (3600, 720))
+
+# Per-bucket columns kept by every tier
+_FIELDS = ("start", "min", "max", "sum", "count", "last")
+
+
+class TimeSeriesTier:
+    """Ring buffer of fixed-width time buckets for one series at one resolution.
+    
+    Each bucket aggregates every raw sample that falls inside it into
+    min/max/sum/count/last, so coarser tiers are exact rollups rather than
+    samples of samples.
+    """
+    
+    __slots__ = ("resolution", "capacity", "_data", "_head", "_current")
+    
+    def __init__(self, resolution: int, capacity: int):
+        """Initialize tier.
+        
+        Args:
+            resolution: Bucket width in seconds
+            capacity: Number of buckets retained
+        """
+        self.resolution = resolution
+        self.capacity = capacity
+        # One contiguous block: row per field, column per bucket
+        self._data = np.zeros((len(_FIELDS), capacity), dtype=np.float64)
+        self._head = -1
+        self._current = -1
+    
+    @property
+    def retention(self) -> int:
+        """Seconds of history the tier can hold."""
+        return self.resolution * self.capacity
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the tier's buffers."""
+        return self._data.nbytes
+    
+    def record(self, timestamp: float, value: float):
+        """Fold a sample into its bucket.
+        
+        Args:
+            timestamp: Sample time in seconds since the epoch
+            value: Sample value
+        """
+        bucket = int(timestamp // self.resolution)
+        data = self._data
+        
+        if bucket == self._current:
+            head = self._head
+            if value < data[1, head]:
+                data[1, head] = value
+            if value > data[2, head]:
+                data[2, head] = value
+            data[3, head] += value
+            data[4, head] += 1
+            data[5, head] = value
+            return
+        
+        if bucket < self._current:
+            # Late sample for a bucket already rotated out of the head; drop it
+            return
+        
+        self._head = (self._head + 1) % self.capacity
+        self._current = bucket
+        data[:, self._head] = (bucket * self.resolution, value, value, value, 1, value)
+    
+    def query(self, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Return buckets whose start time lies in [start, end], oldest first.
+        
+        Args:
+            start: Window start in seconds since the epoch
+            end: Window end in seconds since the epoch
+        
+        Returns:
+            Mapping of column name to array
+        """
+        data = self._data
+        starts = data[0]
+        mask = (data[4] > 0) & (starts >= start - self.resolution) & (starts <= end)
+        index = np.flatnonzero(mask)
+        index = index[np.argsort(starts[index], kind="stable")]
+        
+        selected = data[:, index]
+        return {
+            "timestamp": selected[0],
+            "min": selected[1],
+            "max": selected[2],
+            "mean": selected[3] / selected[4],
+            "last": selected[5],
+            "count": selected[4]
+        }
+
+
+class TimeSeriesStore:
+    """In-process metrics history with bounded, up-front memory.
+    
+    Every series owns one ``TimeSeriesTier`` per configured resolution and
+    every sample updates all tiers. The number of series is capped, so the
+    store's worst-case footprint is ``max_series * bytes_per_series``.
+    """
+    
+    def __init__(self, tiers: Tuple[Tuple[int, int], ...] = DEFAULT_TIERS, max_series: int = 200):
+        """Initialize time-series store.
+        
+        Args:
+            tiers: (resolution seconds, bucket count) pairs, finest first
+            max_series: Maximum number of distinct series
+        """
+        self.tiers = tuple(sorted(tiers))
+        self.max_series = max_series
+        self._series: Dict[str, List[TimeSeriesTier]] = {}
+        self._dropped: set = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def bytes_per_series(self) -> int:
+        """Memory allocated for each series."""
+        return sum(len(_FIELDS) * capacity * 8 for _, capacity in self.tiers)
+    
+    @property
+    def memory_budget(self) -> int:
+        """Worst-case memory for the store at ``max_series`` series."""
+        return self.bytes_per_series * self.max_series
+    
+    def series_names(self) -> List[str]:
+        """Names of series currently stored."""
+        return sorted(self._series)
+    
+    def record(self, name: str, value: float, timestamp: Optional[float] = None) -> bool:
+        """Record one sample.
+        
+        Args:
+            name: Series name
+            value: Sample value
+            timestamp: Sample time, defaults to now
+        
+        Returns:
+            False if the sample was dropped because the series cap was reached
+        """
+        return self.record_many({name: value}, timestamp) == 1
+    
+    def record_many(self, values: Dict[str, Any], timestamp: Optional[float] = None) -> int:
+        """Record one sample for each numeric entry of a metrics dict.
+        
+        Non-numeric values (timestamps, error strings) are skipped.
+        
+        Args:
+            values: Mapping of series name to value
+            timestamp: Sample time, defaults to now
+        
+        Returns:
+            Number of samples recorded
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        recorded = 0
+        with self._lock:
+            for name, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                    continue
+                tiers = self._series.get(name)
+                if tiers is None:
+                    if len(self._series) >= self.max_series:
+                        self._dropped.add(name)
+                        continue
+                    tiers = self._series[name] = [
+                        TimeSeriesTier(resolution, capacity) for resolution, capacity in self.tiers
+                    ]
+                for tier in tiers:
+                    tier.record(timestamp, float(value))
+                recorded += 1
+        return recorded
+    
+    def query(self, name: str, start: float, end: Optional[float] = None,
+              resolution: Optional[int] = None, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """Query a series over a time window.
+        
+        Args:
+            name: Series name
+            start: Window start in seconds since the epoch
+            end: Window end, defaults to now
+            resolution: Tier resolution to read; by default the finest tier
+                whose retention covers the window
+            max_points: Merge adjacent buckets so at most this many points
+                are returned
+        
+        Returns:
+            Dictionary with the chosen resolution and per-point lists
+        """
+        if end is None:
+            end = time.time()
+        
+        with self._lock:
+            tiers = self._series.get(name)
+            if tiers is None:
+                raise KeyError(f"Unknown series: {name}")
+            
+            tier = self._select_tier(tiers, end - start, resolution)
+            points = tier.query(start, end)
+        
+        if max_points and len(points["timestamp"]) > max_points:
+            points = _merge_points(points, max_points)
+        
+        return {
+            "series": name,
+            "resolution": tier.resolution,
+            "start": start,
+            "end": end,
+            "points": {key: column.tolist() for key, column in points.items()}
+        }
+    
+    def _select_tier(self, tiers: List[TimeSeriesTier], span: float,
+                     resolution: Optional[int]) -> TimeSeriesTier:
+        """Pick the tier to answer a query from."""
+        if resolution is not None:
+            for tier in tiers:
+                if tier.resolution == resolution:
+                    return tier
+            raise ValueError(f"No tier with resolution {resolution}s")
+        
+        for tier in tiers:
+            if tier.retention >= span:
+                return tier
+        return tiers[-1]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Describe the store's configuration and usage."""
+        return {
+            "series": len(self._series),
+            "max_series": self.max_series,
+            "dropped_series": sorted(self._dropped),
+            "tiers": [
+                {"resolution": resolution, "capacity": capacity, "retention": resolution * capacity}
+                for resolution, capacity in self.tiers
+            ],
+            "bytes_per_series": self.bytes_per_series,
+            "memory_used": self.bytes_per_series * len(self._series),
+            "memory_budget": self.memory_budget
+        }
+
+
+def _merge_points(points: Dict[str, np.ndarray], max_points: int) -> Dict[str, np.ndarray]:
+    """Merge runs of adjacent buckets with vectorized reductions."""
+    size = len(points["timestamp"])
+    group = math.ceil(size / max_points)
+    offsets = np.arange(0, size, group)
+    counts = np.add.reduceat(points["count"], offsets)
+    sums = np.add.reduceat(points["mean"] * points["count"], offsets)
+    last_index = np.minimum(offsets + group, size) - 1
+    
+    return {
+        "timestamp": points["timestamp"][offsets],
+        "min": np.minimum.reduceat(points["min"], offsets),
+        "max": np.maximum.reduceat(points["max"], offsets),
+        "mean": sums / counts,
+        "last": points["last"][last_index],
+        "count": counts
+    }
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Agent Metric Columns
+Columnar agent metrics for the dashboard and their JSON encoding.
+"""
+
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, List
+
+# Columns of a dashboard agent record, in the order the API has always sent them
+AGENT_METRIC_COLUMNS = (
+    "agent_id", "name", "status", "cpu_usage", "memory_usage", "tasks_completed",
+    "tasks_failed", "uptime", "last_activity", "performance_score"
+)
+
+# Columns holding strings; the rest hold numbers
+STRING_COLUMNS = frozenset(("agent_id", "name", "status", "last_activity"))
+
+
+def agent_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """One record per agent, for consumers that work agent by agent."""
+    keys = tuple(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def _encode_column(name: str, values: List[Any]) -> List[str]:
+    """JSON text of each value in a column, encoded a whole column per C call."""
+    if name in STRING_COLUMNS:
+        return list(map(encode_basestring_ascii, values))
+    if not values:
+        return []
+    # Numbers never contain the separator, so the encoded list splits cleanly
+    return json.dumps(values)[1:-1].split(", ")
+
+
+def encode_agent_rows(columns: Dict[str, List[Any]]) -> str:
+    """Encode columns as the JSON array of records ``agent_rows`` would give.
+    
+    The output matches ``json.dumps(agent_rows(columns))`` byte for byte,
+    without building a dict per agent.
+    """
+    template = "{" + ", ".join(f"{encode_basestring_ascii(name)}: %s" for name in columns) + "}"
+    encoded = [_encode_column(name, values) for name, values in columns.items()]
+    return "[" + ", ".join(map(template.__mod__, zip(*encoded))) + "]"
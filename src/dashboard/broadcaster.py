@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - WebSocket Broadcaster
+Fan-out of dashboard updates to many sockets through per-client bounded queues.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from core.metrics_exporter import WEBSOCKET_CLIENTS, WEBSOCKET_DISCONNECTS, WEBSOCKET_MESSAGES_DROPPED
+from dashboard.encoding import EncodedMessage, SUBPROTOCOL_PREFIX, negotiate
+from utils.logger import setup_logger
+
+
+SLOW_CLIENT_POLICIES = ("latest", "disconnect")
+
+# Close code for clients disconnected for falling behind ("try again later")
+CLOSE_TRY_AGAIN_LATER = 1013
+
+# Seconds to wait for a close handshake before giving up on the socket
+CLOSE_TIMEOUT = 1.0
+
+# A queued message: text sent as is, or a message encoded for each client
+Message = Union[str, EncodedMessage]
+
+
+class ClientConnection:
+    """A connected socket with its own outbound queue and writer task."""
+    
+    __slots__ = ("websocket", "client_id", "queue", "ready", "writer", "connected_at",
+                 "last_seen", "messages_sent", "messages_dropped", "closed",
+                 "synced_version", "acked_version", "encoding")
+    
+    def __init__(self, websocket: WebSocket, client_id: int, encoding: str = "json"):
+        """Initialize client connection.
+        
+        Args:
+            websocket: Accepted websocket
+            client_id: Broadcaster-assigned ID
+            encoding: Negotiated message encoding
+        """
+        self.websocket = websocket
+        self.encoding = encoding
+        self.client_id = client_id
+        self.queue: deque = deque()
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.connected_at = time.monotonic()
+        self.last_seen = self.connected_at
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.closed = False
+        # State version of the last update queued, and the last one the client acknowledged
+        self.synced_version: Optional[int] = None
+        self.acked_version: Optional[int] = None
+
+
+class WebSocketBroadcaster:
+    """Delivers each message to every client without one client delaying another.
+    
+    ``broadcast`` only appends the already-serialized message to each
+    client's bounded queue and returns; a writer task per client drains its
+    queue onto the socket. When a client's queue is full it is either
+    collapsed to the newest message (``latest``, right for full-state
+    updates) or the client is disconnected (``disconnect``). A send that
+    stalls past ``send_timeout`` disconnects the client. A heartbeat sends
+    ``{"type": "ping"}`` messages and reaps clients that have not been heard
+    from within ``ping_timeout``; clients answer with ``{"type": "pong"}``,
+    though any inbound message counts as one.
+    """
+    
+    def __init__(self, queue_size: int = 8, slow_client_policy: str = "latest",
+                 send_timeout: float = 10.0, ping_interval: float = 20.0,
+                 ping_timeout: float = 60.0,
+                 on_connect: Optional[Callable[[ClientConnection], None]] = None,
+                 on_message: Optional[Callable[[ClientConnection, str], Optional[Awaitable[None]]]] = None,
+                 on_disconnect: Optional[Callable[[ClientConnection], None]] = None):
+        """Initialize broadcaster.
+        
+        Args:
+            queue_size: Maximum messages queued per client
+            slow_client_policy: "latest" or "disconnect"
+            send_timeout: Seconds a single send may take before the client is dropped
+            ping_interval: Seconds between heartbeat pings
+            ping_timeout: Seconds of silence after which a client is reaped
+            on_connect: Called with each newly registered client
+            on_message: Called with each inbound message; may be a coroutine function
+            on_disconnect: Called with each client as it is unregistered
+        """
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"slow_client_policy must be one of {', '.join(SLOW_CLIENT_POLICIES)}")
+        
+        self.logger = setup_logger(__name__)
+        self.queue_size = queue_size
+        self.slow_client_policy = slow_client_policy
+        self.send_timeout = send_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.on_connect = on_connect
+        self.on_message = on_message
+        self.on_disconnect = on_disconnect
+        
+        self.clients: Dict[int, ClientConnection] = {}
+        self._next_id = 0
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._background: set = set()
+    
+    def __len__(self) -> int:
+        return len(self.clients)
+    
+    def start(self):
+        """Start the heartbeat task."""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+    
+    async def stop(self):
+        """Stop the heartbeat and close every client."""
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        await asyncio.gather(
+            *(self.disconnect(client, "shutdown") for client in list(self.clients.values())),
+            return_exceptions=True
+        )
+    
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
+        """Accept a socket, negotiate its encoding and start its writer.
+        
+        The encoding comes from the first supported ``tiation.<encoding>``
+        subprotocol the client offers, else from the ``encoding`` query
+        parameter (comma-separated, in order of preference), else JSON.
+        
+        Args:
+            websocket: Socket to accept
+        
+        Returns:
+            The registered client
+        """
+        offered = [
+            protocol[len(SUBPROTOCOL_PREFIX):]
+            for protocol in websocket.scope.get("subprotocols", [])
+            if protocol.startswith(SUBPROTOCOL_PREFIX)
+        ]
+        encoding = negotiate(offered)
+        if encoding:
+            await websocket.accept(subprotocol=SUBPROTOCOL_PREFIX + encoding)
+        else:
+            encoding = negotiate(websocket.query_params.get("encoding", "").split(",")) or "json"
+            await websocket.accept()
+        
+        self._next_id += 1
+        client = ClientConnection(websocket, self._next_id, encoding)
+        client.writer = asyncio.create_task(self._writer(client))
+        self.clients[client.client_id] = client
+        WEBSOCKET_CLIENTS.inc()
+        if self.on_connect:
+            self.on_connect(client)
+        return client
+    
+    async def serve(self, websocket: WebSocket):
+        """Accept a socket and read from it until it disconnects.
+        
+        Inbound messages refresh the client's liveness and are passed to
+        ``on_message`` as text or bytes.
+        
+        Args:
+            websocket: Socket to serve
+        """
+        client = await self.connect(websocket)
+        reason = "closed"
+        try:
+            while True:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                client.last_seen = time.monotonic()
+                message = frame.get("text")
+                if message is None:
+                    message = frame.get("bytes")
+                if self.on_message and message is not None:
+                    result = self.on_message(client, message)
+                    if asyncio.iscoroutine(result):
+                        await result
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            reason = "error"
+            self.logger.error(f"WebSocket error: {e}")
+        finally:
+            await self.disconnect(client, reason)
+    
+    async def disconnect(self, client: ClientConnection, reason: str, code: int = 1000):
+        """Unregister a client, stop its writer and close its socket.
+        
+        Args:
+            client: Client to drop
+            reason: Label recorded in the disconnect counter
+            code: Websocket close code
+        """
+        if client.closed:
+            return
+        client.closed = True
+        self.clients.pop(client.client_id, None)
+        WEBSOCKET_CLIENTS.dec()
+        WEBSOCKET_DISCONNECTS.labels(reason=reason).inc()
+        if self.on_disconnect:
+            self.on_disconnect(client)
+        
+        writer = client.writer
+        if writer and writer is not asyncio.current_task():
+            writer.cancel()
+        try:
+            await asyncio.wait_for(client.websocket.close(code=code), CLOSE_TIMEOUT)
+        except Exception:
+            # Already closed by the peer or the server
+            pass
+    
+    def broadcast(self, message: Message, fallback: Optional[Callable[[], Message]] = None) -> int:
+        """Queue a serialized message for every client.
+        
+        Never awaits, so it costs the caller one queue append per client.
+        
+        Args:
+            message: Message text, or an EncodedMessage each encoding of which
+                is produced once and shared by every client using it
+            fallback: See ``send``
+        
+        Returns:
+            Number of clients the message was queued for
+        """
+        queued = 0
+        for client in list(self.clients.values()):
+            if self.send(client, message, fallback):
+                queued += 1
+        return queued
+    
+    def send(self, client: ClientConnection, message: Message,
+             fallback: Optional[Callable[[], Message]] = None) -> bool:
+        """Queue a message for one client, applying the slow-client policy.
+        
+        Args:
+            client: Destination client
+            message: Message text or EncodedMessage
+            fallback: Under the ``latest`` policy, produces the message queued
+                instead of ``message`` when the backlog is discarded; needed
+                when ``message`` only makes sense after the discarded ones
+        
+        Returns:
+            False if the client was disconnected instead
+        """
+        if client.closed:
+            return False
+        
+        if len(client.queue) >= self.queue_size:
+            if self.slow_client_policy == "disconnect":
+                WEBSOCKET_MESSAGES_DROPPED.inc(len(client.queue))
+                self._spawn(self.disconnect(client, "slow", CLOSE_TRY_AGAIN_LATER))
+                return False
+            # Only the newest state matters to a client this far behind
+            self._discard_backlog(client)
+            if fallback is not None:
+                message = fallback()
+        
+        client.queue.append(message)
+        client.ready.set()
+        return True
+    
+    def replace(self, client: ClientConnection, message: Message) -> bool:
+        """Discard a client's backlog and queue a single message in its place.
+        
+        Returns:
+            False if the client is closed
+        """
+        if client.closed:
+            return False
+        self._discard_backlog(client)
+        client.queue.append(message)
+        client.ready.set()
+        return True
+    
+    def _discard_backlog(self, client: ClientConnection):
+        """Drop every message still queued for a client."""
+        dropped = len(client.queue)
+        client.queue.clear()
+        client.messages_dropped += dropped
+        WEBSOCKET_MESSAGES_DROPPED.inc(dropped)
+    
+    async def _writer(self, client: ClientConnection):
+        """Drain one client's queue onto its socket."""
+        websocket = client.websocket
+        try:
+            while True:
+                await client.ready.wait()
+                while client.queue:
+                    message = client.queue.popleft()
+                    if isinstance(message, EncodedMessage):
+                        message = message.encode(client.encoding)
+                    if isinstance(message, bytes):
+                        await asyncio.wait_for(websocket.send_bytes(message), self.send_timeout)
+                    else:
+                        await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+                    client.messages_sent += 1
+                client.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            await self.disconnect(client, "send_timeout", CLOSE_TRY_AGAIN_LATER)
+        except Exception:
+            await self.disconnect(client, "send_error")
+    
+    async def _heartbeat_loop(self):
+        """Ping every client and reap the ones that stopped answering."""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                now = time.monotonic()
+                for client in list(self.clients.values()):
+                    if now - client.last_seen > self.ping_timeout:
+                        self._spawn(self.disconnect(client, "ping_timeout"))
+                self.broadcast(EncodedMessage({"type": "ping", "timestamp": time.time()}))
+            except Exception as e:
+                self.logger.error(f"Error in websocket heartbeat: {e}")
+    
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection and queue statistics."""
+        clients = list(self.clients.values())
+        return {
+            "clients": len(clients),
+            "queued_messages": sum(len(client.queue) for client in clients),
+            "messages_sent": sum(client.messages_sent for client in clients),
+            "messages_dropped": sum(client.messages_dropped for client in clients),
+            "queue_size": self.queue_size,
+            "slow_client_policy": self.slow_client_policy,
+            "encodings": {
+                encoding: sum(1 for client in clients if client.encoding == encoding)
+                for encoding in {client.encoding for client in clients}
+            }
+        }
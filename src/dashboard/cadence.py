@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Broadcast Cadence
+Event-driven, change-rate-adaptive schedule for dashboard pushes.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+from core.metrics_exporter import DASHBOARD_BROADCAST_INTERVAL, DASHBOARD_BROADCASTS
+
+
+class BroadcastCadence:
+    """Decides when the dashboard metrics loop next collects and pushes.
+    
+    State changes are reported with ``notify`` and coalesced: a push
+    follows ``quiet_period`` after the last change, but never later than
+    ``latency_budget`` after the first, so a lone change goes out almost
+    at once and a burst is pushed once per budget however long it lasts.
+    
+    Without changes the loop still ticks as a heartbeat, for metrics that
+    change without events (CPU, memory, uptime). The heartbeat starts at
+    ``base_interval`` and doubles with each tick not preceded by a change,
+    up to ``idle_interval``; a change resets it.
+    """
+    
+    def __init__(self, quiet_period: float = 0.1, latency_budget: float = 1.0,
+                 base_interval: float = 5.0, idle_interval: float = 60.0):
+        """Initialize cadence.
+        
+        Args:
+            quiet_period: Seconds without changes after which pending changes are pushed
+            latency_budget: Maximum seconds from a change to its push
+            base_interval: Heartbeat interval right after a change
+            idle_interval: Longest heartbeat interval once changes stop
+        """
+        self.quiet_period = quiet_period
+        self.latency_budget = latency_budget
+        self.base_interval = base_interval
+        self.idle_interval = idle_interval
+        self.interval = base_interval
+        
+        self._changed = asyncio.Event()
+        # Monotonic times of the first and latest change not yet taken by ``wait``
+        self.pending_since: Optional[float] = None
+        self.last_change: Optional[float] = None
+        self.changes = 0
+        
+        self.last_push: Optional[float] = None
+        # Seconds between the last two pushes
+        self.cadence: Optional[float] = None
+    
+    def notify(self, *_: Any):
+        """Report a state change; usable directly as a change listener."""
+        now = time.monotonic()
+        if self.pending_since is None:
+            self.pending_since = now
+        self.last_change = now
+        self.changes += 1
+        self._changed.set()
+    
+    def reset(self):
+        """Return the heartbeat to ``base_interval``, e.g. when a client connects."""
+        self.interval = self.base_interval
+        self._changed.set()
+    
+    async def wait(self) -> Optional[float]:
+        """Wait until a push is due.
+        
+        Returns:
+            Monotonic time of the first change the push covers, or None for a heartbeat
+        """
+        if self.pending_since is None:
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+        
+        # Coalesce the burst until it goes quiet or the budget runs out
+        while self.pending_since is not None:
+            due = min(self.last_change + self.quiet_period, self.pending_since + self.latency_budget)
+            remaining = due - time.monotonic()
+            if remaining <= 0:
+                break
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        
+        # Changes from here on are pending for the next push
+        since, self.pending_since = self.pending_since, None
+        return since
+    
+    def record(self, since: Optional[float], outcome: str):
+        """Record what a wake-up did and adapt the heartbeat.
+        
+        Args:
+            since: Value ``wait`` returned
+            outcome: "pushed", "unchanged", or "skipped" when nobody was listening
+        """
+        DASHBOARD_BROADCASTS.labels("heartbeat" if since is None else "change", outcome).inc()
+        if outcome == "pushed":
+            now = time.monotonic()
+            if self.last_push is not None:
+                self.cadence = now - self.last_push
+                DASHBOARD_BROADCAST_INTERVAL.set(self.cadence)
+            self.last_push = now
+        if since is None:
+            self.interval = min(self.interval * 2, self.idle_interval)
+        else:
+            self.interval = self.base_interval
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cadence settings and current state."""
+        return {
+            "cadence": self.cadence,
+            "heartbeat_interval": self.interval,
+            "quiet_period": self.quiet_period,
+            "latency_budget": self.latency_budget,
+            "base_interval": self.base_interval,
+            "idle_interval": self.idle_interval,
+            "changes": self.changes,
+            "pending": self.pending_since is not None
+        }
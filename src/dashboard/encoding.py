@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard Message Encoding
+JSON, MessagePack and CBOR encodings for websocket messages, negotiated per client.
+"""
+
+import json
+from typing import Dict, Any, List, Optional, Union, Iterable
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+# Websocket subprotocol prefix, e.g. "tiation.msgpack"
+SUBPROTOCOL_PREFIX = "tiation."
+
+
+def _encode_json(payload: Any) -> str:
+    return json.dumps(payload)
+
+
+def _encode_msgpack(payload: Any) -> bytes:
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def _encode_cbor(payload: Any) -> bytes:
+    return cbor2.dumps(payload)
+
+
+_ENCODERS = {"json": _encode_json}
+_DECODERS = {"json": json.loads}
+if msgpack is not None:
+    _ENCODERS["msgpack"] = _encode_msgpack
+    _DECODERS["msgpack"] = lambda data: msgpack.unpackb(data, raw=False)
+if cbor2 is not None:
+    _ENCODERS["cbor"] = _encode_cbor
+    _DECODERS["cbor"] = cbor2.loads
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can produce; JSON is always available."""
+    return list(_ENCODERS)
+
+
+def negotiate(requested: Iterable[str]) -> Optional[str]:
+    """Pick the first requested encoding the server supports.
+    
+    Args:
+        requested: Encodings in the client's order of preference
+    
+    Returns:
+        The chosen encoding, or None if none is supported
+    """
+    for encoding in requested:
+        encoding = encoding.strip().lower()
+        if encoding in _ENCODERS:
+            return encoding
+    return None
+
+
+def decode(encoding: str, data: Union[str, bytes]) -> Any:
+    """Decode an inbound message.
+    
+    Text frames are always JSON; binary frames use the client's encoding.
+    
+    Raises:
+        ValueError: If the message cannot be decoded
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    try:
+        return _DECODERS[encoding](data)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Invalid {encoding} message: {e}") from e
+
+
+class EncodedMessage:
+    """A message encoded at most once per encoding, however many clients receive it.
+    
+    Encoding is lazy, so a tick in which every client speaks JSON never
+    pays for MessagePack or CBOR.
+    """
+    
+    __slots__ = ("payload", "_encoded")
+    
+    def __init__(self, payload: Dict[str, Any]):
+        """Initialize message.
+        
+        Args:
+            payload: JSON-compatible message body
+        """
+        self.payload = payload
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+    
+    def encode(self, encoding: str = "json") -> Union[str, bytes]:
+        """Get the message in an encoding: text for JSON, bytes otherwise."""
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = self._encoded[encoding] = _ENCODERS[encoding](self.payload)
+        return encoded
@@ -5,52 +5,50 @@ Real-time monitoring and control interface for AI agents with dark neon theme.
 """
 
 import asyncio
+import itertools
 import json
+import multiprocessing
+import time
+import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from enum import Enum
+from typing import Dict, List, Optional, Any, AsyncIterator, Iterator, Union
+from dataclasses import dataclass, asdict, field
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, HTTPException, Body, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, PlainTextResponse, StreamingResponse
 from fastapi.requests import Request
+import numpy as np
 import uvicorn
 
-from core.agent_manager import AgentManager
+from core.agent_manager import AgentManager, AGENT_FIELDS, AgentStatus
+from core.agent_snapshot import agent_to_record
 from core.metrics import MetricsCollector
+from core.metrics_exporter import render_metrics, platform_collector
+from core.profiler import ProfilerBusyError, to_collapsed
+from core.task_queue import TaskQueue
+from dashboard.agent_columns import agent_rows, encode_agent_rows
+from dashboard.broadcaster import WebSocketBroadcaster, ClientConnection
+from dashboard.cadence import BroadcastCadence
+from dashboard.encoding import EncodedMessage, decode
+from dashboard.http_responses import (
+    MIN_COMPRESS_SIZE, compress, compress_stream, http_date, negotiate, not_modified
+)
+from dashboard.instrumentation import RequestMetricsMiddleware, TimedRoute
+from dashboard.shared_snapshot import SharedSnapshotWriter, encode_document
+from dashboard.state_sync import VersionedState
+from dashboard.topics import TopicIndex, parse_topic
+from integrations.terminal_workflows import TerminalWorkflowsIntegration
 from utils.logger import setup_logger
 
+# Agents from which /metrics is rendered on a worker thread rather than the loop
+METRICS_THREAD_AGENTS = 1000
 
-class AgentStatus(Enum):
-    """Agent status enumeration."""
-    ACTIVE = "active"
-    IDLE = "idle"
-    ERROR = "error"
-    OFFLINE = "offline"
-
-
-@dataclass
-class AgentMetrics:
-    """Agent performance metrics."""
-    agent_id: str
-    name: str
-    status: AgentStatus
-    cpu_usage: float
-    memory_usage: float
-    tasks_completed: int
-    tasks_failed: int
-    uptime: int
-    last_activity: datetime
-    performance_score: float
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
-        data['status'] = self.status.value
-        data['last_activity'] = self.last_activity.isoformat()
-        return data
+# Fields left out of the websocket state: mock resource figures and uptimes
+# change on every collection and would make each push a delta of every agent
+UNSYNCED_AGENT_FIELDS = frozenset(("cpu_usage", "memory_usage", "uptime"))
+UNSYNCED_SYSTEM_FIELDS = frozenset(("uptime",))
 
 
 @dataclass
@@ -73,25 +71,152 @@ class SystemMetrics:
         return asdict(self)
 
 
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive local time, as agents record activity."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class DashboardSnapshot:
+    """Aggregated system and agent metrics shared by every reader.
+    
+    Agent metrics are kept as columns (see ``agent_columns``); per-agent
+    records are only built for the readers that ask for them.
+    """
+    system: Dict[str, Any]
+    agent_columns: Dict[str, List[Any]]
+    timestamp: str
+    generation: int
+    created_at: float
+    boot_id: str
+    _agents: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+    _body: Optional[bytes] = field(default=None, repr=False)
+    _compressed: Dict[str, bytes] = field(default_factory=dict, repr=False)
+    _last_modified: Optional[float] = field(default=None, repr=False)
+    
+    @property
+    def etag(self) -> str:
+        """Weak entity tag identifying this snapshot, shared by all its content codings."""
+        return f'W/"{self.boot_id}-{self.generation}"'
+    
+    @property
+    def agents(self) -> List[Dict[str, Any]]:
+        """One metrics record per agent, built once per snapshot."""
+        if self._agents is None:
+            self._agents = agent_rows(self.agent_columns)
+        return self._agents
+    
+    @property
+    def last_modified(self) -> float:
+        """Unix time the snapshot was built."""
+        if self._last_modified is None:
+            self._last_modified = time.time() - self.age()
+        return self._last_modified
+    
+    def age(self) -> float:
+        """Seconds since the snapshot was built."""
+        return time.monotonic() - self.created_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the /api/metrics response shape."""
+        return {"system": self.system, "agents": self.agents, "timestamp": self.timestamp}
+    
+    def to_json(self) -> bytes:
+        """Serialized response body, encoded once per snapshot straight from the columns."""
+        if self._body is None:
+            self._body = '{"system": %s, "agents": %s, "timestamp": %s}'.encode() % (
+                json.dumps(self.system).encode(),
+                encode_agent_rows(self.agent_columns).encode(),
+                json.dumps(self.timestamp).encode()
+            )
+        return self._body
+    
+    async def compressed(self, coding: str) -> bytes:
+        """Response body in a content coding, compressed once per snapshot off the event loop."""
+        body = self._compressed.get(coding)
+        if body is None:
+            body = self._compressed[coding] = await asyncio.to_thread(compress, self.to_json(), coding)
+        return body
+
+
 class EnterpriseDashboard:
     """Enterprise dashboard for AI agents monitoring and control."""
     
-    def __init__(self, agent_manager: AgentManager, host: str = "0.0.0.0", port: int = 8080):
+    def __init__(self, agent_manager: AgentManager, host: str = "0.0.0.0", port: int = 8080,
+                 snapshot_max_age: float = 2.0,
+                 workflows: Optional[TerminalWorkflowsIntegration] = None,
+                 workers: int = 0, control_port: Optional[int] = None,
+                 task_queue: Optional[TaskQueue] = None,
+                 broadcast_latency: float = 1.0, idle_interval: float = 60.0,
+                 metrics_interval: float = 2.0):
         """Initialize the enterprise dashboard.
         
         Args:
             agent_manager: Agent manager instance
             host: Dashboard host address
             port: Dashboard port
+            snapshot_max_age: Seconds an aggregated metrics snapshot is served before it is rebuilt
+            workflows: Workflow integration whose executions clients can subscribe to
+            workers: Worker processes serving read-only routes on ``port``; 0
+                serves every route from this process
+            control_port: Port of the full API while workers serve ``port``,
+                defaults to ``port + 1``
+            task_queue: Task queue whose changes trigger pushes to clients
+            broadcast_latency: Maximum seconds from an agent or task change to its push
+            idle_interval: Longest interval between pushes while nothing changes
+            metrics_interval: Seconds between background samples of system metrics
         """
         self.agent_manager = agent_manager
+        self.workflows = workflows
         self.host = host
         self.port = port
+        
+        # Worker processes serve read-only routes from a snapshot published each tick
+        self.workers = workers
+        self.control_port = control_port or port + 1
+        self.shared_snapshot: Optional[SharedSnapshotWriter] = None
+        self.worker_processes: List[multiprocessing.Process] = []
+        self._worker_socket = None
+        self._published_generation = 0
+        self.worker_check_interval = 1.0
+        self._supervisor_task: Optional[asyncio.Task] = None
         self.logger = setup_logger(__name__)
-        self.metrics_collector = MetricsCollector()
+        self.metrics_collector = MetricsCollector(sample_interval=metrics_interval)
+        
+        # One aggregated snapshot per refresh, built by a single task for all readers
+        self.snapshot_max_age = snapshot_max_age
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._snapshot_refresh: Optional[asyncio.Future] = None
+        self._snapshot_generation = 0
+        # Generations and registry versions restart with the process, so entity
+        # tags carry this per-boot nonce to keep old ones from matching new content
+        self.boot_id = uuid.uuid4().hex[:12]
+        
+        # Response bodies at least this large are compressed for clients that accept it
+        self.compress_min_size = MIN_COMPRESS_SIZE
         
-        # WebSocket connections
-        self.connections: List[WebSocket] = []
+        # /api/agents paging
+        self.agents_page_size = 100
+        self.agents_max_page_size = 1000
+        self.agents_stream_chunk = 500
+        
+        # WebSocket clients, each fed from its own bounded queue
+        self.broadcaster = WebSocketBroadcaster(
+            on_connect=self._on_client_connect,
+            on_message=self._on_client_message,
+            on_disconnect=self._on_client_disconnect
+        )
+        
+        # Clients that subscribe to topics get only those topics' updates
+        self.topics = TopicIndex()
+        self._topic_values: Dict[str, Any] = {}
+        
+        # Versioned state clients are kept in sync with by deltas
+        self.state = VersionedState()
+        # Versions a client may fall behind its acknowledgements before it is resynced
+        self.max_unacked_versions = 10
         
         # Initialize FastAPI app
         self.app = FastAPI(
@@ -100,6 +225,10 @@ class EnterpriseDashboard:
             version="1.0.0"
         )
         
+        # Per-route latency, size and error metrics for every HTTP request
+        self.app.router.route_class = TimedRoute
+        self.app.add_middleware(RequestMetricsMiddleware, metrics=self.metrics_collector.requests)
+        
         # Setup routes
         self._setup_routes()
         self._setup_websocket()
@@ -110,9 +239,20 @@ class EnterpriseDashboard:
         
         # Start metrics collection
         self.metrics_task = None
+        
+        # Pushes follow agent and task changes, with a heartbeat that slows while idle
+        self.cadence = BroadcastCadence(latency_budget=broadcast_latency, idle_interval=idle_interval)
+        agent_manager.change_listeners.append(self._on_state_change)
+        if task_queue is not None:
+            task_queue.change_listeners.append(self._on_state_change)
     
     def _setup_routes(self):
         """Setup HTTP routes."""
+        self._setup_read_routes()
+        self._setup_control_routes()
+    
+    def _setup_read_routes(self):
+        """Setup read-only routes, which dashboard worker processes can serve from a snapshot."""
         
         @self.app.get("/", response_class=HTMLResponse)
         async def dashboard_home(request: Request):
@@ -123,33 +263,280 @@ class EnterpriseDashboard:
             })
         
         @self.app.get("/api/metrics")
-        async def get_metrics():
+        async def get_metrics(request: Request):
             """Get current system metrics."""
             try:
-                system_metrics = await self._collect_system_metrics()
-                agent_metrics = await self._collect_agent_metrics()
-                
-                return {
-                    "system": system_metrics.to_dict(),
-                    "agents": [agent.to_dict() for agent in agent_metrics],
-                    "timestamp": datetime.now().isoformat()
-                }
+                snapshot = await self.get_dashboard_snapshot()
             except Exception as e:
                 self.logger.error(f"Error collecting metrics: {e}")
                 raise HTTPException(status_code=500, detail="Internal server error")
+            
+            headers = {
+                "ETag": snapshot.etag,
+                "Last-Modified": http_date(snapshot.last_modified),
+                "Cache-Control": f"max-age={int(self.snapshot_max_age)}",
+                "Age": str(int(snapshot.age())),
+                "Vary": "Accept-Encoding"
+            }
+            if not_modified(request.headers, snapshot.etag, snapshot.last_modified):
+                return Response(status_code=304, headers=headers)
+            
+            body = snapshot.to_json()
+            coding = self._response_coding(request, len(body))
+            if coding:
+                body = await snapshot.compressed(coding)
+                headers["Content-Encoding"] = coding
+            return Response(content=body, media_type="application/json", headers=headers)
+        
+        @self.app.get("/api/websocket/stats")
+        async def get_websocket_stats():
+            """Get dashboard websocket connection and queue statistics."""
+            return {
+                **self.broadcaster.get_stats(),
+                "topics": self.topics.get_stats(),
+                "cadence": self.cadence.get_stats()
+            }
         
         @self.app.get("/api/agents")
-        async def get_agents():
-            """Get all agents information."""
+        async def get_agents(request: Request, status: Optional[str] = None,
+                             agent_type: Optional[str] = Query(None, alias="type"),
+                             capability: Optional[str] = None,
+                             active_since: Optional[datetime] = None,
+                             active_until: Optional[datetime] = None,
+                             cursor: Optional[str] = None, limit: Optional[int] = None,
+                             fields: Optional[str] = None, format: str = "json"):
+            """Get agents in ID order, one page at a time.
+            
+            ``cursor`` is the ID of the last agent already received; the JSON
+            response returns it as ``next_cursor``. ``format=ndjson`` streams one
+            agent per line and is unpaginated unless ``limit`` is given.
+            
+            The entity tag is the registry version, qualified by the boot
+            nonce, so a page that cannot have changed is answered with 304
+            before any agent is read.
+            """
+            if format not in ("json", "ndjson"):
+                raise HTTPException(status_code=400, detail="format must be json or ndjson")
+            
+            etag = f'W/"{self.boot_id}-r{self.agent_manager.version}"'
+            last_modified = self.agent_manager.last_modified
+            headers = {"ETag": etag, "Last-Modified": http_date(last_modified), "Vary": "Accept-Encoding"}
+            if not_modified(request.headers, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+            
+            projection = None
+            if fields:
+                projection = [name.strip() for name in fields.split(",") if name.strip()]
+                unknown = [name for name in projection if name not in AGENT_FIELDS]
+                if unknown:
+                    raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            
+            try:
+                agents = self.agent_manager.iter_agents(
+                    status=AgentStatus(status) if status else None,
+                    agent_type=agent_type,
+                    capability=capability,
+                    active_since=_local_naive(active_since),
+                    active_until=_local_naive(active_until),
+                    after=cursor
+                )
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Unknown status: {status}")
+            
+            if format == "ndjson":
+                if limit is not None:
+                    agents = itertools.islice(agents, max(limit, 0))
+                chunks = self._stream_agents(agents, projection)
+                # The length is unknown up front, so any accepted coding is used
+                coding = self._response_coding(request, self.compress_min_size)
+                if coding:
+                    chunks = compress_stream(chunks, coding)
+                    headers["Content-Encoding"] = coding
+                return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+            
+            limit = min(max(limit or self.agents_page_size, 1), self.agents_max_page_size)
+            page = list(itertools.islice(agents, limit + 1))
+            next_cursor = page[limit - 1].id if len(page) > limit else None
+            body = json.dumps({
+                "agents": [agent.to_dict(projection) for agent in page[:limit]],
+                "count": min(len(page), limit),
+                "next_cursor": next_cursor
+            }).encode()
+            coding = self._response_coding(request, len(body))
+            if coding:
+                body = await asyncio.to_thread(compress, body, coding)
+                headers["Content-Encoding"] = coding
+            return Response(content=body, media_type="application/json", headers=headers)
+    
+    def _setup_control_routes(self):
+        """Setup control and diagnostics routes, which act on this process."""
+        
+        @self.app.get("/api/metrics/history")
+        async def get_metrics_history(series: Optional[str] = None, window: float = 3600,
+                                      start: Optional[float] = None, end: Optional[float] = None,
+                                      resolution: Optional[int] = None, max_points: int = 500):
+            """Get downsampled history for a metric series."""
+            history = self.metrics_collector.history
+            if series is None:
+                return {
+                    "series": history.series_names(),
+                    "store": history.get_stats()
+                }
+            
+            end = end if end is not None else time.time()
+            start = start if start is not None else end - window
+            try:
+                return self.metrics_collector.get_metrics_history(
+                    series, start, end, resolution=resolution, max_points=max_points
+                )
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        
+        @self.app.get("/api/resources")
+        async def get_resources():
+            """Get container CPU and memory limits and a suggested concurrency."""
+            resources = self.metrics_collector.get_resource_limits()
+            resources["suggested_concurrency"] = self.metrics_collector.suggested_concurrency()
+            return resources
+        
+        @self.app.get("/api/anomalies")
+        async def get_anomalies(limit: int = 50):
+            """Get active metric anomalies and recent anomaly events."""
+            return self.metrics_collector.get_anomalies(limit)
+        
+        @self.app.get("/api/diagnostics/loop")
+        async def get_loop_diagnostics(limit: int = 20):
+            """Get event-loop lag percentiles and recent slow callbacks."""
+            return self.metrics_collector.get_loop_metrics(slow_callback_limit=limit)
+        
+        @self.app.get("/api/diagnostics/requests")
+        async def get_request_diagnostics():
+            """Get per-route request counts, latency percentiles, sizes and errors."""
+            return self.metrics_collector.get_request_metrics()
+        
+        @self.app.get("/api/diagnostics/requests/slow")
+        async def get_slow_requests(limit: int = 20, route: Optional[str] = None):
+            """Get recent slow requests with their timing breakdown, optionally for one route template."""
+            return self.metrics_collector.get_slow_requests(limit, route)
+        
+        @self.app.post("/api/diagnostics/profile")
+        async def run_profile(duration: float = 10.0, interval: Optional[float] = None,
+                              format: str = "json"):
+            """Profile the process for a while and return the sampled stacks.
+            
+            ``format=collapsed`` returns flamegraph.pl/speedscope input as text.
+            """
+            try:
+                profile = await self.metrics_collector.profile_cpu(duration, interval)
+            except ProfilerBusyError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            if format == "collapsed":
+                return PlainTextResponse(to_collapsed(profile))
+            return profile
+        
+        @self.app.post("/api/diagnostics/memory/start")
+        async def start_memory_tracing(frames: int = 25):
+            """Start allocation tracing."""
+            try:
+                self.metrics_collector.start_memory_tracing(frames)
+            except (RuntimeError, ValueError) as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            return {"tracing": True, "frames": frames}
+        
+        @self.app.post("/api/diagnostics/memory/stop")
+        async def stop_memory_tracing():
+            """Stop allocation tracing and drop stored snapshots."""
+            self.metrics_collector.stop_memory_tracing()
+            return {"tracing": False}
+        
+        @self.app.get("/api/diagnostics/memory/snapshots")
+        async def list_memory_snapshots():
+            """List stored allocation snapshots."""
+            return {
+                "tracing": self.metrics_collector.memory_tracker.tracing,
+                "snapshots": self.metrics_collector.memory_tracker.list_snapshots()
+            }
+        
+        @self.app.post("/api/diagnostics/memory/snapshots")
+        async def take_memory_snapshot(name: Optional[str] = None):
+            """Take a named allocation snapshot."""
+            try:
+                return await self.metrics_collector.take_memory_snapshot(name)
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+        
+        @self.app.get("/api/diagnostics/memory/top")
+        async def get_memory_top(snapshot: Optional[str] = None, limit: int = 20, group_by: str = "module"):
+            """Top allocation groups in a snapshot, or in current allocations."""
+            try:
+                return await self.metrics_collector.get_memory_top(snapshot, limit, group_by)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+        
+        @self.app.get("/api/diagnostics/memory/diff")
+        async def diff_memory_snapshots(base: str, target: Optional[str] = None, limit: int = 20,
+                                        group_by: str = "module"):
+            """Allocation growth from one snapshot to another, or to now."""
+            try:
+                return await self.metrics_collector.diff_memory_snapshots(base, target, limit, group_by)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+        
+        @self.app.get("/metrics")
+        async def prometheus_metrics(request: Request):
+            """Prometheus/OpenMetrics scrape endpoint."""
+            accept = request.headers.get("accept")
+            if len(self.agent_manager.agents) >= METRICS_THREAD_AGENTS:
+                body, content_type = await asyncio.to_thread(render_metrics, accept)
+            else:
+                body, content_type = render_metrics(accept)
+            return Response(content=body, media_type=content_type)
+        
+        # Registered before the per-agent routes, which would otherwise match "bulk" as an agent ID
+        @self.app.post("/api/agents/bulk/{action}")
+        async def bulk_agent_action(action: str, payload: Dict[str, Any] = Body(...)):
+            """Start, stop or restart many agents at once."""
+            operations = {
+                "start": self.agent_manager.start_agents,
+                "stop": self.agent_manager.stop_agents,
+                "restart": self.agent_manager.restart_agents
+            }
+            if action not in operations:
+                raise HTTPException(status_code=404, detail=f"Unknown bulk action: {action}")
+            
+            agent_ids = payload.get("agent_ids")
+            if agent_ids is None:
+                agent_ids = list(self.agent_manager.agents.keys())
+            
+            options = {"concurrency": payload.get("concurrency")}
+            if action != "start":
+                options["drain"] = payload.get("drain", True)
+                options["drain_timeout"] = payload.get("drain_timeout")
+            
             try:
-                agents = await self.agent_manager.get_all_agents()
+                results = await operations[action](agent_ids, **options)
                 return {
-                    "agents": [agent.to_dict() for agent in agents],
-                    "count": len(agents)
+                    "action": action,
+                    "total": len(results),
+                    "succeeded": sum(1 for result in results if result.success),
+                    "results": [result.to_dict() for result in results]
                 }
             except Exception as e:
-                self.logger.error(f"Error getting agents: {e}")
-                raise HTTPException(status_code=500, detail="Internal server error")
+                self.logger.error(f"Error running bulk {action}: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.post("/api/agents/{agent_id}/start")
         async def start_agent(agent_id: str):
@@ -181,25 +568,35 @@ class EnterpriseDashboard:
                 self.logger.error(f"Error restarting agent {agent_id}: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
     
+    def _response_coding(self, request: Request, size: int) -> Optional[str]:
+        """Content coding for a response body of ``size`` bytes, or None to send it as is."""
+        if size < self.compress_min_size:
+            return None
+        return negotiate(request.headers.get("accept-encoding"))
+    
+    async def _stream_agents(self, agents: Iterator, projection: Optional[List[str]]) -> AsyncIterator[bytes]:
+        """Serialize agents as NDJSON in chunks, yielding to the loop between them."""
+        while True:
+            chunk = [
+                json.dumps(agent.to_dict(projection))
+                for agent in itertools.islice(agents, self.agents_stream_chunk)
+            ]
+            if not chunk:
+                return
+            yield ("\n".join(chunk) + "\n").encode()
+            await asyncio.sleep(0)
+    
     def _setup_websocket(self):
         """Setup WebSocket for real-time updates."""
         
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
-            """WebSocket endpoint for real-time updates."""
-            await websocket.accept()
-            self.connections.append(websocket)
+            """WebSocket endpoint for real-time updates.
             
-            try:
-                while True:
-                    # Keep connection alive
-                    await websocket.receive_text()
-            except WebSocketDisconnect:
-                self.connections.remove(websocket)
-            except Exception as e:
-                self.logger.error(f"WebSocket error: {e}")
-                if websocket in self.connections:
-                    self.connections.remove(websocket)
+            Offer a ``tiation.msgpack`` or ``tiation.cbor`` subprotocol, or pass
+            ``?encoding=msgpack``, to receive binary frames instead of JSON.
+            """
+            await self.broadcaster.serve(websocket)
     
     async def _collect_system_metrics(self) -> SystemMetrics:
         """Collect system-wide metrics."""
@@ -214,7 +611,7 @@ class EnterpriseDashboard:
         # Get system metrics
         system_info = await self.metrics_collector.get_system_metrics()
         
-        return SystemMetrics(
+        system_metrics = SystemMetrics(
             total_agents=len(agents),
             active_agents=active_count,
             idle_agents=idle_count,
@@ -227,77 +624,391 @@ class EnterpriseDashboard:
             memory_usage=system_info.get('memory_percent', 0),
             uptime=system_info.get('uptime', 0)
         )
+        
+        self.metrics_collector.record_history({
+            "total_agents": system_metrics.total_agents,
+            "active_agents": system_metrics.active_agents,
+            "error_agents": system_metrics.error_agents,
+            "completed_tasks": system_metrics.completed_tasks,
+            "failed_tasks": system_metrics.failed_tasks
+        })
+        
+        return system_metrics
     
-    async def _collect_agent_metrics(self) -> List[AgentMetrics]:
-        """Collect metrics for all agents."""
-        agents = await self.agent_manager.get_all_agents()
-        metrics = []
+    async def _collect_agent_metrics(self) -> Dict[str, List[Any]]:
+        """Collect metrics for all agents as columns, in one call per source.
         
-        for agent in agents:
-            agent_metrics = await self.metrics_collector.get_agent_metrics(agent.id)
-            
-            metrics.append(AgentMetrics(
-                agent_id=agent.id,
-                name=agent.name,
-                status=agent.status,
-                cpu_usage=agent_metrics.get('cpu_usage', 0),
-                memory_usage=agent_metrics.get('memory_usage', 0),
-                tasks_completed=agent_metrics.get('tasks_completed', 0),
-                tasks_failed=agent_metrics.get('tasks_failed', 0),
-                uptime=agent_metrics.get('uptime', 0),
-                last_activity=agent_metrics.get('last_activity', datetime.now()),
-                performance_score=agent_metrics.get('performance_score', 0)
-            ))
+        Task counts, uptime and score come from the agent manager, resource
+        usage from the metrics collector.
         
-        return metrics
+        Returns:
+            Columns in ``AGENT_METRIC_COLUMNS`` order
+        """
+        agents = await self.agent_manager.get_agents_metrics()
+        resources = await self.metrics_collector.get_agents_metrics(agents["agent_id"])
+        
+        return {
+            "agent_id": agents["agent_id"],
+            "name": agents["name"],
+            "status": agents["status"],
+            "cpu_usage": resources["cpu_usage"].tolist(),
+            "memory_usage": resources["memory_usage"].tolist(),
+            "tasks_completed": agents["tasks_completed"].tolist(),
+            "tasks_failed": agents["tasks_failed"].tolist(),
+            "uptime": agents["uptime"].astype(np.int64).tolist(),
+            "last_activity": agents["last_activity"],
+            "performance_score": agents["performance_score"].tolist()
+        }
     
-    async def broadcast_metrics(self):
-        """Broadcast metrics to all connected WebSocket clients."""
-        if not self.connections:
-            return
+    async def get_dashboard_snapshot(self, changed_since: Optional[float] = None) -> DashboardSnapshot:
+        """Get aggregated metrics no older than ``snapshot_max_age``.
+        
+        Concurrent callers that find the snapshot stale share one rebuild
+        instead of each collecting every agent's metrics.
+        
+        Args:
+            changed_since: time.monotonic() of a known change; a snapshot taken
+                before it is stale whatever its age
+        
+        Returns:
+            The current snapshot
+        """
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot.age() < self.snapshot_max_age
+                and (changed_since is None or snapshot.created_at >= changed_since)):
+            return snapshot
         
+        if self._snapshot_refresh is None:
+            self._snapshot_refresh = asyncio.ensure_future(self._refresh_snapshot())
+        # Shielded so a cancelled request does not cancel the rebuild other readers wait on
+        return await asyncio.shield(self._snapshot_refresh)
+    
+    async def _refresh_snapshot(self) -> DashboardSnapshot:
+        """Collect metrics and publish them as the current snapshot."""
         try:
             system_metrics = await self._collect_system_metrics()
             agent_metrics = await self._collect_agent_metrics()
             
-            data = {
-                "type": "metrics_update",
-                "data": {
-                    "system": system_metrics.to_dict(),
-                    "agents": [agent.to_dict() for agent in agent_metrics],
-                    "timestamp": datetime.now().isoformat()
-                }
-            }
+            self._snapshot_generation += 1
+            self._snapshot = DashboardSnapshot(
+                system=system_metrics.to_dict(),
+                agent_columns=agent_metrics,
+                timestamp=datetime.now().isoformat(),
+                generation=self._snapshot_generation,
+                created_at=time.monotonic(),
+                boot_id=self.boot_id
+            )
+            return self._snapshot
+        finally:
+            self._snapshot_refresh = None
+    
+    async def broadcast_metrics(self, changed_since: Optional[float] = None) -> bool:
+        """Send connected WebSocket clients what changed since the last update.
+        
+        Clients without subscriptions follow the whole state: each that holds
+        the previous version gets a delta, and one that missed versions or
+        stopped acknowledging them gets a snapshot. Subscribed clients get
+        only the updates of their topics.
+        
+        Args:
+            changed_since: See ``get_dashboard_snapshot``
+        
+        Returns:
+            True if the state changed
+        """
+        if not self.broadcaster.clients:
+            return False
+        
+        try:
+            snapshot = await self.get_dashboard_snapshot(changed_since)
             
-            # Send to all connected clients
-            disconnected = []
-            for connection in self.connections:
-                try:
-                    await connection.send_text(json.dumps(data))
-                except Exception as e:
-                    self.logger.error(f"Error sending to WebSocket: {e}")
-                    disconnected.append(connection)
+            ops = self.state.update(*self._synced_state(snapshot))
+            if ops:
+                self._send_state(ops)
+            if self.topics or self._topic_values:
+                self._publish_topics()
+            return bool(ops)
             
-            # Remove disconnected clients
-            for connection in disconnected:
-                self.connections.remove(connection)
-                
         except Exception as e:
             self.logger.error(f"Error broadcasting metrics: {e}")
+            return False
+    
+    def _synced_state(self, snapshot: DashboardSnapshot):
+        """System and agent fields clients are kept in sync with.
+        
+        Fields that change on every collection are dropped; creation times
+        are sent instead of uptimes, so clients can work the uptime out.
+        
+        Returns:
+            System fields and per-agent fields keyed by agent ID
+        """
+        system = {
+            key: value for key, value in snapshot.system.items() if key not in UNSYNCED_SYSTEM_FIELDS
+        }
+        system["created_at"] = datetime.fromtimestamp(self.metrics_collector.start_time).isoformat()
+        
+        managed = self.agent_manager.agents
+        agents = {}
+        for record in snapshot.agents:
+            agent_id = record["agent_id"]
+            fields = {key: value for key, value in record.items() if key not in UNSYNCED_AGENT_FIELDS}
+            agent = managed.get(agent_id)
+            fields["created_at"] = agent.created_at.isoformat() if agent is not None else None
+            agents[agent_id] = fields
+        return system, agents
+    
+    def _send_state(self, ops: List[Dict[str, Any]]):
+        """Send the latest state change to clients following the whole state."""
+        # Serialize once; each client's writer task does the sending
+        version = self.state.version
+        delta = self.state.delta_message(ops)
+        for client in list(self.broadcaster.clients.values()):
+            if self.topics.topics_of(client):
+                continue
+            if client.synced_version == version - 1 and not self._is_lagging(client):
+                if self.broadcaster.send(client, delta, fallback=self.state.snapshot_message):
+                    client.synced_version = version
+            else:
+                self._resync(client)
+    
+    def _publish_topics(self):
+        """Send each subscribed topic that changed to its subscribers."""
+        # Agent topics follow the agents the state update just changed;
+        # a removed agent is published as None
+        by_type: Dict[str, Dict[str, Any]] = {}
+        for agent_id in self.state.changed_agents:
+            record = self.state.agents.get(agent_id)
+            topic = f"agent:{agent_id}"
+            if topic in self.topics:
+                self._publish(topic, record)
+            agent = self.agent_manager.agents.get(agent_id)
+            if agent is not None and f"agent_type:{agent.type}" in self.topics:
+                by_type.setdefault(agent.type, {})[agent_id] = record
+        for agent_type, changed in by_type.items():
+            self._publish(f"agent_type:{agent_type}", {"agents": changed})
+        
+        # Queue and workflow topics are polled, and sent when they differ from the last send
+        for topic in self.topics.topics("queue") + self.topics.topics("workflow"):
+            data = self._topic_data(topic)
+            if self._topic_values.get(topic) != data:
+                self._topic_values[topic] = data
+                self._publish(topic, data)
+        for topic in [topic for topic in self._topic_values if topic not in self.topics]:
+            del self._topic_values[topic]
+    
+    def _publish(self, topic: str, data: Any):
+        """Build a topic update once and queue it for the topic's subscribers."""
+        message = EncodedMessage({
+            "type": "update",
+            "topic": topic,
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        })
+        for client in list(self.topics.subscribers(topic)):
+            self.broadcaster.send(client, message, fallback=lambda client=client: self._topic_snapshot(client))
+    
+    def _topic_data(self, topic: str) -> Any:
+        """Current data of a topic."""
+        kind, key = parse_topic(topic)
+        if kind == "agent":
+            return self.state.agents.get(key)
+        if kind == "agent_type":
+            agents = self.agent_manager.agents
+            return {"agents": {
+                agent_id: record for agent_id, record in self.state.agents.items()
+                if agent_id in agents and agents[agent_id].type == key
+            }}
+        if kind == "queue":
+            return platform_collector.get_task_queue_depths()
+        execution = self.workflows.get_execution(key) if self.workflows else None
+        return execution.to_dict() if execution else None
+    
+    def _topic_snapshot(self, client: ClientConnection, topics: Optional[List[str]] = None) -> EncodedMessage:
+        """Current data of a client's topics.
+        
+        Sent on subscription, and in place of updates a slow client's queue dropped.
+        """
+        topics = topics if topics is not None else sorted(self.topics.topics_of(client))
+        return EncodedMessage({
+            "type": "topic_snapshot",
+            "timestamp": datetime.now().isoformat(),
+            "topics": {topic: self._topic_data(topic) for topic in topics}
+        })
+    
+    def _update_subscriptions(self, client: ClientConnection, request: Dict[str, Any]):
+        """Apply a ``subscribe`` or ``unsubscribe`` request."""
+        topics = request.get("topics")
+        if isinstance(topics, str):
+            topics = [topics]
+        if not isinstance(topics, list):
+            self.broadcaster.send(client, EncodedMessage({"type": "error", "error": "topics must be a list"}))
+            return
+        
+        was_subscribed = bool(self.topics.topics_of(client))
+        try:
+            if request["type"] == "subscribe":
+                added = self.topics.subscribe(client, topics)
+            else:
+                self.topics.unsubscribe(client, topics)
+                added = []
+        except ValueError as e:
+            self.broadcaster.send(client, EncodedMessage({"type": "error", "error": str(e)}))
+            return
+        
+        current = sorted(self.topics.topics_of(client))
+        if was_subscribed and not current and self.state.version > 0:
+            # Back on the whole-state stream, which needs a fresh base
+            self._resync(client)
+        self.broadcaster.send(client, EncodedMessage({"type": "subscriptions", "topics": current}))
+        if added:
+            self.broadcaster.send(client, self._topic_snapshot(client, added))
+    
+    def _is_lagging(self, client: ClientConnection) -> bool:
+        """Whether a client has acknowledged too few of the versions sent to it."""
+        return (
+            client.acked_version is not None
+            and self.state.version - client.acked_version > self.max_unacked_versions
+        )
+    
+    def _resync(self, client: ClientConnection):
+        """Replace whatever is queued for a client with a snapshot of the current state."""
+        if self.broadcaster.replace(client, self.state.snapshot_message()):
+            client.synced_version = self.state.version
+            client.acked_version = None
+    
+    def _on_client_connect(self, client: ClientConnection):
+        """Give a new client the current state to apply deltas to."""
+        if self.state.version > 0:
+            self._resync(client)
+        if len(self.broadcaster.clients) == 1:
+            # The loop backed off while nobody was listening
+            self.cadence.reset()
+    
+    def _on_client_message(self, client: ClientConnection, message: Union[str, bytes]):
+        """Handle ``ack``, ``resync``, ``subscribe`` and ``unsubscribe`` requests from a client.
+        
+        ``pong`` needs no handling: the broadcaster already counted it as activity.
+        """
+        try:
+            request = decode(client.encoding, message)
+        except ValueError:
+            return
+        if not isinstance(request, dict):
+            return
+        
+        if request.get("type") == "ack" and isinstance(request.get("version"), int):
+            client.acked_version = request["version"]
+        elif request.get("type") == "resync":
+            if self.topics.topics_of(client):
+                self.broadcaster.replace(client, self._topic_snapshot(client))
+            elif self.state.version > 0:
+                self._resync(client)
+        elif request.get("type") in ("subscribe", "unsubscribe"):
+            self._update_subscriptions(client, request)
+    
+    def _on_client_disconnect(self, client: ClientConnection):
+        """Drop a departing client's subscriptions."""
+        self.topics.remove(client)
+    
+    def _on_state_change(self, *_: Any):
+        """Schedule a push for an agent or task change, if anyone is listening."""
+        if self.broadcaster.clients or self.shared_snapshot:
+            self.cadence.notify()
     
     async def _metrics_loop(self):
-        """Continuous metrics collection and broadcasting."""
+        """Metrics collection and broadcasting, on the cadence's schedule."""
         while True:
             try:
-                await self.broadcast_metrics()
-                await asyncio.sleep(5)  # Update every 5 seconds
+                changed_since = await self.cadence.wait()
+                if self.shared_snapshot:
+                    await self._publish_shared_snapshot(changed_since)
+                elif not self.broadcaster.clients:
+                    self.cadence.record(changed_since, "skipped")
+                    continue
+                changed = await self.broadcast_metrics(changed_since)
+                self.cadence.record(changed_since, "pushed" if changed else "unchanged")
             except Exception as e:
                 self.logger.error(f"Error in metrics loop: {e}")
                 await asyncio.sleep(10)  # Wait longer on error
     
+    async def _start_workers(self):
+        """Bind the public port and start the worker processes serving it."""
+        self.shared_snapshot = SharedSnapshotWriter()
+        # Published before any worker runs; the metrics loop only publishes on its first tick
+        await self._publish_shared_snapshot()
+        self._worker_socket = uvicorn.Config(self.app, host=self.host, port=self.port).bind_socket()
+        self.worker_processes = [self._spawn_worker(index) for index in range(self.workers)]
+        self._supervisor_task = asyncio.create_task(self._supervise_workers())
+    
+    def _spawn_worker(self, index: int) -> multiprocessing.Process:
+        """Start one worker process on the shared socket."""
+        # Imported here; the worker module builds on this one
+        from dashboard.workers import run_worker
+        
+        # Spawned, not forked, so workers do not inherit this process's event loop and threads
+        process = multiprocessing.get_context("spawn").Process(
+            target=run_worker,
+            args=(self.shared_snapshot.path, self._worker_socket, self.host, self.port),
+            name=f"dashboard-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return process
+    
+    async def _supervise_workers(self):
+        """Replace worker processes that exited."""
+        while True:
+            await asyncio.sleep(self.worker_check_interval)
+            for index, process in enumerate(self.worker_processes):
+                if not process.is_alive():
+                    self.logger.warning(f"Dashboard worker {process.name} exited with {process.exitcode}, restarting")
+                    self.worker_processes[index] = self._spawn_worker(index)
+    
+    async def _publish_shared_snapshot(self, changed_since: Optional[float] = None):
+        """Publish the current snapshot and agent registry for worker processes."""
+        snapshot = await self.get_dashboard_snapshot(changed_since)
+        if snapshot.generation == self._published_generation:
+            return
+        
+        # Only the agent list is copied on the loop; records are captured and encoded off it
+        agents = list(self.agent_manager.agents.values())
+        document = {
+            "system": snapshot.system,
+            "agent_columns": snapshot.agent_columns,
+            "timestamp": snapshot.timestamp,
+            "boot_id": self.boot_id,
+            "registry_version": self.agent_manager.version,
+            "registry_modified": self.agent_manager.last_modified,
+            "queue": platform_collector.get_task_queue_depths(),
+            "workflows": {
+                execution.execution_id: execution.to_dict()
+                for execution in self.workflows.list_executions()
+            } if self.workflows else {}
+        }
+        payload = await asyncio.to_thread(self._encode_shared_snapshot, document, agents)
+        self.shared_snapshot.publish(snapshot.generation, payload, snapshot.created_at)
+        self._published_generation = snapshot.generation
+    
+    @staticmethod
+    def _encode_shared_snapshot(document: Dict[str, Any], agents: List[Any]) -> bytes:
+        """Capture agent records and encode the shared snapshot, on a worker thread."""
+        return encode_document(document, [agent_to_record(agent) for agent in agents])
+    
     async def start(self):
         """Start the dashboard server."""
-        self.logger.info(f"Starting Enterprise Dashboard on {self.host}:{self.port}")
+        port = self.port
+        if self.workers:
+            await self._start_workers()
+            port = self.control_port
+            self.logger.info(
+                f"Serving read-only routes from {self.workers} worker processes on {self.host}:{self.port}"
+            )
+        self.logger.info(f"Starting Enterprise Dashboard on {self.host}:{port}")
+        
+        # Watch the serving loop for stalls
+        self.metrics_collector.start_loop_monitor()
+        
+        self.broadcaster.start()
         
         # Start metrics collection task
         self.metrics_task = asyncio.create_task(self._metrics_loop())
@@ -306,7 +1017,7 @@ class EnterpriseDashboard:
         config = uvicorn.Config(
             self.app,
             host=self.host,
-            port=self.port,
+            port=port,
             log_level="info"
         )
         server = uvicorn.Server(config)
@@ -317,6 +1028,27 @@ class EnterpriseDashboard:
         if self.metrics_task:
             self.metrics_task.cancel()
         
+        await self.broadcaster.stop()
+        self.metrics_collector.stop_sampler()
+        self.metrics_collector.stop_loop_monitor()
+        
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            self._supervisor_task = None
+        if self.worker_processes:
+            for process in self.worker_processes:
+                process.terminate()
+            await asyncio.gather(*(
+                asyncio.to_thread(process.join, 5) for process in self.worker_processes
+            ))
+            self.worker_processes = []
+        if self._worker_socket:
+            self._worker_socket.close()
+            self._worker_socket = None
+        if self.shared_snapshot:
+            self.shared_snapshot.close()
+            self.shared_snapshot = None
+        
         self.logger.info("Enterprise Dashboard stopped")
 
 
@@ -328,7 +1060,14 @@ if __name__ == "__main__":
         
         config = Config()
         agent_manager = AgentManager(config)
-        dashboard = EnterpriseDashboard(agent_manager)
+        dashboard = EnterpriseDashboard(
+            agent_manager,
+            workers=config.dashboard_workers,
+            control_port=config.dashboard_control_port or None,
+            broadcast_latency=config.dashboard_broadcast_latency,
+            idle_interval=config.dashboard_idle_interval,
+            metrics_interval=config.metrics_sample_interval
+        )
         
         await dashboard.start()
     
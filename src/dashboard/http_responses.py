@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard HTTP Responses
+Content-coding negotiation, response compression and conditional request helpers.
+"""
+
+import gzip
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, AsyncIterator
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies smaller than this are sent as is; compressing them saves less than it costs
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Preferred first when the client weights them equally
+_CODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def available_codings() -> List[str]:
+    """Content codings this server can produce."""
+    return list(_CODINGS)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick a content coding from an Accept-Encoding header.
+    
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+    
+    Returns:
+        "br" or "gzip", or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+    
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for coding in _CODINGS:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """Compress a whole body."""
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+async def compress_stream(chunks: AsyncIterator[bytes], coding: str) -> AsyncIterator[bytes]:
+    """Compress a streamed body, flushing after each chunk so clients can decode as it arrives."""
+    if coding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        async for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an entity tag, compared weakly.
+    
+    Every content coding of a resource shares its entity tag, which is
+    therefore weak; responses carry ``Vary: Accept-Encoding`` as well.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == etag for tag in if_none_match.split(","))
+
+
+def _opaque_tag(tag: str) -> str:
+    """An entity tag without its weakness indicator, for weak comparison."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def http_date(timestamp: float) -> str:
+    """Format a Unix time for Last-Modified."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def not_modified(headers, etag: str, last_modified: Optional[float] = None) -> bool:
+    """Evaluate a request's If-None-Match, or If-Modified-Since when it has none.
+    
+    Args:
+        headers: Request headers
+        etag: Current entity tag of the resource
+        last_modified: Unix time of the resource's last change
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard Request Instrumentation
+ASGI middleware and a route class that time each request phase by route.
+"""
+
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+from core.request_metrics import RequestMetrics, RequestTiming
+
+# The request being served by the current task, set by the middleware
+_current_request: ContextVar[Optional[Tuple[RequestTiming, RequestMetrics]]] = ContextVar(
+    "current_request", default=None
+)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware recording every HTTP request in a RequestMetrics.
+    
+    Unlike BaseHTTPMiddleware it adds no task or body copy per request; it
+    only wraps ``send`` to see the status, the body size and when the
+    response started and ended. Websocket and lifespan scopes pass through.
+    """
+    
+    def __init__(self, app, metrics: RequestMetrics):
+        """Initialize middleware.
+        
+        Args:
+            app: ASGI application to wrap
+            metrics: Where requests are recorded
+        """
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = self.metrics
+        timing = RequestTiming(scope["method"], scope["path"])
+        metrics.started(timing)
+        token = _current_request.set((timing, metrics))
+        
+        async def timed_send(message):
+            kind = message["type"]
+            if kind == "http.response.start":
+                timing.status = message["status"]
+                timing.response_started = time.perf_counter()
+            elif kind == "http.response.body":
+                timing.size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await send(message)
+                    timing.finished = time.perf_counter()
+                    return
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, timed_send)
+        except BaseException as e:
+            timing.error = type(e).__name__
+            raise
+        finally:
+            _current_request.reset(token)
+            if timing.finished is None:
+                timing.finished = time.perf_counter()
+            metrics.finished(timing)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """Wrap a route function to record when it starts and returns."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            current = _current_request.get()
+            if current is None:
+                return await endpoint(*args, **kwargs)
+            timing = current[0]
+            timing.endpoint_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timing.endpoint_finished = time.perf_counter()
+    else:
+        # Runs in the threadpool, which copies the request's context
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            current = _current_request.get()
+            if current is None:
+                return endpoint(*args, **kwargs)
+            timing = current[0]
+            timing.endpoint_started = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                timing.endpoint_finished = time.perf_counter()
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that labels requests with its path template and times its endpoint.
+    
+    Set as the router's ``route_class`` before routes are added; requests are
+    only recorded when RequestMetricsMiddleware is installed.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+        
+        async def timed_handler(request):
+            current = _current_request.get()
+            if current is not None:
+                timing, metrics = current
+                timing.route = route
+                timing.handler_started = time.perf_counter()
+                metrics.route_started(timing)
+            return await handler(request)
+        
+        return timed_handler
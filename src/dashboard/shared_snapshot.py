@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Shared Dashboard Snapshot
+Single-writer, many-reader snapshot in a memory-mapped file for dashboard workers.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from core.agent_snapshot import AgentRecord, encode_columns, decode_columns, safe_loads
+
+
+MAGIC = b"TIASNAP1"
+
+# Header: magic and sequence, then the fields describing the payload. The
+# sequence is its own store, written after the fields when a publish ends.
+PREFIX = struct.Struct("<8sQ")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 8
+# generation, payload length, publish time (time.monotonic)
+FIELDS = struct.Struct("<QQd")
+HEADER_SIZE = PREFIX.size + FIELDS.size
+
+# tmpfs, so the mapping never touches disk
+SHM_DIR = "/dev/shm"
+
+
+def default_snapshot_path() -> str:
+    """Snapshot path for this process, in shared memory where available."""
+    directory = SHM_DIR if os.path.isdir(SHM_DIR) else tempfile.gettempdir()
+    return os.path.join(directory, f"tiation-dashboard-{os.getpid()}.snapshot")
+
+
+def encode_document(document: Dict[str, Any], records: List[AgentRecord]) -> bytes:
+    """Encode a dashboard snapshot and the agent registry into one payload.
+    
+    Args:
+        document: Builtin containers and scalars only
+        records: Records of every agent in the registry
+    """
+    return pickle.dumps({**document, "registry": encode_columns(records)}, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_document(payload: bytes) -> Tuple[Dict[str, Any], List[AgentRecord]]:
+    """Decode a payload written by ``encode_document``, refusing anything but builtins."""
+    document = safe_loads(payload)
+    return document, decode_columns(document.pop("registry"))
+
+
+class SharedSnapshotWriter:
+    """Publishes snapshots for reader processes through a seqlock.
+    
+    The header's sequence number is odd while a payload is being written
+    and even once it is complete; readers retry until they see the same
+    even sequence before and after copying. The payload and the fields
+    describing it are written before the sequence turns even, each as a
+    separate store, so a reader never pairs a complete sequence with the
+    half-written header of a publish in progress. The file grows, never
+    shrinks, when a payload outgrows it.
+    """
+    
+    def __init__(self, path: Optional[str] = None, initial_size: int = 1 << 20):
+        """Initialize writer, creating or truncating the file.
+        
+        Args:
+            path: Snapshot file path, defaults to one under /dev/shm
+            initial_size: Initial file size in bytes
+        """
+        self.path = path or default_snapshot_path()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        size = max(initial_size, HEADER_SIZE)
+        os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+        self._sequence = 0
+        PREFIX.pack_into(self._mm, 0, MAGIC, self._sequence)
+        FIELDS.pack_into(self._mm, PREFIX.size, 0, 0, 0.0)
+    
+    def _write_sequence(self):
+        SEQUENCE.pack_into(self._mm, SEQUENCE_OFFSET, self._sequence)
+    
+    def publish(self, generation: int, payload: bytes, published_at: Optional[float] = None):
+        """Replace the published snapshot.
+        
+        Args:
+            generation: Snapshot generation; readers skip generations they already hold
+            payload: Encoded snapshot
+            published_at: time.monotonic() at which the snapshot was taken
+        """
+        needed = HEADER_SIZE + len(payload)
+        if needed > len(self._mm):
+            size = 1 << (needed - 1).bit_length()
+            os.ftruncate(self._fd, size)
+            self._mm.resize(size)
+        
+        self._sequence += 1
+        self._write_sequence()
+        self._mm[HEADER_SIZE:needed] = payload
+        FIELDS.pack_into(self._mm, PREFIX.size, generation, len(payload),
+                         time.monotonic() if published_at is None else published_at)
+        # Last, so the fields and payload are complete once the sequence is even
+        self._sequence += 1
+        self._write_sequence()
+    
+    def close(self, unlink: bool = True):
+        """Unmap and close the file, removing it by default."""
+        self._mm.close()
+        os.close(self._fd)
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class SharedSnapshotReader:
+    """Reads snapshots published by a SharedSnapshotWriter in another process."""
+    
+    def __init__(self, path: str, retries: int = 1000):
+        """Initialize reader.
+        
+        Args:
+            path: Snapshot file path
+            retries: Attempts before giving up on a read racing the writer
+        """
+        self.path = path
+        self.retries = retries
+        self._fd = os.open(path, os.O_RDONLY)
+        self._mm = self._map()
+    
+    def _map(self) -> mmap.mmap:
+        return mmap.mmap(self._fd, os.fstat(self._fd).st_size, prot=mmap.PROT_READ)
+    
+    def generation(self) -> int:
+        """Generation of the published snapshot; 0 if nothing is published yet."""
+        return FIELDS.unpack_from(self._mm, PREFIX.size)[0]
+    
+    def read(self) -> Optional[Tuple[int, float, bytes]]:
+        """Copy out the published snapshot.
+        
+        Returns:
+            (generation, published_at, payload), or None if nothing is published
+        
+        Raises:
+            ValueError: If the file is not a snapshot
+            TimeoutError: If the writer kept the snapshot busy for every retry
+        """
+        for _ in range(self.retries):
+            magic, sequence = PREFIX.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a dashboard snapshot")
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            generation, length, published_at = FIELDS.unpack_from(self._mm, PREFIX.size)
+            if generation == 0:
+                return None
+            if length == 0:
+                # Fields torn by a publish that started after the sequence was read
+                time.sleep(0)
+                continue
+            end = HEADER_SIZE + length
+            if end > len(self._mm):
+                # The writer grew the file since it was mapped
+                self._mm.close()
+                self._mm = self._map()
+                continue
+            payload = self._mm[HEADER_SIZE:end]
+            if SEQUENCE.unpack_from(self._mm, SEQUENCE_OFFSET)[0] == sequence:
+                return generation, published_at, payload
+        raise TimeoutError(f"Snapshot at {self.path} stayed busy for {self.retries} attempts")
+    
+    def close(self):
+        """Unmap and close the file."""
+        self._mm.close()
+        os.close(self._fd)
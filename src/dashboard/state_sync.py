@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard State Sync
+Versioned dashboard state with JSON-patch-style deltas between versions.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+from dashboard.encoding import EncodedMessage
+
+
+def escape_pointer(token: str) -> str:
+    """Escape a JSON pointer reference token (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def diff_fields(path: str, old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """JSON-patch operations turning one flat object into another.
+    
+    Args:
+        path: JSON pointer of the object
+        old: Previous object
+        new: Current object
+    
+    Returns:
+        add/replace/remove operations, one per changed field
+    """
+    ops = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append({"op": "add", "path": f"{path}/{escape_pointer(key)}", "value": value})
+        elif old[key] != value:
+            ops.append({"op": "replace", "path": f"{path}/{escape_pointer(key)}", "value": value})
+    for key in old.keys() - new.keys():
+        ops.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+    return ops
+
+
+class VersionedState:
+    """Dashboard state with a version that increments on every change.
+    
+    The state is ``{"system": {...}, "agents": {agent_id: {...}}}``. Each
+    ``update`` diffs the new values against the current ones and, if
+    anything changed, bumps the version and returns the operations that
+    turn version N-1 into N. Agents are diffed field by field, so an agent
+    whose status flipped costs one operation, not a full record.
+    
+    Messages are built at most once per version, and each encoding of
+    them is shared by every client.
+    """
+    
+    def __init__(self):
+        """Initialize versioned state."""
+        self.version = 0
+        self.system: Dict[str, Any] = {}
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[str] = None
+        # Agents added, changed or removed by the latest update
+        self.changed_agents: Set[str] = set()
+        self._snapshot: Optional[EncodedMessage] = None
+        self._snapshot_version = -1
+    
+    def update(self, system: Dict[str, Any], agents: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replace the state, returning the operations from the old state.
+        
+        Args:
+            system: System-wide fields
+            agents: Per-agent fields keyed by agent ID
+        
+        Returns:
+            Patch operations; empty if nothing changed and the version is unchanged
+        """
+        ops = diff_fields("/system", self.system, system)
+        
+        previous_agents = self.agents
+        changed = set()
+        for agent_id, fields in agents.items():
+            old = previous_agents.get(agent_id)
+            if old is None:
+                ops.append({"op": "add", "path": f"/agents/{escape_pointer(agent_id)}", "value": fields})
+                changed.add(agent_id)
+            elif old != fields:
+                ops.extend(diff_fields(f"/agents/{escape_pointer(agent_id)}", old, fields))
+                changed.add(agent_id)
+        for agent_id in previous_agents.keys() - agents.keys():
+            ops.append({"op": "remove", "path": f"/agents/{escape_pointer(agent_id)}"})
+            changed.add(agent_id)
+        self.changed_agents = changed
+        
+        if ops:
+            self.version += 1
+            self.system = system
+            self.agents = agents
+            self.updated_at = datetime.now().isoformat()
+        return ops
+    
+    def snapshot_message(self) -> EncodedMessage:
+        """Full-state message for the current version."""
+        if self._snapshot_version != self.version:
+            self._snapshot = EncodedMessage({
+                "type": "snapshot",
+                "version": self.version,
+                "timestamp": self.updated_at,
+                "data": {"system": self.system, "agents": self.agents}
+            })
+            self._snapshot_version = self.version
+        return self._snapshot
+    
+    def delta_message(self, ops: List[Dict[str, Any]]) -> EncodedMessage:
+        """Delta from the previous version to the current one.
+        
+        Args:
+            ops: Operations returned by the ``update`` that produced this version
+        """
+        return EncodedMessage({
+            "type": "delta",
+            "version": self.version,
+            "base_version": self.version - 1,
+            "timestamp": self.updated_at,
+            "ops": ops
+        })
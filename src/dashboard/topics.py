@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard Topics
+Topic subscriptions for websocket clients and the index that routes updates.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Set, Tuple, Hashable
+
+
+# Topic kinds; all but "queue" take a key, e.g. "agent:<agent_id>"
+TOPIC_KINDS = ("agent", "agent_type", "queue", "workflow")
+
+MAX_SUBSCRIPTIONS = 256
+
+
+def parse_topic(topic: Any) -> Tuple[str, str]:
+    """Split a topic into its kind and key.
+    
+    Args:
+        topic: Topic such as "agent:<id>", "agent_type:<type>", "queue" or "workflow:<execution_id>"
+    
+    Returns:
+        (kind, key); the key is empty for "queue"
+    
+    Raises:
+        ValueError: If the topic is malformed or of an unknown kind
+    """
+    if not isinstance(topic, str):
+        raise ValueError(f"Invalid topic: {topic!r}")
+    kind, _, key = topic.partition(":")
+    if kind not in TOPIC_KINDS:
+        raise ValueError(f"Unknown topic kind: {kind}")
+    if (kind == "queue") != (key == ""):
+        raise ValueError(f"Invalid topic: {topic}")
+    return kind, key
+
+
+class TopicIndex:
+    """Two-way index between subscribers and topics.
+    
+    Routing an update costs one lookup of its topic, however many clients
+    are connected; topics nobody subscribes to cost nothing.
+    """
+    
+    def __init__(self, max_subscriptions: int = MAX_SUBSCRIPTIONS):
+        """Initialize topic index.
+        
+        Args:
+            max_subscriptions: Maximum topics per subscriber
+        """
+        self.max_subscriptions = max_subscriptions
+        self._subscribers: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._topics: Dict[Hashable, Set[str]] = {}
+    
+    def subscribe(self, subscriber: Hashable, topics: List[str]) -> List[str]:
+        """Add subscriptions.
+        
+        Args:
+            subscriber: Subscribing client
+            topics: Topics to add
+        
+        Returns:
+            The topics that were not already subscribed
+        
+        Raises:
+            ValueError: If a topic is invalid or the subscription limit would be exceeded
+        """
+        for topic in topics:
+            parse_topic(topic)
+        current = self._topics.get(subscriber, set())
+        added = [topic for topic in dict.fromkeys(topics) if topic not in current]
+        if len(current) + len(added) > self.max_subscriptions:
+            raise ValueError(f"At most {self.max_subscriptions} subscriptions per client")
+        
+        if added:
+            self._topics.setdefault(subscriber, set()).update(added)
+            for topic in added:
+                self._subscribers[topic].add(subscriber)
+        return added
+    
+    def unsubscribe(self, subscriber: Hashable, topics: List[str]):
+        """Remove subscriptions; unknown topics are ignored."""
+        current = self._topics.get(subscriber)
+        if not current:
+            return
+        for topic in topics:
+            if topic in current:
+                current.discard(topic)
+                self._discard(topic, subscriber)
+        if not current:
+            del self._topics[subscriber]
+    
+    def remove(self, subscriber: Hashable):
+        """Remove every subscription of a subscriber."""
+        for topic in self._topics.pop(subscriber, ()):
+            self._discard(topic, subscriber)
+    
+    def _discard(self, topic: str, subscriber: Hashable):
+        """Drop one subscriber from a topic, forgetting topics left empty."""
+        subscribers = self._subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[topic]
+    
+    def subscribers(self, topic: str) -> Set[Hashable]:
+        """Subscribers of a topic."""
+        return self._subscribers.get(topic, set())
+    
+    def topics_of(self, subscriber: Hashable) -> Set[str]:
+        """Topics a subscriber is subscribed to."""
+        return self._topics.get(subscriber, set())
+    
+    def topics(self, kind: str) -> List[str]:
+        """Subscribed topics of one kind."""
+        prefix = kind if kind == "queue" else f"{kind}:"
+        return [topic for topic in self._subscribers if topic.startswith(prefix)]
+    
+    def __contains__(self, topic: str) -> bool:
+        return topic in self._subscribers
+    
+    def __len__(self) -> int:
+        return len(self._topics)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscription counts."""
+        by_kind: Dict[str, int] = defaultdict(int)
+        for topic in self._subscribers:
+            by_kind[topic.partition(":")[0]] += 1
+        return {
+            "subscribers": len(self._topics),
+            "topics": len(self._subscribers),
+            "topics_by_kind": dict(by_kind),
+            "subscriptions": sum(len(topics) for topics in self._topics.values())
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tiation AI Agents - Dashboard Workers
+Worker processes serving the read-only dashboard routes from the shared snapshot.
+"""
+
+import asyncio
+import socket
+from typing import Dict, Any, List, Optional, Tuple
+
+import uvicorn
+
+from core.agent_manager import AgentManager, Agent, agents_from_records
+from core.config import Config
+from dashboard.cadence import BroadcastCadence
+from dashboard.enterprise_dashboard import EnterpriseDashboard, DashboardSnapshot
+from dashboard.shared_snapshot import SharedSnapshotReader, decode_document
+from dashboard.topics import parse_topic
+
+# Reads of the shared snapshot before a payload that fails to decode is an error
+DECODE_ATTEMPTS = 3
+
+
+class SnapshotDashboard(EnterpriseDashboard):
+    """Dashboard that serves what the core process publishes instead of collecting it.
+    
+    The agent registry is replaced wholesale from each new snapshot, so
+    filtering and pagination of /api/agents work as in the core process.
+    Snapshots keep the core's generation and boot nonce, so ETags agree
+    across workers.
+    """
+    
+    def __init__(self, snapshot_path: str, host: str = "0.0.0.0", port: int = 8080,
+                 poll_interval: float = 1.0):
+        """Initialize worker dashboard.
+        
+        Args:
+            snapshot_path: Path of the core process's shared snapshot
+            host: Dashboard host address
+            port: Dashboard port
+            poll_interval: Seconds between checks for a new snapshot
+        """
+        config = Config()
+        # The registry is only ever loaded from the shared snapshot
+        config.agent_snapshot_enabled = False
+        super().__init__(AgentManager(config), host, port, snapshot_max_age=poll_interval)
+        self.reader = SharedSnapshotReader(snapshot_path)
+        # Nothing notifies a worker of changes; it polls the snapshot's generation
+        self.cadence = BroadcastCadence(base_interval=poll_interval, idle_interval=poll_interval)
+        self._shared: Dict[str, Any] = {}
+    
+    def _setup_routes(self):
+        """Setup only the read-only routes; control stays with the core process."""
+        self._setup_read_routes()
+    
+    def _load(self) -> Optional[Tuple[int, float, Dict[str, Any], Dict[str, Agent]]]:
+        """Read and decode the published snapshot, off the event loop."""
+        for attempt in range(DECODE_ATTEMPTS):
+            published = self.reader.read()
+            if published is None:
+                return None
+            generation, published_at, payload = published
+            try:
+                document, records = decode_document(payload)
+            except Exception:
+                # A copy torn by the writer despite the sequence check; read again
+                if attempt == DECODE_ATTEMPTS - 1:
+                    raise
+                continue
+            return generation, published_at, document, agents_from_records(records)
+    
+    async def _refresh_snapshot(self) -> DashboardSnapshot:
+        """Adopt the latest published snapshot, if there is a new one."""
+        try:
+            snapshot = self._snapshot
+            if snapshot is not None and self.reader.generation() == snapshot.generation:
+                return snapshot
+            
+            loaded = await asyncio.to_thread(self._load)
+            if loaded is None:
+                raise RuntimeError("No dashboard snapshot published yet")
+            generation, published_at, document, agents = loaded
+            
+            self.agent_manager.agents = agents
+            self.boot_id = document["boot_id"]
+            self.agent_manager.version = document["registry_version"]
+            self.agent_manager.last_modified = document["registry_modified"]
+            self._shared = document
+            self._snapshot = DashboardSnapshot(
+                system=document["system"],
+                agent_columns=document["agent_columns"],
+                timestamp=document["timestamp"],
+                generation=generation,
+                created_at=published_at,
+                boot_id=self.boot_id
+            )
+            return self._snapshot
+        finally:
+            self._snapshot_refresh = None
+    
+    def _topic_data(self, topic: str) -> Any:
+        """Current data of a topic, with queue and workflow topics from the snapshot."""
+        kind, key = parse_topic(topic)
+        if kind == "queue":
+            return self._shared.get("queue", {})
+        if kind == "workflow":
+            return self._shared.get("workflows", {}).get(key)
+        return super()._topic_data(topic)
+    
+    async def serve(self, sockets: List[socket.socket]):
+        """Serve the dashboard on sockets bound by the core process."""
+        self.logger.info(f"Dashboard worker serving {self.host}:{self.port} from {self.reader.path}")
+        self.broadcaster.start()
+        self.metrics_task = asyncio.create_task(self._metrics_loop())
+        
+        config = uvicorn.Config(self.app, log_level="info")
+        server = uvicorn.Server(config)
+        try:
+            await server.serve(sockets=sockets)
+        finally:
+            await self.stop()
+            self.reader.close()
+
+
+def run_worker(snapshot_path: str, sock: socket.socket, host: str, port: int,
+               poll_interval: float = 1.0):
+    """Entry point of a dashboard worker process.
+    
+    Args:
+        snapshot_path: Path of the core process's shared snapshot
+        sock: Listening socket shared by every worker
+        host: Address the socket is bound to, for logging
+        port: Port the socket is bound to, for logging
+        poll_interval: Seconds between checks for a new snapshot
+    """
+    dashboard = SnapshotDashboard(snapshot_path, host, port, poll_interval)
+    asyncio.run(dashboard.serve([sock]))
@@ -9,6 +9,7 @@ import json
 import subprocess
 import tempfile
 import os
+import time
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -16,6 +17,8 @@ from enum import Enum
 
 from utils.logger import setup_logger
 from core.config import Config
+from core.cgroup import default_concurrency
+from core.metrics_exporter import WORKFLOW_STEP_DURATION
 
 
 class WorkflowStatus(Enum):
@@ -35,6 +38,18 @@ class WorkflowPriority(Enum):
     CRITICAL = 10
 
 
+def step_action(command: str) -> str:
+    """Program a step's shell command runs, e.g. "git" for "git pull --rebase".
+    
+    Used as a metric label: unlike step IDs, programs are a small set.
+    Leading ``NAME=value`` assignments are skipped.
+    """
+    for token in command.split():
+        if "=" not in token:
+            return os.path.basename(token) or "shell"
+    return "shell"
+
+
 @dataclass
 class WorkflowStep:
     """Individual step in a workflow."""
@@ -92,6 +107,20 @@ class WorkflowExecution:
             self.step_results = {}
         if self.logs is None:
             self.logs = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert execution to dictionary, without step outputs."""
+        return {
+            "execution_id": self.execution_id,
+            "workflow_id": self.workflow_id,
+            "status": self.status.value,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "current_step": self.current_step,
+            "completed_steps": len(self.step_results),
+            "error_message": self.error_message,
+            "logs": self.logs
+        }
 
 
 class TerminalWorkflowsIntegration:
@@ -114,6 +143,10 @@ class TerminalWorkflowsIntegration:
         self.execution_queue: List[str] = []
         self.running_executions: Dict[str, asyncio.Task] = {}
         
+        # Bound concurrent executions; excess executions wait in PENDING
+        self.max_concurrency = config.workflow_max_concurrency or default_concurrency()
+        self.execution_slots = asyncio.Semaphore(self.max_concurrency)
+        
         # AI workflow generators
         self.workflow_generators: Dict[str, Callable] = {
             "deployment": self._generate_deployment_workflow,
@@ -493,6 +526,13 @@ class TerminalWorkflowsIntegration:
         execution = self.executions[execution_id]
         workflow = self.workflows[execution.workflow_id]
         
+        try:
+            await self.execution_slots.acquire()
+        except asyncio.CancelledError:
+            if execution_id in self.running_executions:
+                del self.running_executions[execution_id]
+            raise
+        
         try:
             execution.status = WorkflowStatus.RUNNING
             execution.started_at = datetime.now()
@@ -521,7 +561,11 @@ class TerminalWorkflowsIntegration:
                     execution.current_step = step.step_id
                     self.logger.info(f"Executing step: {step.step_id}")
                     
+                    step_start = time.perf_counter()
                     result = await self._execute_step(step, parameters)
+                    WORKFLOW_STEP_DURATION.labels(
+                        step_action(step.command), "success" if result.get("success", False) else "failure"
+                    ).observe(time.perf_counter() - step_start)
                     execution.step_results[step.step_id] = result
                     
                     if result.get("success", False):
@@ -546,6 +590,8 @@ class TerminalWorkflowsIntegration:
             self.logger.error(f"Workflow execution failed: {execution_id} - {str(e)}")
         
         finally:
+            self.execution_slots.release()
+            
             # Clean up running executions
             if execution_id in self.running_executions:
                 del self.running_executions[execution_id]
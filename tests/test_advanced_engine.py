@@ -0,0 +1,41 @@
+import asyncio
+
+from ai.advanced_engine import AdvancedAIEngine, AITaskRequest
+from core.config import Config
+from core.metrics_exporter import REGISTRY
+
+
+class FailingAgent:
+    def run(self, prompt):
+        raise RuntimeError("model unavailable")
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_a_failed_llm_call_fails_the_task():
+    config = Config()
+    config.ai_cache_enabled = False
+    engine = AdvancedAIEngine(config)
+    template = engine.custom_agents["document_analyzer"]
+    engine.active_agents["agent-1"] = {"template": template, "agent": FailingAgent(), "status": "active"}
+    labels = {"model": template.model_config.model_name, "task_type": "text_analysis"}
+    before = {
+        status: sample("tiation_ai_task_duration_seconds_count", status=status, **labels)
+        for status in ("success", "failed")
+    }
+    tokens = sample("tiation_ai_tokens_total", **labels)
+    
+    request = AITaskRequest("task-1", "agent-1", "text_analysis", {"text": "hello"}, {})
+    try:
+        asyncio.run(engine._process_task(request))
+    finally:
+        engine.llm_executor.shutdown()
+    
+    response = engine.get_task_result("task-1")
+    assert response.status == "failed"
+    assert "model unavailable" in response.result["error"]
+    assert sample("tiation_ai_task_duration_seconds_count", status="success", **labels) == before["success"]
+    assert sample("tiation_ai_task_duration_seconds_count", status="failed", **labels) == before["failed"] + 1
+    assert sample("tiation_ai_tokens_total", **labels) == tokens
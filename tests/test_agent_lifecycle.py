@@ -0,0 +1,136 @@
+import asyncio
+import os
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from core.agent_manager import Agent, AgentManager, AgentStatus
+from core.config import Config
+from core.task_queue import Task, TaskQueue, TaskStatus, TaskType
+from dashboard.enterprise_dashboard import EnterpriseDashboard
+
+
+def make_manager(count: int = 3) -> AgentManager:
+    config = Config()
+    config.agent_snapshot_enabled = False
+    manager = AgentManager(config)
+    now = datetime.now()
+    for index in range(count):
+        agent = Agent(f"agent-{index}", f"Agent {index}", "test", AgentStatus.ACTIVE, [], {}, now, now)
+        manager.agents[agent.id] = agent
+    return manager
+
+
+def test_bulk_route_is_not_shadowed_by_agent_routes(tmp_path, monkeypatch):
+    # The dashboard mounts static/ and templates/ from the working directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("static")
+    os.makedirs("templates")
+    manager = make_manager()
+    dashboard = EnterpriseDashboard(manager)
+    try:
+        response = TestClient(dashboard.app).post(
+            "/api/agents/bulk/stop", json={"agent_ids": ["agent-0", "agent-1"], "drain": False}
+        )
+    finally:
+        dashboard.metrics_collector.stop_sampler()
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["action"] == "stop"
+    assert body["succeeded"] == 2
+    assert manager.agents["agent-0"].status == AgentStatus.OFFLINE
+    assert manager.agents["agent-2"].status == AgentStatus.ACTIVE
+
+
+def test_stop_drains_tasks_dispatched_by_the_queue():
+    async def run():
+        manager = make_manager(1)
+        queue = TaskQueue(max_workers=1, agent_manager=manager)
+        release = asyncio.Event()
+        
+        async def handler(task):
+            await release.wait()
+            return {"ok": True}
+        
+        queue.register_handler(TaskType.CUSTOM, handler)
+        await queue.start()
+        try:
+            await queue.submit_task(Task(agent_id="agent-0"))
+            while manager.agents["agent-0"].in_flight_tasks == 0:
+                await asyncio.sleep(0.01)
+            
+            # Two concurrent stops share the drain and both finish once the task does
+            stops = [asyncio.create_task(manager._stop_agent("agent-0", True, 5.0)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert not any(stop.done() for stop in stops)
+            release.set()
+            drained = await asyncio.wait_for(asyncio.gather(*stops), 1.0)
+        finally:
+            await queue.stop()
+        
+        agent = manager.agents["agent-0"]
+        assert drained == [True, True]
+        assert agent.in_flight_tasks == 0
+        assert agent.tasks_completed == 1
+        assert agent.status == AgentStatus.OFFLINE
+    
+    asyncio.run(run())
+
+
+def test_iter_agents_follows_removal_and_addition():
+    manager = make_manager(3)
+    assert [agent.id for agent in manager.iter_agents()] == ["agent-0", "agent-1", "agent-2"]
+    
+    # Same count before and after, so only the change notifications reveal it
+    del manager.agents["agent-1"]
+    manager._notify_change("agent-1")
+    now = datetime.now()
+    manager.agents["agent-3"] = Agent("agent-3", "Agent 3", "test", AgentStatus.ACTIVE, [], {}, now, now)
+    manager._mark_changed("agent-3")
+    
+    assert [agent.id for agent in manager.iter_agents()] == ["agent-0", "agent-2", "agent-3"]
+    assert [agent.id for agent in manager.iter_agents(after="agent-0")] == ["agent-2", "agent-3"]
+
+
+def test_tasks_submitted_during_a_restart_wait_for_the_agent():
+    async def run():
+        manager = make_manager(1)
+        manager.restart_delay = 0.2
+        queue = TaskQueue(max_workers=2, agent_manager=manager)
+        release = asyncio.Event()
+        
+        async def handler(task):
+            if task.payload.get("hold"):
+                await release.wait()
+            return {"ok": True}
+        
+        queue.register_handler(TaskType.CUSTOM, handler)
+        await queue.start()
+        try:
+            await queue.submit_task(Task(agent_id="agent-0", payload={"hold": True}))
+            while manager.agents["agent-0"].in_flight_tasks == 0:
+                await asyncio.sleep(0.01)
+            
+            restart = asyncio.create_task(manager.restart_agents(["agent-0"], drain_timeout=5.0))
+            await asyncio.sleep(0.01)
+            late = Task(agent_id="agent-0")
+            await queue.submit_task(late)
+            
+            # Refused while the agent drains, then while it is offline
+            await asyncio.sleep(0.05)
+            assert late.status == TaskStatus.PENDING
+            release.set()
+            await asyncio.wait_for(restart, 1.0)
+            for _ in range(200):
+                if late.status == TaskStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+        
+        assert late.retries == 0
+        assert manager.agents["agent-0"].tasks_completed == 2
+        assert manager.agents["agent-0"].status == AgentStatus.ACTIVE
+    
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+import pytest
+
+from core.agent_snapshot import AgentSnapshotStore
+
+
+def record(agent_id: str, status: str = "active", completed: int = 0):
+    return (agent_id, f"Agent {agent_id}", "test", status, ["chat"], {"model": "local"},
+            1000.0, 2000.0, completed, 0)
+
+
+def test_load_replays_the_log_over_the_checkpoint(tmp_path):
+    store = AgentSnapshotStore(str(tmp_path))
+    store.write_checkpoint([record("a"), record("b"), record("c")])
+    store.append([record("a", completed=5)], removed=["b"])
+    store.append([record("d")])
+    
+    records = AgentSnapshotStore(str(tmp_path)).load()
+    assert sorted(records) == ["a", "c", "d"]
+    assert records["a"] == record("a", completed=5)
+    assert records["c"] == record("c")
+
+
+def test_log_from_before_a_checkpoint_is_not_replayed(tmp_path, monkeypatch):
+    store = AgentSnapshotStore(str(tmp_path))
+    store.load()
+    store.append([record("a", completed=1)])
+    store.write_checkpoint([record("a", completed=1)])
+    store.append([record("a", "offline", completed=2)])
+    
+    # Crash after the new checkpoint replaced the old one, before the log was restarted
+    def crash(mode):
+        raise OSError("crashed")
+    monkeypatch.setattr(store, "_start_log", crash)
+    with pytest.raises(OSError):
+        store.write_checkpoint([record("a", completed=7)])
+    
+    restarted = AgentSnapshotStore(str(tmp_path))
+    assert restarted.load() == {"a": record("a", completed=7)}
+    
+    # The restarted store logs under the current checkpoint again
+    restarted.append([record("a", completed=8)])
+    assert AgentSnapshotStore(str(tmp_path)).load()["a"] == record("a", completed=8)
@@ -0,0 +1,25 @@
+from core.agent_stats import LATENCY_BOUNDS, RollingWindow
+
+
+def test_latencies_past_the_top_bound_report_the_slowest_seen():
+    window = RollingWindow(10.0, 6)
+    for _ in range(98):
+        window.record(5.0, True, 0.5)
+    window.record(5.0, False, 900.0)
+    window.record(5.0, False, 1200.0)
+    
+    summary = window.summary(5.0)
+    
+    assert summary["latency_max"] == 1200.0
+    assert summary["latency_p99"] == 1200.0
+    assert summary["latency_p50"] <= 0.5
+
+
+def test_timeouts_land_in_a_bounded_bucket():
+    window = RollingWindow(10.0, 6)
+    window.record(5.0, False, 600.0)
+    
+    summary = window.summary(5.0)
+    
+    assert LATENCY_BOUNDS[-1] >= 600.0
+    assert LATENCY_BOUNDS[-2] < summary["latency_p99"] <= 600.0
@@ -0,0 +1,83 @@
+import asyncio
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.agent_manager import AgentStatus
+from dashboard.enterprise_dashboard import EnterpriseDashboard, METRICS_THREAD_AGENTS
+from dashboard.http_responses import etag_matches
+
+from test_agent_lifecycle import make_manager
+
+
+@pytest.fixture
+def dashboard_factory(tmp_path, monkeypatch):
+    # The dashboard mounts static/ and templates/ from the working directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("static")
+    os.makedirs("templates")
+    dashboards = []
+    
+    def create(manager):
+        dashboard = EnterpriseDashboard(manager)
+        dashboards.append(dashboard)
+        return dashboard
+    
+    yield create
+    for dashboard in dashboards:
+        dashboard.metrics_collector.stop_sampler()
+
+
+def test_etag_comparison_is_weak():
+    assert etag_matches('"a-1"', 'W/"a-1"')
+    assert etag_matches('W/"a-2", W/"a-1"', 'W/"a-1"')
+    assert not etag_matches('W/"b-1"', 'W/"a-1"')
+
+
+@pytest.mark.parametrize("path", ["/api/metrics", "/api/agents"])
+def test_etags_do_not_survive_a_restart(dashboard_factory, path):
+    first = TestClient(dashboard_factory(make_manager()).app)
+    etag = first.get(path).headers["etag"]
+    assert etag.startswith("W/")
+    assert first.get(path, headers={"If-None-Match": etag}).status_code == 304
+    
+    # A restarted process counts versions from the start again
+    restarted = TestClient(dashboard_factory(make_manager()).app)
+    response = restarted.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_unchanged_agents_send_no_delta(dashboard_factory):
+    dashboard = dashboard_factory(make_manager())
+    
+    async def collect_twice():
+        first = dashboard._synced_state(await dashboard._refresh_snapshot())
+        second = dashboard._synced_state(await dashboard._refresh_snapshot())
+        return first, second
+    
+    first, second = asyncio.run(collect_twice())
+    dashboard.state.update(*first)
+    # Only measured system load may move between collections
+    ops = dashboard.state.update(*second)
+    assert all(op["path"].startswith("/system/") for op in ops)
+    assert "uptime" not in second[1]["agent-0"]
+    assert "created_at" in second[1]["agent-0"]
+
+
+def test_system_metrics_count_agents_by_status(dashboard_factory):
+    manager = make_manager(3)
+    manager.agents["agent-2"].status = AgentStatus.ERROR
+    dashboard = dashboard_factory(manager)
+    
+    system = asyncio.run(dashboard._collect_system_metrics())
+    assert (system.active_agents, system.error_agents) == (2, 1)
+
+
+@pytest.mark.parametrize("count", [3, METRICS_THREAD_AGENTS])
+def test_metrics_scrape(dashboard_factory, count):
+    client = TestClient(dashboard_factory(make_manager(count)).app)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert f'agent_id="agent-{count - 1}",type="test",result="completed"}} 0' in response.text
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from ai.llm_executor import LLMExecutor, _accepts_callbacks
+
+
+class DualAgent:
+    """Has both entry points, like every LangChain chain."""
+    
+    def run(self, prompt):
+        return f"run on {threading.current_thread().name}"
+    
+    async def arun(self, prompt):
+        return "arun"
+
+
+def test_arun_is_only_awaited_for_native_async_models():
+    executor = LLMExecutor(max_workers=2)
+    
+    async def main():
+        pooled = await executor.run("model", DualAgent(), "prompt")
+        native = await executor.run("model", DualAgent(), "prompt", native_async=True)
+        return pooled, native
+    
+    try:
+        pooled, native = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert pooled.startswith("run on llm")
+    assert native == "arun"
+
+
+def test_callbacks_are_only_passed_when_accepted():
+    def plain(prompt):
+        pass
+    
+    def langchain_style(prompt, callbacks=None):
+        pass
+    
+    def open_keywords(prompt, **kwargs):
+        pass
+    
+    assert not _accepts_callbacks(plain)
+    assert _accepts_callbacks(langchain_style)
+    assert _accepts_callbacks(open_keywords)
@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+from core.loop_monitor import LoopMonitor
+
+
+async def blocking_step():
+    time.sleep(0.3)
+
+
+def test_a_blocking_callback_is_recorded_with_its_stack():
+    monitor = LoopMonitor(interval=0.02, slow_callback_threshold=0.1)
+    
+    async def main():
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+            await asyncio.create_task(blocking_step())
+            await asyncio.sleep(0.1)
+        finally:
+            monitor.stop()
+    
+    asyncio.run(main())
+    
+    records = monitor.get_slow_callbacks()
+    assert len(records) == 1
+    record = records[0]
+    assert record["duration"] >= 0.2
+    assert record["callback"] == "blocking_step"
+    assert any("blocking_step" in frame for frame in record["stack"])
+    assert monitor.get_stats()["slow_callbacks"]["other"]["count"] == 1
+    assert not monitor.running
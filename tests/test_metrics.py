@@ -0,0 +1,21 @@
+from core.metrics import MetricsCollector
+
+
+def test_cumulative_series_reach_the_detector_as_rates(monkeypatch):
+    collector = MetricsCollector()
+    observed = []
+    monkeypatch.setattr(collector.anomaly_detector, "observe",
+                        lambda values, timestamp: observed.append(dict(values)) or [])
+    
+    collector.record_history({"completed_tasks": 100, "cpu_percent": 5.0}, 1000.0)
+    collector.record_history({"completed_tasks": 130, "cpu_percent": 6.0}, 1010.0)
+    # A counter that went backwards was reset; it yields no rate
+    collector.record_history({"completed_tasks": 4, "cpu_percent": 7.0}, 1020.0)
+    
+    assert observed == [
+        {"cpu_percent": 5.0},
+        {"cpu_percent": 6.0, "completed_tasks_rate": 3.0},
+        {"cpu_percent": 7.0}
+    ]
+    # The history keeps the counter itself
+    assert "completed_tasks" in collector.history.series_names()
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from ai.response_cache import LLMResponseCache
+
+
+def test_waiters_share_a_failed_call():
+    cache = LLMResponseCache()
+    calls = []
+    
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model unavailable")
+    
+    async def main():
+        return await asyncio.gather(*(cache.get_or_run("key", run) for _ in range(3)), return_exceptions=True)
+    
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_waiters_retry_a_cancelled_call():
+    cache = LLMResponseCache()
+    calls = []
+    
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "response", 5
+    
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_run("key", run))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_run("key", run))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await waiter
+    
+    assert asyncio.run(main()) == ("response", 5, None)
+    assert len(calls) == 2
@@ -0,0 +1,53 @@
+import threading
+
+from core.agent_snapshot import agent_to_record
+from dashboard.shared_snapshot import (
+    SharedSnapshotReader, SharedSnapshotWriter, decode_document, encode_document
+)
+
+from test_agent_lifecycle import make_manager
+
+
+def test_round_trip_through_a_growing_file(tmp_path):
+    path = str(tmp_path / "snapshot")
+    writer = SharedSnapshotWriter(path, initial_size=64)
+    reader = SharedSnapshotReader(path)
+    try:
+        assert reader.read() is None
+        assert reader.generation() == 0
+        
+        records = [agent_to_record(agent) for agent in make_manager(50).agents.values()]
+        writer.publish(1, encode_document({"boot_id": "abc"}, records), published_at=12.5)
+        generation, published_at, payload = reader.read()
+        document, decoded = decode_document(payload)
+        assert (generation, published_at, reader.generation()) == (1, 12.5, 1)
+        assert document == {"boot_id": "abc"}
+        assert decoded == records
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_reads_racing_the_writer_never_see_a_partial_payload(tmp_path):
+    path = str(tmp_path / "snapshot")
+    writer = SharedSnapshotWriter(path, initial_size=1 << 16)
+    reader = SharedSnapshotReader(path, retries=100000)
+    writer.publish(1, bytes([1]) * 1000)
+    done = threading.Event()
+    
+    def publish():
+        for generation in range(2, 3000):
+            writer.publish(generation, bytes([generation % 251]) * (1000 + generation % 7))
+        done.set()
+    
+    thread = threading.Thread(target=publish)
+    thread.start()
+    try:
+        while not done.is_set():
+            generation, _, payload = reader.read()
+            assert len(payload) == (1000 if generation == 1 else 1000 + generation % 7)
+            assert len(set(payload)) == 1
+    finally:
+        thread.join()
+        reader.close()
+        writer.close()